@@ -0,0 +1,108 @@
+"""
+Measures the cost of building a contraction hierarchy of generated mazes against the speedup of the point to point
+queries it answers, compared with Dijkstra's algorithm and A* on the compiled graph.
+
+Usage:
+    python benchmarks/bench_hierarchy.py [--sizes SIZE [SIZE ...]] [--queries QUERIES] [--braid FRACTION]
+"""
+import argparse
+import heapq
+import math
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# pylint: disable=wrong-import-position
+from pymaze.generate import braid, generate  # noqa: E402
+from pymaze.graphs.compiled import CompiledGraph  # noqa: E402
+from pymaze.graphs.hierarchy import ContractionHierarchy, load_hierarchy  # noqa: E402
+from pymaze.graphs.native import manhattan, shortest_path  # noqa: E402
+
+
+def dijkstra_settled(graph: CompiledGraph, source: int, target: int) -> int:
+    """Counts the node ids settled by Dijkstra's algorithm before reaching the target"""
+    distances = {source: 0.0}
+    settled = set()
+    queue = [(0.0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        settled.add(node)
+        if node == target:
+            break
+        for edge in range(graph.offsets[node], graph.offsets[node + 1]):
+            neighbor, candidate = graph.targets[edge], distance + graph.weights[edge]
+            if candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                heapq.heappush(queue, (candidate, neighbor))
+    return len(settled)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the preprocessing cost and the query speedup for every size"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--braid", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'nodes':>8} {'shortcuts':>9} {'build s':>8} {'load s':>7} "
+        f"{'dijkstra ms':>11} {'a* ms':>7} {'ch ms':>7} {'speedup':>7} "
+        f"{'dijkstra settled':>16} {'ch settled':>10}"
+    )
+    for size in args.sizes:
+        maze = braid(generate(size, size, seed=42), args.braid, seed=42)
+        graph = CompiledGraph.from_maze(maze)
+
+        start = time.perf_counter()
+        hierarchy = ContractionHierarchy.from_graph(graph)
+        build = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as directory:
+            maze_path = Path(directory) / "bench.maze"
+            maze.dump(maze_path)
+            load_hierarchy(maze, maze_path)
+            start = time.perf_counter()
+            load_hierarchy(maze, maze_path)
+            load = time.perf_counter() - start
+
+        rng = random.Random(size)
+        pairs = [
+            (rng.randrange(len(graph)), rng.randrange(len(graph)))
+            for _ in range(args.queries)
+        ]
+        timings = {}
+        for name, query in (
+            ("dijkstra", lambda source, target: shortest_path(graph, source, target)),
+            (
+                "a*",
+                lambda source, target: shortest_path(
+                    graph, source, target, manhattan(graph, target)
+                ),
+            ),
+            ("ch", hierarchy.path),
+        ):
+            start = time.perf_counter()
+            for source, target in pairs:
+                query(source, target)
+            timings[name] = (time.perf_counter() - start) / len(pairs) * 1000
+        dijkstra = sum(dijkstra_settled(graph, *pair) for pair in pairs) / len(pairs)
+        contracted = sum(
+            hierarchy.search({source: 0.0}, {target: 0.0}).settled
+            for source, target in pairs
+        ) / len(pairs)
+
+        print(
+            f"{size:>6} {len(graph):>8} {hierarchy.shortcuts:>9} {build:>8.2f} {load:>7.3f} "
+            f"{timings['dijkstra']:>11.2f} {timings['a*']:>7.2f} {timings['ch']:>7.2f} "
+            f"{timings['dijkstra'] / timings['ch']:>7.1f} {dijkstra:>16.0f} {contracted:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures the time it takes to build the abstract graph of hierarchical pathfinding for a large generated maze with
+loops, and the latency of every level of a search from the entrance to the exit, compared with Dijkstra's algorithm.
+Every cluster size is measured with every edge between clusters as a transition, which is the default, and with
+merged entrances.
+
+Usage:
+    python benchmarks/bench_hpa.py [--size SIZE] [--cluster-sizes SIZE [SIZE ...]] [--weights WEIGHT [WEIGHT ...]]
+        [--braid FRACTION]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# pylint: disable=wrong-import-position
+from pymaze.generate import braid, generate  # noqa: E402
+from pymaze.graphs.compiled import CompiledGraph  # noqa: E402
+from pymaze.graphs.hpa import ClusterGraph  # noqa: E402
+from pymaze.graphs.native import shortest_path  # noqa: E402
+
+
+def main() -> None:
+    """Runs the benchmark and prints the build time and the latency of every level for every cluster size"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--cluster-sizes", type=int, nargs="+", default=[16, 32])
+    parser.add_argument("--weights", type=float, nargs="+", default=[1.0, 1.5, 3.0])
+    parser.add_argument("--braid", type=float, default=0.1)
+    args = parser.parse_args()
+
+    maze = braid(generate(args.size, args.size, seed=42), args.braid, seed=42)
+    graph = CompiledGraph.from_maze(maze)
+    source, target = graph.node_id(maze.entrance.index), graph.node_id(maze.exit.index)
+    start = time.perf_counter()
+    path = shortest_path(graph, source, target)
+    seconds = time.perf_counter() - start
+    cost = sum(
+        min(
+            graph.weights[edge]
+            for edge in range(graph.offsets[first], graph.offsets[first + 1])
+            if graph.targets[edge] == second
+        )
+        for first, second in zip(path or [], (path or [])[1:])
+    )
+    print(f"nodes {len(graph):,}, dijkstra {seconds:.3f} s, cost {cost:.0f}")
+
+    print(
+        f"{'cluster':>7} {'merge':>5} {'build s':>8} {'portals':>8} {'MB':>6} {'weight':>6} {'cost':>8} "
+        f"{'insert s':>8} {'abstract s':>10} {'refine s':>8}"
+    )
+    for cluster_size in args.cluster_sizes:
+        for merge in (False, True):
+            clusters = ClusterGraph(graph, cluster_size, merge)
+            for weight in args.weights:
+                result = clusters.search(source, target, weight)
+                print(
+                    f"{cluster_size:>7} {str(merge):>5} {clusters.build_seconds:>8.2f} {len(clusters):>8} "
+                    f"{clusters.nbytes / 1e6:>6.1f} {weight:>6.1f} {result.cost:>8.0f} "
+                    f"{result.seconds['insert']:>8.3f} {result.seconds['abstract']:>10.3f} "
+                    f"{result.seconds['refine']:>8.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measures the load throughput of the serializer in squares (cells) per second for the bundled labyrinth maze and a
+generated maze with 10 million squares.
+
+Usage:
+    python benchmarks/bench_serializer.py [--cells CELLS] [--repeat REPEAT]
+"""
+import argparse
+import collections
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# pylint: disable=wrong-import-position
+from pymaze.models.compact import CompactMaze  # noqa: E402
+from pymaze.models.role import Role  # noqa: E402
+from pymaze.persistence.serializer import load_squares  # noqa: E402
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+def generate(path: Path, cells: int, seed: int = 42) -> None:
+    """Writes a maze of roughly the given number of squares with random borders, one entrance and one exit"""
+    width = int(cells**0.5)
+    height = cells // width
+    values = bytearray(random.Random(seed).randbytes(width * height))
+    values = values.translate(bytes(value & 0xF for value in range(256)))
+    values[0] |= Role.ENTRANCE << 4
+    values[-1] |= Role.EXIT << 4
+    CompactMaze(width, height, values).dump(path)
+
+
+def throughput(path: Path, repeat: int) -> float:
+    """Returns the best number of squares loaded per second out of the given number of runs"""
+    cells = len(CompactMaze.open_mmap(path))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # consumes the squares without keeping them around to only measure decoding
+        collections.deque(load_squares(path), maxlen=0)
+        best = min(best, time.perf_counter() - start)
+    return cells / best
+
+
+def main() -> None:
+    """Runs the benchmark and prints the throughput of every maze"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cells", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        generated = Path(directory) / "generated.maze"
+        generate(generated, args.cells)
+        for path in (MAZES_DIR / "labyrinth.maze", generated):
+            cells_per_second = throughput(path, args.repeat)
+            print(f"{path.name:<20} {cells_per_second:>15,.0f} cells/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measures the memory taken by every square and the time it takes to build the squares of a generated maze with one
+million squares.
+
+Usage:
+    python benchmarks/bench_square.py [--size SIZE] [--repeat REPEAT]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# pylint: disable=wrong-import-position
+from pymaze.generate import generate  # noqa: E402
+from pymaze.persistence.serializer import decode_rows  # noqa: E402
+
+
+def main() -> None:
+    """Runs the benchmark and prints the memory and the construction time per square"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    maze = generate(args.size, args.size, seed=42)
+    values = bytes(maze.values)
+    cells = len(values)
+
+    def build() -> tuple:
+        return tuple(decode_rows(values, maze.width, maze.height))
+
+    tracemalloc.start()
+    squares = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del squares
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        squares = build()
+        best = min(best, time.perf_counter() - start)
+        del squares
+
+    print(f"squares          {cells:>12,}")
+    print(f"bytes per square {allocated / cells:>12.1f}")
+    print(f"ns per square    {best / cells * 1e9:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Measures every stage of solving the bundled mazes and generated mazes of growing sizes, and stores the results as JSON
+so that they can be compared between commits.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes SIZE ...] [--repeat REPEAT] [--limit LIMIT] [--output OUTPUT]
+    python benchmarks/bench_suite.py --compare BASELINE.json CURRENT.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# pylint: disable=wrong-import-position,unused-import
+import networkx  # noqa: E402,F401  imported up front to leave its import out of the first graph build
+from pymaze.generate import generate  # noqa: E402
+from pymaze.graphs.cache import GRAPH_CACHE  # noqa: E402
+from pymaze.graphs.compiled import CompiledGraph  # noqa: E402
+from pymaze.graphs.converter import make_graph  # noqa: E402
+from pymaze.graphs.solver import iter_solutions, solve  # noqa: E402
+from pymaze.models.compact import CompactMaze, validate_roles  # noqa: E402
+from pymaze.models.maze import Maze  # noqa: E402
+from pymaze.persistence.serializer import load_squares, read_file  # noqa: E402
+from pymaze.view.renderer import SVGRenderer  # noqa: E402
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+BUNDLED_MAZES = ("miniature", "pacman", "labyrinth", "impossible")
+DEFAULT_SIZES = (10, 100, 1000, 4000)
+
+# Largest mazes loaded as Square objects, solved with NetworkX and rendered. Bigger ones are only loaded as compact
+# mazes and solved with the native engine, as NetworkX takes minutes and gigabytes for millions of squares, and their
+# SVG takes about 150 bytes per square.
+OBJECT_MODEL_CELLS = 250_000
+
+# Relative slowdown of a stage reported as a regression by --compare
+REGRESSION_RATIO = 1.1
+
+
+def best_of(repeat: int, function: Callable[[], Any]) -> Tuple[float, Any]:
+    """Returns the lowest number of seconds a function took out of the given number of runs, and its last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def object_stages(path: Path, repeat: int, limit: int) -> Dict[str, float]:
+    """Times the stages of loading, solving and rendering a maze made of Square objects"""
+    stages: Dict[str, float] = {}
+    stages["load"], squares = best_of(repeat, lambda: tuple(load_squares(path)))
+    stages["validate"], maze = best_of(repeat, lambda: Maze(squares))
+    stages["graph"], _ = best_of(repeat, lambda: make_graph(maze))
+    stages["compile"], _ = best_of(repeat, lambda: CompiledGraph.from_maze(maze))
+
+    # the graphs are cached once so that the searches are measured on their own
+    GRAPH_CACHE.networkx(maze)
+    GRAPH_CACHE.compiled(maze)
+    stages["solve"], solution = best_of(repeat, lambda: solve(maze))
+    stages["solve_native"], _ = best_of(repeat, lambda: solve(maze, "native"))
+    stages["solve_all"], _ = best_of(
+        repeat, lambda: sum(1 for _ in iter_solutions(maze, limit=limit))
+    )
+    renderer = SVGRenderer()
+    stages["render"], _ = best_of(repeat, lambda: renderer.render(maze, solution))
+    return stages
+
+
+def compact_stages(path: Path, repeat: int) -> Dict[str, float]:
+    """Times the stages of loading and solving a compact maze with the native engine"""
+    stages: Dict[str, float] = {}
+    stages["load"], (header, body) = best_of(repeat, lambda: read_file(path))
+    maze = CompactMaze(header.width, header.height, body.square_values, validate=False)
+    stages["validate"], _ = best_of(repeat, lambda: validate_roles(maze))
+    stages["compile"], _ = best_of(repeat, lambda: CompiledGraph.from_maze(maze))
+    GRAPH_CACHE.compiled(maze)
+    stages["solve_native"], _ = best_of(repeat, lambda: solve(maze, "native"))
+    return stages
+
+
+def mazes(directory: Path, sizes: List[int]) -> Iterator[Tuple[str, Path]]:
+    """
+    Yields the name and path of the bundled mazes, then generates and yields perfect square mazes of the given sizes,
+    which are carved with the recursive backtracker and have their entrance and exit in opposite corners
+    """
+    for name in BUNDLED_MAZES:
+        yield name, MAZES_DIR / f"{name}.maze"
+    for size in sizes:
+        path = directory / f"generated-{size}x{size}.maze"
+        generate(size, size, seed=42).dump(path)
+        yield path.stem, path
+
+
+def run(sizes: List[int], repeat: int, limit: int) -> Dict[str, Any]:
+    """Runs the benchmarks and returns the results along with the environment they were measured in"""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in mazes(Path(directory), sizes):
+            GRAPH_CACHE.clear()
+            header, _ = read_file(path)
+            cells = header.width * header.height
+            if cells <= OBJECT_MODEL_CELLS:
+                model, stages = "Maze", object_stages(path, repeat, limit)
+            else:
+                model, stages = "CompactMaze", compact_stages(path, repeat)
+            results.append(
+                {
+                    "maze": name,
+                    "width": header.width,
+                    "height": header.height,
+                    "model": model,
+                    "seconds": stages,
+                }
+            )
+            print(
+                f"{name:<24} "
+                + " ".join(
+                    f"{stage}={seconds:.6f}" for stage, seconds in stages.items()
+                ),
+                file=sys.stderr,
+            )
+    return {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "limit": limit,
+        "results": results,
+    }
+
+
+def commit() -> str | None:
+    """Retrieves the hash of the checked out commit, or None outside a git repository"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> int:
+    """
+    Prints the ratio between the current and the baseline timings of every stage measured in both runs
+    Returns:
+        int: number of stages that got slower than the regression ratio
+    """
+    baseline_seconds = {
+        result["maze"]: result["seconds"] for result in baseline["results"]
+    }
+    regressions = 0
+    for result in current["results"]:
+        for stage, seconds in result["seconds"].items():
+            before = baseline_seconds.get(result["maze"], {}).get(stage)
+            if not before:
+                continue
+            ratio = seconds / before
+            flag = ""
+            if ratio > REGRESSION_RATIO:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(f"{result['maze']:<24} {stage:<14} {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    """Runs the benchmarks and writes their results as JSON, or compares the results of two runs"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=1000,
+        help="Maximum number of solutions enumerated by solve_all",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="JSON file to write instead of the standard output"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare the results of two runs instead of running the benchmarks",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, current = (
+            json.loads(path.read_text(encoding="utf-8")) for path in args.compare
+        )
+        sys.exit(1 if compare(baseline, current) else 0)
+
+    report = json.dumps(run(args.sizes, args.repeat, args.limit), indent=2)
+    if args.output is None:
+        print(report)
+    else:
+        args.output.write_text(report + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,76 @@
 """
 Entry point of the maze solver
 """
+import dataclasses
+import json
+import sys
+from argparse import Namespace
+
 from .cli import get_command_line_args
-from .models import Maze
-from .graphs.solver import solve_all
-from .view.renderer import SVGRenderer
+from .persistence.file_format import FileHeader
+
+# The modules solving and rendering mazes are only imported by the commands that need them, so that inspecting a file
+# or printing the version starts fast
+# pylint: disable=import-outside-toplevel
 
 
 def main() -> None:
     """Entry point of the maze solver application"""
     args = get_command_line_args()
+    if args.profile is None and args.pstats is None and args.flamegraph is None:
+        run(args)
+        return
+    from .profiling import Profiler
+
+    with Profiler(
+        cprofile=args.pstats is not None or args.flamegraph is not None
+    ) as profiler:
+        run(args)
+    if args.profile == "-":
+        profiler.write_report(sys.stderr)
+    elif args.profile is not None:
+        with open(args.profile, "w", encoding="utf-8") as file:
+            profiler.write_report(file)
+    if args.pstats is not None:
+        profiler.dump_stats(args.pstats)
+    if args.flamegraph is not None:
+        profiler.dump_collapsed(args.flamegraph)
+
+
+def run(args: Namespace) -> None:
+    """Runs the command selected by the command line arguments"""
+    if args.inspect:
+        with args.path.open("rb") as file:
+            header = FileHeader.read(file)
+        print(json.dumps({"path": str(args.path)} | dataclasses.asdict(header)))
+        return
+    if args.batch:
+        from .batch import run_batch
+
+        run_batch(
+            args.paths,
+            sys.stdout,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            backend=args.backend,
+        )
+        return
+    from .graphs.solver import iter_solutions
+    from .models import Maze
+    from .view.export import export
+    from .view.renderer import SVGRenderer
+
     maze = Maze.load(args.path)
-    solutions = solve_all(maze)
-    if solutions:
-        renderer = SVGRenderer()
-        for solution in solutions:
-            svg = renderer.render(maze, solution)
+    renderer = SVGRenderer()
+    svgs = (
+        renderer.render(maze, solution)
+        for solution in iter_solutions(maze, limit=args.limit)
+    )
+    if args.output is None:
+        for svg in svgs:
             svg.preview()
+    else:
+        export(svgs, args.output, args.path.stem, args.format, sys.stdout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""
+Solves many maze files in parallel, printing one JSON line per maze
+"""
+import functools
+import glob
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from .graphs import Backend
+from .graphs.solver import solution_cost, solve
+from .models.compact import CompactMaze
+
+# Suffix of the files looked up in directories
+MAZE_SUFFIX: str = ".maze"
+
+
+def find_maze_files(patterns: Iterable[str]) -> Iterator[Path]:
+    """
+    Finds the maze files matching the given patterns. A pattern can be the path to a file, a directory which is
+    searched recursively for files ending with .maze, or a glob pattern, which supports ** for recursion.
+    Args:
+        patterns (Iterable): paths to files or directories, or glob patterns
+    Returns:
+        Iterator: paths of the maze files, sorted within each pattern
+    """
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            yield from sorted(path.rglob(f"*{MAZE_SUFFIX}"))
+        elif path.is_file():
+            yield path
+        else:
+            yield from sorted(
+                Path(match) for match in glob.glob(pattern, recursive=True)
+            )
+
+
+def solve_file(path: Path, backend: Backend = "native") -> Dict[str, Any]:
+    """
+    Loads and solves a single maze file, timing each stage. The file is memory mapped so that workers share the page
+    cache of the operating system. Errors are reported in the result instead of being raised, so that a broken file
+    does not stop a batch.
+    Args:
+        path (Path): path to the maze file
+        backend (Backend): engine to solve the maze with
+    Returns:
+        Dict: JSON serializable result with the path length (number of squares) and cost of the solution, if any,
+        and the number of seconds spent loading and solving the maze
+    """
+    start = time.perf_counter()
+    try:
+        maze = CompactMaze.open_mmap(path)
+        loaded = time.perf_counter()
+        solution = solve(maze, backend=backend)
+        solved = time.perf_counter()
+    except (AssertionError, OSError, ValueError) as error:
+        return {"path": str(path), "error": str(error) or type(error).__name__}
+    return {
+        "path": str(path),
+        "width": maze.width,
+        "height": maze.height,
+        "solved": solution is not None,
+        "length": len(solution) if solution else None,
+        "cost": solution_cost(solution) if solution else None,
+        "load_seconds": loaded - start,
+        "solve_seconds": solved - loaded,
+    }
+
+
+def run_batch(
+    patterns: Iterable[str],
+    output: TextIO,
+    workers: int | None = None,
+    chunk_size: int = 16,
+    backend: Backend = "native",
+) -> int:
+    """
+    Solves all the maze files matching the given patterns over a pool of worker processes, writing one JSON line per
+    maze to the output in the order the files were found.
+    Args:
+        patterns (Iterable): paths to files or directories, or glob patterns
+        output (TextIO): text stream receiving the JSON lines
+        workers (int): number of worker processes, defaulting to the number of processors. A single worker solves the
+            mazes in the current process.
+        chunk_size (int): number of mazes sent to a worker at once, larger chunks lower the overhead of small mazes
+        backend (Backend): engine to solve the mazes with
+    Returns:
+        int: number of maze files processed
+    """
+    paths = list(find_maze_files(patterns))
+    solver = functools.partial(solve_file, backend=backend)
+    if workers == 1:
+        return write_results(map(solver, paths), output)
+    # imported on demand as multiprocessing takes a while to import, which only batches running in parallel need
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return write_results(executor.map(solver, paths, chunksize=chunk_size), output)
+
+
+def write_results(results: Iterable[Dict[str, Any]], output: TextIO) -> int:
+    """Writes every result as a JSON line as soon as it is available, returning the number of results written"""
+    count = 0
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        count += 1
+    return count
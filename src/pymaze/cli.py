@@ -1,15 +1,79 @@
 """
 Defines the CLI command arguments
 """
+import os
 import sys
 import argparse
 from argparse import Namespace
 from pathlib import Path
+from typing import Any, Sequence, get_args
 
+from .graphs import Backend
+from .view import Format
 
-def get_command_line_args() -> Namespace:
+
+class VersionAction(argparse.Action):
+    """
+    Prints the version of the installed package and exits. Unlike the built-in version action, this only looks up the
+    version when it is requested, as importing the package metadata takes a while.
+    """
+
+    def __init__(
+        self,
+        option_strings: Sequence[str],
+        dest: str = argparse.SUPPRESS,
+        default: str = argparse.SUPPRESS,
+        help: str = "show program's version number and exit",  # pylint: disable=redefined-builtin
+    ) -> None:
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: Namespace,
+        values: Any,
+        option_string: str | None = None,
+    ) -> None:
+        parser.exit(message=f"{parser.prog} {package_version()}\n")
+
+
+def package_version() -> str:
+    """Retrieves the version of the installed package, or unknown when running from the sources"""
+    # pylint: disable=import-outside-toplevel
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("pymaze")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def positive_int(value: str) -> int:
+    """
+    Converts a command line value to a positive integer
+    Raises:
+        ArgumentTypeError: if the value is not an integer greater than zero, which the parser reports as a usage error
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive integer")
+    return number
+
+
+def get_command_line_args(argv: Sequence[str] | None = None) -> Namespace:
     """
     Creates a parser and adds arguments for the parser returning the namespace for the argument parser to use in a CLI
+    Args:
+        argv (Sequence): optional arguments to parse instead of the ones the program was started with
     Returns:
         Namespace: populated namespace object
     """
@@ -23,15 +87,96 @@ def get_command_line_args() -> Namespace:
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
+        action=VersionAction,
     )
 
-    # Argument to get the directory name
+    # Argument to only read the header of the maze file
     parser.add_argument(
-        "path",
+        "--inspect",
+        action="store_true",
+        help="Print the header of the maze file as JSON without loading its squares",
+    )
+
+    # Argument to get the maze files
+    parser.add_argument(
+        "paths",
+        metavar="path",
+        nargs="+",
+        help="Path to the maze file to solve. In batch mode, any number of maze files, directories searched for "
+        ".maze files or glob patterns",
+    )
+
+    # Arguments of the headless output
+    output = parser.add_argument_group("output")
+    output.add_argument(
+        "-o",
+        "--output",
+        help="Write the solutions instead of previewing them in the web browser: - writes all of them to the standard "
+        "output, an existing directory gets one file per solution, any other path gets the first solution",
+    )
+    output.add_argument(
+        "--format",
+        choices=get_args(Format),
+        default="svg",
+        help="Format of the written solutions, either plain SVG or an HTML page, defaults to svg",
+    )
+    output.add_argument(
+        "--limit",
+        type=positive_int,
+        help="Maximum number of solutions to render",
+    )
+
+    # Arguments of the batch mode
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument(
+        "--batch",
+        action="store_true",
+        help="Solve all the given mazes in parallel, printing one JSON line per maze instead of previewing solutions",
+    )
+    batch.add_argument(
+        "--workers",
+        type=positive_int,
+        default=os.cpu_count(),
+        help="Number of worker processes, defaults to the number of processors",
+    )
+    batch.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=16,
+        help="Number of mazes sent to a worker process at once, defaults to 16",
+    )
+    batch.add_argument(
+        "--backend",
+        choices=get_args(Backend),
+        default="native",
+        help="Engine used to solve the mazes, defaults to native",
+    )
+
+    # Arguments of the profiling instrumentation
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument(
+        "--profile",
+        metavar="REPORT",
+        nargs="?",
+        const="-",
+        help="Record the wall time, CPU time and peak memory allocation of every stage and write them as JSON into "
+        "the given file, or onto the standard error without one",
+    )
+    profiling.add_argument(
+        "--pstats",
+        metavar="PATH",
+        type=Path,
+        help="Also run cProfile and dump its statistics into a file readable by the pstats module",
+    )
+    profiling.add_argument(
+        "--flamegraph",
+        metavar="PATH",
         type=Path,
-        default=".",
-        help="Generate full directory tree starting at ROOT_DIR",
+        help="Also run cProfile and dump its statistics as collapsed stacks, the input format of flame graph tools",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if not args.batch and len(args.paths) != 1:
+        parser.error("exactly one path is required unless --batch is given")
+    args.path = Path(args.paths[0])
+    return args
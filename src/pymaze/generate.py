@@ -0,0 +1,339 @@
+"""
+Contains seeded generators of perfect mazes, which carve passages straight into the packed square values of the file
+body instead of creating Square objects, so that mazes with millions of squares can be produced for testing
+
+Usage:
+    python -m pymaze.generate OUTPUT --width WIDTH --height HEIGHT [--algorithm ALGORITHM] [--seed SEED]
+        [--rewards REWARDS] [--enemies ENEMIES]
+"""
+import argparse
+import itertools
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Sequence, Tuple, TypeAlias, get_args
+
+from .models.border import Border
+from .models.compact import CompactMaze
+from .models.role import Role
+
+Algorithm: TypeAlias = Literal["backtracker", "kruskal", "wilson"]
+
+# Packed value of a square surrounded by borders on all four sides, before any passage is carved
+WALLED: int = int(Border.TOP | Border.BOTTOM | Border.LEFT | Border.RIGHT)
+
+# Number of random bytes drawn at once by the random walks, which is much faster than drawing them one by one
+RANDOM_CHUNK: int = 1 << 16
+
+# Move to a neighboring square as the offset of its index, the border removed from the current square and the border
+# removed from the neighboring square
+Move = Tuple[int, int, int]
+
+
+def moves(stride: int) -> List[Move]:
+    """
+    Retrieves the moves up, down, left and right in a grid whose rows are the given number of squares apart. Borders
+    are plain integers, as operators on Border flags are several times slower in the carving loops.
+    """
+    return [
+        (-stride, Border.TOP.value, Border.BOTTOM.value),
+        (stride, Border.BOTTOM.value, Border.TOP.value),
+        (-1, Border.LEFT.value, Border.RIGHT.value),
+        (1, Border.RIGHT.value, Border.LEFT.value),
+    ]
+
+
+def shuffled_moves(stride: int) -> List[Tuple[Move, ...]]:
+    """
+    Retrieves the 24 orders of the moves in a grid whose rows are the given number of squares apart, repeated to fill a
+    table that can be indexed by a random byte directly
+    """
+    orders = list(itertools.permutations(moves(stride)))
+    return [orders[byte % len(orders)] for byte in range(256)]
+
+
+def padded_grid(width: int, height: int, inside: int, outside: int) -> bytearray:
+    """
+    Creates a grid with one extra square on every side, so that neighbors can be looked up without bounds checks
+    Args:
+        width (int): number of columns of the maze
+        height (int): number of rows of the maze
+        inside (int): value of the squares of the maze
+        outside (int): value of the squares around the maze
+    Returns:
+        bytearray: row-major grid of width + 2 columns and height + 2 rows
+    """
+    stride = width + 2
+    grid = bytearray([outside]) * (stride * (height + 2))
+    row = bytes([inside]) * width
+    for start in range(stride + 1, stride * (height + 1), stride):
+        grid[start : start + width] = row
+    return grid
+
+
+def unpadded(grid: bytearray, width: int, height: int) -> bytearray:
+    """Strips the extra squares around a grid created by padded_grid()"""
+    stride = width + 2
+    return bytearray().join(
+        grid[start : start + width]
+        for start in range(stride + 1, stride * (height + 1), stride)
+    )
+
+
+def recursive_backtracker(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Carves a perfect maze with a depth first search, which walks to a random unvisited neighbor as long as there is one
+    and backtracks otherwise. The stack is explicit, so that the size of the maze is not limited by recursion.
+    Returns:
+        bytearray: row-major packed border values of the maze
+    """
+    stride = width + 2
+    values = padded_grid(width, height, WALLED, WALLED)
+    visited = padded_grid(width, height, 0, 1)
+    orders = shuffled_moves(stride)
+    start = stride + 1
+    visited[start] = 1
+    stack = [start]
+    push, pop = stack.append, stack.pop
+    # every square is pushed and popped once, which takes 2 * width * height - 1 steps, each drawing one random byte
+    for choice in rng.randbytes(2 * width * height):
+        if not stack:
+            break
+        square = stack[-1]
+        for offset, border, neighbor_border in orders[choice]:
+            neighbor = square + offset
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                values[square] &= ~border
+                values[neighbor] &= ~neighbor_border
+                push(neighbor)
+                break
+        else:
+            pop()
+    return unpadded(values, width, height)
+
+
+def kruskal(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Carves a perfect maze by removing the walls between neighboring squares in a random order, skipping the walls whose
+    squares are already connected. Connected squares are tracked with a union-find structure using path halving.
+    Returns:
+        bytearray: row-major packed border values of the maze
+    """
+    values = bytearray([WALLED]) * (width * height)
+    parents = list(range(width * height))
+    # wall 2 * i is on the right of square i and wall 2 * i + 1 is at its bottom, except on the last column and row
+    walls = list(range(1, 2 * width * (height - 1), 2))
+    for start in range(0, 2 * width * height, 2 * width):
+        walls.extend(range(start, start + 2 * (width - 1), 2))
+    rng.shuffle(walls)
+    sides = moves(width)[3], moves(width)[1]
+    for wall in walls:
+        square = wall >> 1
+        offset, border, neighbor_border = sides[wall & 1]
+        neighbor = square + offset
+
+        first = square
+        while parents[first] != first:
+            parents[first] = first = parents[parents[first]]
+        second = neighbor
+        while parents[second] != second:
+            parents[second] = second = parents[parents[second]]
+        if first != second:
+            parents[first] = second
+            values[square] &= ~border
+            values[neighbor] &= ~neighbor_border
+    return values
+
+
+def wilson(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Carves a uniform spanning tree of the grid with Wilson's algorithm, i.e. a maze drawn uniformly at random among
+    all perfect mazes. Loop erased random walks start from every square outside the tree until they hit the tree, and
+    the path they leave behind is added to it. Walks only remember the last move made out of every square, which
+    erases the loops implicitly.
+    Returns:
+        bytearray: row-major packed border values of the maze
+    """
+    stride = width + 2
+    values = padded_grid(width, height, WALLED, WALLED)
+    # 0 for squares outside the tree, 1 for squares in the tree and 2 for the padding around the maze
+    tree = padded_grid(width, height, 0, 2)
+    directions = moves(stride)
+    last_moves = bytearray(len(values))
+    tree[stride + 1] = 1
+    choices = rng.randbytes(RANDOM_CHUNK)
+    position = 0
+
+    start = tree.find(0)
+    while start != -1:
+        square = start
+        while not tree[square]:
+            while True:
+                if position == RANDOM_CHUNK:
+                    choices, position = rng.randbytes(RANDOM_CHUNK), 0
+                direction = choices[position] & 3
+                position += 1
+                if tree[square + directions[direction][0]] != 2:
+                    break
+            last_moves[square] = direction
+            square += directions[direction][0]
+
+        square = start
+        while not tree[square]:
+            tree[square] = 1
+            offset, border, neighbor_border = directions[last_moves[square]]
+            values[square] &= ~border
+            values[square + offset] &= ~neighbor_border
+            square += offset
+        start = tree.find(0, start)
+    return unpadded(values, width, height)
+
+
+GENERATORS: Dict[str, Callable[[int, int, random.Random], bytearray]] = {
+    "backtracker": recursive_backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+}
+
+
+def generate(
+    width: int,
+    height: int,
+    algorithm: Algorithm = "backtracker",
+    seed: int | None = None,
+    entrance: int | None = None,
+    exit: int | None = None,  # pylint: disable=redefined-builtin
+    rewards: int = 0,
+    enemies: int = 0,
+) -> CompactMaze:
+    """
+    Generates a perfect maze, in which every square can be reached from any other one through exactly one path
+    Args:
+        width (int): number of columns
+        height (int): number of rows
+        algorithm (Algorithm): carving algorithm, defaults to the recursive backtracker which is the fastest one
+        seed (int): optional seed making the maze reproducible
+        entrance (int): index of the entrance square, defaults to the top left corner
+        exit (int): index of the exit square, defaults to the bottom right corner
+        rewards (int): number of rewards placed on random squares
+        enemies (int): number of enemies placed on random squares
+    Returns:
+        CompactMaze: generated maze
+    """
+    rng = random.Random(seed)
+    values = GENERATORS[algorithm](width, height, rng)
+    entrance = 0 if entrance is None else entrance
+    exit = width * height - 1 if exit is None else exit
+    place_roles(values, width, entrance, exit, rewards, enemies, rng)
+    return CompactMaze(width, height, values)
+
+
+def braid(maze: CompactMaze, fraction: float, seed: int | None = None) -> CompactMaze:
+    """
+    Removes a random fraction of the inner right borders of a maze, so that it has loops like a game level instead of
+    a single path between any two squares. The roles of the squares are left as they are.
+    Args:
+        maze (CompactMaze): maze to open up
+        fraction (float): fraction of the inner right borders to remove, between 0 and 1
+        seed (int): optional seed making the removed borders reproducible
+    Returns:
+        CompactMaze: braided copy of the maze
+    """
+    values = bytearray(maze.values)
+    inner = [
+        index
+        for index in range(len(values))
+        if index % maze.width < maze.width - 1 and values[index] & Border.RIGHT
+    ]
+    for index in random.Random(seed).sample(inner, int(len(inner) * fraction)):
+        values[index] &= ~Border.RIGHT.value & 0xFF
+        values[index + 1] &= ~Border.LEFT.value & 0xFF
+    return CompactMaze(maze.width, maze.height, values)
+
+
+def place_roles(
+    values: bytearray,
+    width: int,
+    entrance: int,
+    exit: int,  # pylint: disable=redefined-builtin
+    rewards: int,
+    enemies: int,
+    rng: random.Random,
+) -> None:
+    """
+    Places the roles of the squares of a generated maze, opening the outer border of the entrance and the exit when
+    they lie on the edge of the maze
+    Raises:
+        ValueError: if the squares given to the entrance and exit are out of the maze or the same, or if there are
+        not enough squares left for the rewards and enemies
+    """
+    size = len(values)
+    if not 0 <= entrance < size or not 0 <= exit < size or entrance == exit:
+        raise ValueError("The entrance and the exit must be two squares of the maze")
+    if rewards + enemies > size - 2:
+        raise ValueError("Not enough squares for the rewards and enemies")
+
+    for index, role in ((entrance, Role.ENTRANCE), (exit, Role.EXIT)):
+        values[index] = (role << 4) | (
+            values[index] & ~outer_border(index, width, size)
+        )
+    squares = rng.sample(range(size), rewards + enemies + 2)
+    squares = [index for index in squares if index not in (entrance, exit)]
+    for index, role in zip(
+        squares,
+        itertools.chain(
+            itertools.repeat(Role.REWARD, rewards),
+            itertools.repeat(Role.ENEMY, enemies),
+        ),
+    ):
+        values[index] |= role << 4
+
+
+def outer_border(index: int, width: int, size: int) -> Border:
+    """Retrieves the border of a square facing outside the maze, preferring the top and bottom ones"""
+    if index < width:
+        return Border.TOP
+    if index >= size - width:
+        return Border.BOTTOM
+    if index % width == 0:
+        return Border.LEFT
+    if index % width == width - 1:
+        return Border.RIGHT
+    return Border.EMPTY
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Generates a maze and dumps it onto the given path"""
+    parser = argparse.ArgumentParser(
+        prog="python -m pymaze.generate",
+        description="Generate a perfect maze and write it as a .maze file",
+    )
+    parser.add_argument("output", type=Path, help="Path of the .maze file to write")
+    parser.add_argument("--width", type=int, required=True)
+    parser.add_argument("--height", type=int, required=True)
+    parser.add_argument(
+        "--algorithm",
+        choices=get_args(Algorithm),
+        default="backtracker",
+        help="Carving algorithm, defaults to backtracker",
+    )
+    parser.add_argument("--seed", type=int, help="Seed making the maze reproducible")
+    parser.add_argument("--entrance", type=int, help="Index of the entrance square")
+    parser.add_argument("--exit", type=int, help="Index of the exit square")
+    parser.add_argument("--rewards", type=int, default=0, help="Number of rewards")
+    parser.add_argument("--enemies", type=int, default=0, help="Number of enemies")
+    args = parser.parse_args(argv)
+    generate(
+        args.width,
+        args.height,
+        args.algorithm,
+        args.seed,
+        args.entrance,
+        args.exit,
+        args.rewards,
+        args.enemies,
+    ).dump(args.output)
+
+
+if __name__ == "__main__":
+    main()
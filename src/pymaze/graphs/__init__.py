@@ -0,0 +1,8 @@
+"""
+Converts mazes into graphs and solves them. The package itself is kept light, so that the CLI can refer to the names
+of the solver backends without importing them.
+"""
+from typing import Literal, TypeAlias
+
+# Names of the engines a maze can be solved with
+Backend: TypeAlias = Literal["networkx", "native"]
@@ -0,0 +1,187 @@
+"""
+Contains a bitboard engine answering unweighted questions about a maze, such as whether the exit can be reached or how
+many steps away from the entrance every square is, with a handful of big integer operations per breadth first layer
+"""
+import array
+import sys
+from dataclasses import dataclass
+from typing import Iterator, List
+
+from ..models.border import Border
+from ..models.compact import ROLES
+from ..models.maze import AnyMaze
+from ..models.role import Role
+
+# Tables for bytes.translate() turning square values into the ASCII digits of a binary number, which int() parses
+# into a bitboard in linear time
+OPEN_RIGHT: bytes = bytes(
+    ord("0") if value & Border.RIGHT else ord("1") for value in range(256)
+)
+OPEN_BOTTOM: bytes = bytes(
+    ord("0") if value & Border.BOTTOM else ord("1") for value in range(256)
+)
+PASSABLE: bytes = bytes(
+    ord("0") if value in (Role.WALL, Role.EXTERIOR) else ord("1") for value in ROLES
+)
+
+# Table for bytes.translate() turning the ASCII digits of a binary number into bytes of 0 and 1
+DIGITS: bytes = bytes(
+    value - ord("0") if value in b"01" else value for value in range(256)
+)
+
+
+def to_bitboard(digits: bytes) -> int:
+    """Parses one ASCII digit per square into a bitboard whose bit i is set for the square with index i"""
+    return int(digits[::-1], 2) if digits else 0
+
+
+def to_bytes(bitboard: int, size: int) -> bytes:
+    """Spreads a bitboard into one byte of 0 or 1 per square, the reverse of to_bitboard()"""
+    return format(bitboard, f"0{size}b")[::-1].encode("ascii").translate(DIGITS)
+
+
+def indices(bitboard: int) -> List[int]:
+    """
+    Retrieves the indices of the squares set in a bitboard, in increasing order. The bitboard is shifted down to its
+    lowest set bit first, so that a small frontier far into a large maze is cheap to list.
+    """
+    if not bitboard:
+        return []
+    lowest = (bitboard & -bitboard).bit_length() - 1
+    digits = format(bitboard >> lowest, "b")[::-1]
+    result = []
+    position = digits.find("1")
+    while position != -1:
+        result.append(lowest + position)
+        position = digits.find("1", position + 1)
+    return result
+
+
+@dataclass(frozen=True)
+class Bitboard:
+    """
+    Moves allowed between the squares of a maze, stored as Python integers with one bit per square. Bit i is set in
+    the right mask when a step can be taken from the square with index i to its right neighbor and back, and likewise
+    in the down mask for its bottom neighbor. Like the graph converter, only the right and bottom borders of a square
+    separate it from its neighbors, and the walls and the exterior are never entered.
+    Args:
+        width (int): number of columns in the maze
+        height (int): number of rows in the maze
+        right (int): squares connected to their right neighbor
+        down (int): squares connected to their bottom neighbor
+    """
+
+    width: int
+    height: int
+    right: int
+    down: int
+
+    @classmethod
+    def from_maze(cls, maze: AnyMaze) -> "Bitboard":
+        """Builds the masks of a maze from its packed square values with a few bulk operations"""
+        width, size = maze.width, maze.width * maze.height
+        values = bytes(maze.values)
+        passable = to_bitboard(values.translate(PASSABLE))
+        last_column = to_bitboard((b"0" * (width - 1) + b"1") * maze.height)
+        right = to_bitboard(values.translate(OPEN_RIGHT)) & ~last_column
+        down = to_bitboard(values[: size - width].translate(OPEN_BOTTOM))
+        return cls(
+            width=width,
+            height=maze.height,
+            right=right & passable & (passable >> 1),
+            down=down & passable & (passable >> width),
+        )
+
+    def __len__(self) -> int:
+        """Retrieves the number of squares in the maze"""
+        return self.width * self.height
+
+    def expand(self, frontier: int) -> int:
+        """Retrieves the squares one step away from any square of the frontier, which may include the frontier"""
+        right, down, width = self.right, self.down, self.width
+        return (
+            (frontier & right) << 1
+            | (frontier >> 1) & right
+            | (frontier & down) << width
+            | (frontier >> width) & down
+        )
+
+    def iter_layers(self, source: int, target: int | None = None) -> Iterator[int]:
+        """
+        Lazily runs a breadth first search from the source square, one layer at a time. Every layer takes a few
+        operations on integers as large as the maze, whatever the number of squares in it, which suits open areas
+        much better than long corridors. Layers are not kept around, as a maze made of corridors has as many layers
+        as squares.
+        Args:
+            source (int): index of the square to start from
+            target (int): optional index of a square at which to stop the search once reached
+        Returns:
+            Iterator: bitboards of the squares first reached after 0, 1, 2... steps
+        """
+        frontier = visited = 1 << source
+        stop = 0 if target is None else 1 << target
+        while frontier:
+            yield frontier
+            if frontier & stop:
+                return
+            frontier = self.expand(frontier) & ~visited
+            visited |= frontier
+
+    def reachable(self, source: int) -> int:
+        """Retrieves the bitboard of all the squares that can be reached from the source square"""
+        visited = 0
+        for layer in self.iter_layers(source):
+            visited |= layer
+        return visited
+
+    def distances(self, source: int) -> array.array:
+        """
+        Retrieves the number of steps from the source to every square, or -1 for squares that can not be reached.
+        Rather than visiting the squares of every layer, bit j of all the distances is set at once from the union of
+        the layers whose distance has bit j set, and the resulting bit planes are interleaved in bulk.
+        Returns:
+            array: signed 32-bit distance of every square, indexed by square index
+        """
+        size = len(self)
+        planes = [0] * 32
+        reached = 0
+        for distance, layer in enumerate(self.iter_layers(source)):
+            reached |= layer
+            for bit in range(distance.bit_length()):
+                if distance >> bit & 1:
+                    planes[bit] |= layer
+
+        # bits 8k to 8k + 7 of the distances make up byte k of every little-endian 32-bit distance
+        unreached = int.from_bytes(
+            to_bytes(~reached & ((1 << size) - 1), size), "little"
+        )
+        slots = bytearray(4 * size)
+        for byte in range(4):
+            combined = unreached * 0xFF
+            for bit, plane in enumerate(planes[8 * byte : 8 * byte + 8]):
+                if plane:
+                    combined |= int.from_bytes(to_bytes(plane, size), "little") << bit
+            slots[byte::4] = combined.to_bytes(size, "little")
+        distances = array.array("i")
+        distances.frombytes(bytes(slots))
+        if sys.byteorder == "big":
+            distances.byteswap()
+        return distances
+
+
+def is_reachable(maze: AnyMaze) -> bool:
+    """Tells whether the exit of a maze can be reached from its entrance, regardless of the cost"""
+    exit_index = maze.exit.index
+    layers = Bitboard.from_maze(maze).iter_layers(maze.entrance.index, exit_index)
+    return any(layer >> exit_index & 1 for layer in layers)
+
+
+def distance_layers(maze: AnyMaze) -> List[List[int]]:
+    """Retrieves the indices of the squares reached after 0, 1, 2... steps from the entrance of a maze"""
+    bitboard = Bitboard.from_maze(maze)
+    return [indices(layer) for layer in bitboard.iter_layers(maze.entrance.index)]
+
+
+def distance_field(maze: AnyMaze) -> array.array:
+    """Retrieves the number of steps from the entrance of a maze to every square, or -1 where it can not be reached"""
+    return Bitboard.from_maze(maze).distances(maze.entrance.index)
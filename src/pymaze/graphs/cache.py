@@ -0,0 +1,142 @@
+"""
+Contains a process wide cache of graphs built from mazes, so that solving the same maze again skips the conversion
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Hashable, Tuple, TypeVar
+
+from ..models.maze import AnyMaze
+from ..profiling import stage
+from .compiled import CompiledGraph
+from .converter import make_graph
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Default budget of the graph cache, which is 256 MiB
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+# Rough number of bytes taken by every node and edge of a NetworkX graph, which stores them in nested dictionaries
+NX_NODE_BYTES: int = 400
+NX_EDGE_BYTES: int = 300
+
+Graph = TypeVar("Graph")
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a graph cache
+    Args:
+        hits (int): number of lookups that found a cached graph
+        misses (int): number of lookups that had to build a graph
+        evictions (int): number of graphs dropped to stay within the byte budget
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class GraphCache:
+    """
+    Least recently used cache of the graphs of mazes, keyed by the fingerprint of their content. Graphs get evicted,
+    least recently used first, once their estimated total size exceeds the byte budget. Graphs larger than the whole
+    budget are built but never cached.
+    Args:
+        max_bytes (int): budget of the estimated size of all cached graphs in bytes
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, Tuple[object, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Retrieves the number of cached graphs"""
+        return len(self._entries)
+
+    def networkx(self, maze: AnyMaze) -> "nx.DiGraph":
+        """Retrieves the NetworkX graph of a maze, building it with converter.make_graph() on a miss"""
+        return self._get(("networkx", maze.fingerprint), maze, make_graph, nx_nbytes)
+
+    def compiled(self, maze: AnyMaze) -> CompiledGraph:
+        """Retrieves the compiled graph of a maze, compiling it on a miss"""
+        return self._get(
+            ("compiled", maze.fingerprint),
+            maze,
+            CompiledGraph.from_maze,
+            lambda graph: graph.nbytes,
+        )
+
+    def get(
+        self,
+        kind: str,
+        maze: AnyMaze,
+        build: Callable[[AnyMaze], Graph],
+        size: Callable[[Graph], int],
+    ) -> Graph:
+        """
+        Retrieves any other structure derived from a maze, building it on a miss. It shares the byte budget and the
+        least recently used order of the graphs.
+        Args:
+            kind (str): name of the structure, which must differ from the graph kinds
+            maze (AnyMaze): maze the structure is derived from
+            build (Callable): builds the structure from the maze
+            size (Callable): estimates the size of the structure in bytes
+        Returns:
+            the cached or freshly built structure
+        """
+        return self._get((kind, maze.fingerprint), maze, build, size)
+
+    def clear(self) -> None:
+        """Drops all the cached graphs and resets the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.stats = CacheStats()
+
+    def _get(
+        self,
+        key: Hashable,
+        maze: AnyMaze,
+        build: Callable[[AnyMaze], Graph],
+        size: Callable[[Graph], int],
+    ) -> Graph:
+        """Retrieves a cached graph, or builds and caches it evicting the least recently used graphs as needed"""
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]  # type: ignore[return-value]
+            self.stats.misses += 1
+
+        with stage("graph"):
+            graph = build(maze)
+        nbytes = size(graph)
+        if nbytes > self.max_bytes:
+            return graph
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (graph, nbytes)
+                self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+                self.stats.evictions += 1
+        return graph
+
+
+def nx_nbytes(graph: "nx.DiGraph") -> int:
+    """Estimates the size of a NetworkX graph in bytes from its number of nodes and edges"""
+    nodes: int = graph.number_of_nodes()
+    edges: int = graph.number_of_edges()
+    return nodes * NX_NODE_BYTES + edges * NX_EDGE_BYTES
+
+
+# Cache shared by all the solvers of the process
+GRAPH_CACHE = GraphCache()
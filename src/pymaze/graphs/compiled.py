@@ -0,0 +1,163 @@
+"""
+Contains a compiled graph of a maze, which stores its adjacency in compressed sparse row (CSR) arrays
+"""
+import array
+import bisect
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from ..models.border import Border
+from ..models.compact import ROLES
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from ..models.solution import Solution
+from ..models.square import Square
+from ..persistence.serializer import DECODING_TABLE
+from .edge import Edge
+
+
+def translation_table(flags: List[bool]) -> bytes:
+    """Turns a list of flags indexed by square value into a table for bytes.translate(), padded to 256 values"""
+    return bytes(flags).ljust(256, b"\x00")
+
+
+# Tables for bytes.translate() marking the square values that are nodes, or have a right or a bottom border. They
+# follow the same rules as converter.get_nodes() and converter.get_edges().
+NODE_MASK: bytes = translation_table(
+    [
+        role not in (Role.EXTERIOR, Role.WALL)
+        and (
+            role is not Role.NONE
+            or border.intersection
+            or border.dead_end
+            or border.corner
+        )
+        for border, role in DECODING_TABLE
+    ]
+)
+RIGHT_MASK: bytes = translation_table(
+    [bool(border & Border.RIGHT) for border, _ in DECODING_TABLE]
+)
+BOTTOM_MASK: bytes = translation_table(
+    [bool(border & Border.BOTTOM) for border, _ in DECODING_TABLE]
+)
+
+
+@dataclass(frozen=True)
+class CompiledGraph:
+    """
+    Directed graph of a maze whose nodes are numbered from 0 in the order of their square indices. The edges leaving
+    node id n are stored from offsets[n] up to offsets[n + 1] in the targets and weights arrays. The graph does not
+    reference the maze it was compiled from, so that it can be kept around and reused by any solver.
+    Args:
+        width (int): width of the maze, used to tell the row and column of the squares
+        squares (array): square index of every node id, in increasing order
+        roles (bytes): role of every node id
+        offsets (array): position of the first edge of every node id, followed by the total number of edges
+        targets (array): target node id of every edge
+        weights (array): weight of every edge
+    """
+
+    width: int
+    squares: array.array
+    roles: bytes
+    offsets: array.array
+    targets: array.array
+    weights: array.array
+
+    def __len__(self) -> int:
+        """Retrieves the number of nodes in the graph"""
+        return len(self.squares)
+
+    @property
+    def nbytes(self) -> int:
+        """Retrieves the memory footprint of the arrays making up the graph in bytes"""
+        return len(self.roles) + sum(
+            len(values) * values.itemsize
+            for values in (self.squares, self.offsets, self.targets, self.weights)
+        )
+
+    @classmethod
+    def from_maze(cls, maze: AnyMaze) -> "CompiledGraph":
+        """
+        Compiles the graph of a maze straight from its packed square values, without creating squares or edges.
+        Nodes next to each other in a row are connected when none of the squares from the first one up to the square
+        before the second one has a right border. The columns are swept the same way looking for bottom borders.
+        """
+        width = maze.width
+        values = bytes(maze.values)
+        nodes = values.translate(NODE_MASK)
+        squares = array.array(
+            "i", (match.start() for match in re.finditer(b"\x01", nodes))
+        )
+        roles = bytes(values[index] for index in squares).translate(ROLES)
+        role_weights = [role_weight(Role(role)) for role in range(len(Role))]
+        edges: List[Tuple[int, int, int]] = []
+
+        right = values.translate(RIGHT_MASK)
+        for node_id in range(len(squares) - 1):
+            first, second = squares[node_id], squares[node_id + 1]
+            if first // width == second // width and right.find(1, first, second) == -1:
+                edges.append((node_id, node_id + 1, second - first))
+
+        bottom = values.translate(BOTTOM_MASK)
+        for column in range(width):
+            column_nodes = nodes[column::width]
+            column_bottom = bottom[column::width]
+            row = column_nodes.find(1)
+            while row != -1 and (following := column_nodes.find(1, row + 1)) != -1:
+                if column_bottom.find(1, row, following) == -1:
+                    edges.append(
+                        (
+                            bisect.bisect_left(squares, row * width + column),
+                            bisect.bisect_left(squares, following * width + column),
+                            following - row,
+                        )
+                    )
+                row = following
+
+        offsets = array.array("i", [0]) * (len(squares) + 1)
+        for first, second, _ in edges:
+            offsets[first + 1] += 1
+            offsets[second + 1] += 1
+        for node_id in range(len(squares)):
+            offsets[node_id + 1] += offsets[node_id]
+        targets = array.array("i", [0]) * offsets[-1]
+        weights = array.array("d", [0.0]) * offsets[-1]
+        cursors = offsets[:-1]
+        for first, second, distance in edges:
+            for source, target in ((first, second), (second, first)):
+                targets[cursors[source]] = target
+                weights[cursors[source]] = distance + role_weights[roles[target]]
+                cursors[source] += 1
+        return cls(width, squares, roles, offsets, targets, weights)
+
+    def node_id(self, square_index: int) -> int:
+        """
+        Retrieves the node id of the square with the given index
+        Raises:
+            KeyError: if the square is not a node of the graph
+        """
+        node_id = bisect.bisect_left(self.squares, square_index)
+        if node_id == len(self.squares) or self.squares[node_id] != square_index:
+            raise KeyError(square_index)
+        return node_id
+
+    def position(self, node_id: int) -> Tuple[int, int]:
+        """Retrieves the row and column of the square of the given node id"""
+        row, column = divmod(self.squares[node_id], self.width)
+        return row, column
+
+    def solution(self, maze: AnyMaze, path: List[int]) -> Solution:
+        """Turns a path of node ids into a solution made of the squares of the given maze"""
+        return Solution(squares=tuple(maze[self.squares[node_id]] for node_id in path))
+
+
+def role_weight(role: Role) -> float:
+    """
+    Retrieves the amount added to the distance of an edge leading to a square with the given role, which is the
+    bonus or penalty applied by Edge.weight()
+    """
+    origin = Square(0, 0, 0, Border.EMPTY)
+    return Edge(origin, Square(0, 0, 0, Border.EMPTY, role)).weight()
@@ -1,22 +1,29 @@
 """
 Contains a few functions that converts a maze into a graph
 """
-from typing import Set
-
-import networkx as nx
+from typing import TYPE_CHECKING, List, Set
 
 from ..models.square import Square
-from ..models.maze import Maze
+from ..models.maze import AnyMaze
 from ..models.role import Role
 from ..models.border import Border
 from .edge import Edge, Node
 
+if TYPE_CHECKING:
+    import networkx as nx
+
+# All the borders having a right or a bottom side, checked by membership as combining flags is slow
+RIGHT_BORDERS = frozenset(Border(value) for value in range(16) if value & Border.RIGHT)
+BOTTOM_BORDERS = frozenset(
+    Border(value) for value in range(16) if value & Border.BOTTOM
+)
+
 
-def get_nodes(maze: Maze) -> Set[Node]:
+def get_nodes(maze: AnyMaze) -> Set[Node]:
     """
     Retrieves a set of nodes from a given maze filtering out squares that are exteriors and ones that are walls.
     Args:
-        maze (Maze): Maze to extract nodes from
+        maze (AnyMaze): Maze to extract nodes from
     Returns:
         Set: set of nodes
     """
@@ -31,55 +38,54 @@ def get_nodes(maze: Maze) -> Set[Node]:
     return nodes
 
 
-def get_edges(maze: Maze, nodes: Set[Node]) -> Set[Edge]:
+def get_edges(maze: AnyMaze, nodes: Set[Node]) -> Set[Edge]:
     """
     Retrieves a set of edges from a given maze and the nodes that were extracted from the maze.
 
-    This looks for the immediate neighbors of each node supplied to the function. In this case, it moves east and south
-     in the maze, but it could just as well follow the opposite directions, remembering to change the loop indexing and
-     wall detection accordingly. It uses the bitwise AND operator (&) to check if a border around the current square has
-      either the right or bottom side, indicating a wall that terminates the search in that direction.
+    This sweeps the maze once in row-major order, remembering the last node of the current row and the last node of
+    every column that can still be reached moving east or south respectively. It looks the border of the current
+    square up in the precomputed sets of borders with a right or a bottom side, which indicate a wall that cuts off the
+    last node of the row or column from the squares that follow.
 
-    On the other hand, if it finds that a square located in the same row or column as the source node is also present
-    in the set of nodes, and there’s no wall between them, then it creates an Edge instance and adds it to the set of
-    edges.
+    On the other hand, if it finds that the current square is also present in the set of nodes, then it creates an
+    Edge instance from the last open node of its row and of its column, if any, and adds them to the set of edges.
+    Every square is visited exactly once, which makes this linear in the number of squares.
     Args:
-        maze (Maze): maze object
+        maze (AnyMaze): maze object
         nodes (set) of (Node): set of nodes extracted from maze
     Returns:
         set: set of edges connecting the squares
     """
     edges: Set[Edge] = set()
-
-    for source_node in nodes:
-        # follow the right node
-        node = source_node
-
-        for x in range(node.column + 1, maze.width):
-            if node.border & Border.RIGHT:
-                break
-            node = maze.squares[node.row * maze.width + x]
-            if node in nodes:
-                edges.add(Edge(source_node, node))
-                break
-
-        # follow down
-        node = source_node
-        for y in range(node.row + 1, maze.height):
-            if node.border & Border.BOTTOM:
-                break
-            node = maze.squares[y * maze.width + node.column]
-            if node in nodes:
-                edges.add(Edge(source_node, node))
-                break
+    nodes_by_index = {node.index: node for node in nodes}
+    last_in_columns: List[Node | None] = [None] * maze.width
+    squares = iter(maze)
+
+    for _ in range(maze.height):
+        last_in_row: Node | None = None
+        for column in range(maze.width):
+            square = next(squares)
+            if node := nodes_by_index.get(square.index):
+                if last_in_row is not None:
+                    edges.add(Edge(last_in_row, node))
+                if (last_in_column := last_in_columns[column]) is not None:
+                    edges.add(Edge(last_in_column, node))
+                last_in_row = last_in_columns[column] = node
+            if square.border in RIGHT_BORDERS:
+                last_in_row = None
+            if square.border in BOTTOM_BORDERS:
+                last_in_columns[column] = None
 
     return edges
 
 
-def make_graph(maze: Maze) -> nx.DiGraph:
+def make_graph(maze: AnyMaze) -> "nx.DiGraph":
     """
-    Creates a NetworkX Graph object given a Maze object
+    Creates a NetworkX Graph object given a Maze object. NetworkX is only imported by the time the first graph gets
+    created, as importing it takes much longer than starting the CLI.
     """
+    import networkx as nx  # pylint: disable=import-outside-toplevel
+
     nodes = get_nodes(maze=maze)
     edges = get_directed_edges(maze=maze, nodes=nodes)
     return nx.DiGraph(
@@ -87,6 +93,6 @@ def make_graph(maze: Maze) -> nx.DiGraph:
     )
 
 
-def get_directed_edges(maze: Maze, nodes: Set[Node]) -> Set[Edge]:
+def get_directed_edges(maze: AnyMaze, nodes: Set[Node]) -> Set[Edge]:
     """Retrieves directed edges from a given maze and nodes"""
     return (edges := get_edges(maze, nodes)) | {edge.flip for edge in edges}
@@ -0,0 +1,175 @@
+"""
+Contains the directed acyclic graph of all the cheapest paths through a maze, which can count, sample and stream its
+solutions without enumerating all of them
+"""
+import random
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterator, List
+
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from ..models.solution import Solution
+from .cache import GRAPH_CACHE
+from .compiled import CompiledGraph
+from .native import iter_paths, multi_source_predecessors, shortest_path_predecessors
+
+
+@dataclass(frozen=True)
+class ShortestPathDAG:
+    """
+    Shortest path directed acyclic graph (DAG) of a compiled graph, made of every edge lying on a cheapest path from
+    the source to the target. The number of paths reaching every node of the DAG is computed once with dynamic
+    programming, which allows counting and uniformly sampling the cheapest paths even when there are too many of them
+    to enumerate. The paths of a maze with several entrances or exits run from a virtual super-source to a virtual
+    super-sink, whose node ids follow those of the graph and are left out of the paths handed out.
+    Args:
+        graph (CompiledGraph): graph the paths go through
+        source (int): node id the paths start from
+        target (int): node id the paths end at
+        predecessors (list): predecessor node ids of every node id on a cheapest path from the source
+    """
+
+    graph: CompiledGraph
+    source: int
+    target: int
+    predecessors: List[List[int]]
+
+    @classmethod
+    def from_maze(cls, maze: AnyMaze) -> "ShortestPathDAG":
+        """
+        Factory function building the DAG of all the cheapest paths from the entrance to the exit of a maze, or from
+        any entrance to any exit of a maze with several of them
+        """
+        graph = GRAPH_CACHE.compiled(maze)
+        entrances, exits = maze.roles[Role.ENTRANCE], maze.roles[Role.EXIT]
+        if len(entrances) > 1 or len(exits) > 1:
+            return cls(
+                graph,
+                len(graph),
+                len(graph) + 1,
+                multi_source_predecessors(
+                    graph,
+                    [graph.node_id(index) for index in entrances],
+                    [graph.node_id(index) for index in exits],
+                ),
+            )
+        source = graph.node_id(maze.entrance.index)
+        target = graph.node_id(maze.exit.index)
+        return cls(
+            graph, source, target, shortest_path_predecessors(graph, source, target)
+        )
+
+    @cached_property
+    def counts(self) -> List[int]:
+        """
+        Cached property with the number of cheapest paths from the source to every node id that leads to the target,
+        and 0 for every other node id. Counts are exact Python integers, however large they grow.
+        Raises:
+            ValueError: if a cycle of zero cost edges between rewards lies on a cheapest path, as the number of
+            paths is then no longer given by the DAG
+        """
+        counts = [0] * len(self.predecessors)
+        if self.source != self.target and not self.predecessors[self.target]:
+            return counts
+
+        ancestors = {self.target}
+        stack = [self.target]
+        while stack:
+            for predecessor in self.predecessors[stack.pop()]:
+                if predecessor not in ancestors:
+                    ancestors.add(predecessor)
+                    stack.append(predecessor)
+
+        successors: Dict[int, List[int]] = {node: [] for node in ancestors}
+        for node in ancestors:
+            for predecessor in self.predecessors[node]:
+                successors[predecessor].append(node)
+        in_degrees = {node: len(self.predecessors[node]) for node in ancestors}
+
+        counts[self.source] = 1
+        ready = [self.source]
+        visited = 0
+        while ready:
+            node = ready.pop()
+            visited += 1
+            for successor in successors[node]:
+                counts[successor] += counts[node]
+                in_degrees[successor] -= 1
+                if in_degrees[successor] == 0:
+                    ready.append(successor)
+        if visited != len(ancestors):
+            raise ValueError("Cheapest paths go through a cycle of zero cost edges")
+        return counts
+
+    def count(self) -> int:
+        """Retrieves the number of cheapest paths from the source to the target"""
+        return self.counts[self.target]
+
+    def sample(self, k: int, rng: random.Random | None = None) -> List[List[int]]:
+        """
+        Draws k cheapest paths uniformly at random, with replacement. Every path is built backwards from the target
+        by picking each predecessor with a probability proportional to the number of paths reaching it.
+        Args:
+            k (int): number of paths to draw
+            rng (Random): optional random number generator to draw the paths with
+        Returns:
+            List: paths of node ids from the source to the target, which is empty when the target can not be reached
+        """
+        if self.count() == 0:
+            return []
+        rng = rng or random.Random()
+        counts = self.counts
+        paths = []
+        for _ in range(k):
+            path = [self.target]
+            while path[-1] != self.source:
+                choice = rng.randrange(counts[path[-1]])
+                for predecessor in self.predecessors[path[-1]]:
+                    if choice < counts[predecessor]:
+                        path.append(predecessor)
+                        break
+                    choice -= counts[predecessor]
+            path.reverse()
+            paths.append(self._without_virtual(path))
+        return paths
+
+    def __iter__(self) -> Iterator[List[int]]:
+        """Lazily streams every cheapest path of node ids, one at a time"""
+        return map(
+            self._without_virtual,
+            iter_paths(self.predecessors, self.source, self.target),
+        )
+
+    def _without_virtual(self, path: List[int]) -> List[int]:
+        """Drops the virtual super-source and super-sink from the ends of a path"""
+        if self.source >= len(self.graph):
+            return path[1:-1]
+        return path
+
+
+def count_solutions(maze: AnyMaze) -> int:
+    """Retrieves the exact number of cheapest solutions of a maze without enumerating them"""
+    return ShortestPathDAG.from_maze(maze).count()
+
+
+def sample_solutions(maze: AnyMaze, k: int, seed: int | None = None) -> List[Solution]:
+    """
+    Draws k of the cheapest solutions of a maze uniformly at random, with replacement
+    Args:
+        maze (AnyMaze): maze to solve
+        k (int): number of solutions to draw
+        seed (int): optional seed making the draw reproducible
+    Returns:
+        List: solutions drawn, which is empty when the maze has no solution
+    """
+    dag = ShortestPathDAG.from_maze(maze)
+    return [
+        dag.graph.solution(maze, path) for path in dag.sample(k, random.Random(seed))
+    ]
+
+
+def stream_solutions(maze: AnyMaze) -> Iterator[Solution]:
+    """Lazily streams all the cheapest solutions of a maze, keeping a single path in memory at a time"""
+    dag = ShortestPathDAG.from_maze(maze)
+    return (dag.graph.solution(maze, path) for path in dag)
@@ -0,0 +1,398 @@
+"""
+Contains a contraction hierarchy of a compiled graph, which is built once for a maze that rarely changes and answers
+point to point queries with a bidirectional search that only goes up the hierarchy. The hierarchy is persisted next to
+the maze file, and is only loaded back for the maze it was built from.
+"""
+import array
+import heapq
+import math
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Set, Tuple
+
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from .cache import GRAPH_CACHE
+from .compiled import CompiledGraph, role_weight
+
+MAGIC_NUMBER: bytes = b"MZCH"
+FORMAT_VERSION: int = 1
+
+# Suffix of the file a hierarchy is persisted to, next to the maze file
+HIERARCHY_SUFFIX: str = ".ch"
+
+# Number of node ids settled by a witness search before giving up and adding the shortcut. A lower limit builds the
+# hierarchy faster at the cost of a few unneeded shortcuts, which never make the queries wrong.
+WITNESS_LIMIT: int = 64
+
+# Node ids to start from or to reach, mapped to their extra cost
+Seeds = Dict[int, float]
+
+
+@dataclass(frozen=True)
+class HierarchySearch:
+    """
+    Outcome of a search in a contraction hierarchy
+    Args:
+        cost (float): cheapest cost including the extra costs of the seeds, or infinity if no goal can be reached
+        path (List): node ids of the path in the compiled graph with the shortcuts unpacked, or None if unreachable
+        settled (int): number of node ids settled by both directions of the search
+    """
+
+    cost: float
+    path: List[int] | None
+    settled: int
+
+
+@dataclass(frozen=True)
+class ContractionHierarchy:
+    """
+    Contraction hierarchy of a compiled graph. The weight of an edge is the distance plus the bonus or penalty of the
+    role of its target, which splits into half of the role weight of each end and a symmetric part. The hierarchy
+    is therefore built on the undirected graph of the symmetric weights, and a cost from a node id to another one is
+    their symmetric cost plus half of the role weight of the target minus half of the role weight of the source.
+    Every node id keeps the edges, original or shortcut, leading to node ids contracted after it, stored from
+    offsets[n] up to offsets[n + 1] in the targets, weights and middles arrays.
+    Args:
+        ranks (array): position of every node id in the contraction order
+        halves (array): half of the role weight of every node id
+        offsets (array): position of the first upward edge of every node id, followed by the total number of edges
+        targets (array): higher ranked node id of every upward edge
+        weights (array): symmetric weight of every upward edge
+        middles (array): node id a shortcut was contracted through, or -1 for the edges of the compiled graph
+    """
+
+    ranks: array.array
+    halves: array.array
+    offsets: array.array
+    targets: array.array
+    weights: array.array
+    middles: array.array
+
+    def __len__(self) -> int:
+        """Retrieves the number of nodes in the hierarchy"""
+        return len(self.ranks)
+
+    @property
+    def shortcuts(self) -> int:
+        """Retrieves the number of shortcuts added while contracting the graph"""
+        return len(self.middles) - self.middles.count(-1)
+
+    @classmethod
+    def from_graph(cls, graph: CompiledGraph) -> "ContractionHierarchy":
+        """
+        Contracts the node ids of a compiled graph one by one, least important first. The importance of a node id is
+        the number of shortcuts its contraction needs minus the number of its edges, plus the number of its neighbors
+        already contracted, and is updated lazily when the node id comes up. A shortcut between two neighbors of the
+        contracted node id is only added when a bounded witness search finds no path as cheap that avoids it.
+        """
+        size = len(graph)
+        halves = array.array("d", (role_weight(Role(role)) / 2 for role in graph.roles))
+        adjacency: List[Dict[int, float]] = [{} for _ in range(size)]
+        for node in range(size):
+            for edge in range(graph.offsets[node], graph.offsets[node + 1]):
+                target = graph.targets[edge]
+                weight = graph.weights[edge] - halves[target] + halves[node]
+                if weight < adjacency[node].get(target, math.inf):
+                    adjacency[node][target] = weight
+        middles: Dict[Tuple[int, int], int] = {}
+
+        ranks = array.array("i", [-1]) * size
+        upward: List[List[Tuple[int, float, int]]] = [[] for _ in range(size)]
+        contracted_neighbors = [0] * size
+        queue = [(len(adjacency[node]), node) for node in range(size)]
+        heapq.heapify(queue)
+        rank = 0
+        while queue:
+            _, node = heapq.heappop(queue)
+            if ranks[node] != -1:
+                continue
+            shortcuts = find_shortcuts(adjacency, node)
+            priority = (
+                len(shortcuts) - len(adjacency[node]) + contracted_neighbors[node]
+            )
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, node))
+                continue
+
+            ranks[node] = rank
+            rank += 1
+            for first, second, weight in shortcuts:
+                if weight < adjacency[first].get(second, math.inf):
+                    adjacency[first][second] = adjacency[second][first] = weight
+                    middles[min(first, second), max(first, second)] = node
+            for neighbor, weight in adjacency[node].items():
+                middle = middles.get((min(node, neighbor), max(node, neighbor)), -1)
+                upward[node].append((neighbor, weight, middle))
+                del adjacency[neighbor][node]
+                contracted_neighbors[neighbor] += 1
+            adjacency[node] = {}
+
+        offsets = array.array("i", [0]) * (size + 1)
+        for node, node_edges in enumerate(upward):
+            offsets[node + 1] = offsets[node] + len(node_edges)
+        edges = [edge for node_edges in upward for edge in node_edges]
+        return cls(
+            ranks=ranks,
+            halves=halves,
+            offsets=offsets,
+            targets=array.array("i", (target for target, _, _ in edges)),
+            weights=array.array("d", (weight for _, weight, _ in edges)),
+            middles=array.array("i", (middle for _, _, middle in edges)),
+        )
+
+    @classmethod
+    def from_maze(cls, maze: AnyMaze) -> "ContractionHierarchy":
+        """Builds the hierarchy of the compiled graph of a maze, taken from the shared cache"""
+        return cls.from_graph(GRAPH_CACHE.compiled(maze))
+
+    def distance(self, source: int, target: int) -> float:
+        """Retrieves the cheapest cost from a node id to another, or infinity if the target can not be reached"""
+        return self.search({source: 0.0}, {target: 0.0}).cost
+
+    def path(self, source: int, target: int) -> List[int] | None:
+        """Retrieves the node ids of a cheapest path from a node id to another, or None if it can not be reached"""
+        return self.search({source: 0.0}, {target: 0.0}).path
+
+    def search(self, starts: Seeds, goals: Seeds) -> HierarchySearch:
+        """
+        Runs Dijkstra's algorithm up the hierarchy from the node ids to start from and, backwards, from the node ids to
+        reach, always advancing the direction with the cheaper next node id. The highest ranked node id of a cheapest
+        path is reached by both directions, and either direction stops once its cheapest queued cost can not improve
+        on the best meeting found so far.
+        Args:
+            starts (Seeds): node ids to start from, with the extra cost of starting from them
+            goals (Seeds): node ids to reach, with the extra cost of ending on them
+        Returns:
+            HierarchySearch: cheapest cost and path from any of the starts to any of the goals
+        """
+        halves = self.halves
+        forward = Direction(
+            {node: cost - halves[node] for node, cost in starts.items()}
+        )
+        backward = Direction(
+            {node: cost + halves[node] for node, cost in goals.items()}
+        )
+        best, meeting = math.inf, -1
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        while True:
+            candidates = [
+                direction
+                for direction in (forward, backward)
+                if direction.queue and direction.queue[0][0] < best
+            ]
+            if not candidates:
+                break
+            current = min(candidates, key=lambda direction: direction.queue[0][0])
+            other = backward if current is forward else forward
+            distance, node = heapq.heappop(current.queue)
+            if node in current.settled:
+                continue
+            current.settled.add(node)
+            if node in other.distances and distance + other.distances[node] < best:
+                best, meeting = distance + other.distances[node], node
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                candidate = distance + weights[edge]
+                if candidate < current.distances.get(neighbor, math.inf):
+                    current.distances[neighbor] = candidate
+                    current.predecessors[neighbor] = node
+                    heapq.heappush(current.queue, (candidate, neighbor))
+
+        settled = len(forward.settled) + len(backward.settled)
+        if meeting == -1:
+            return HierarchySearch(math.inf, None, settled)
+        upward = forward.chain(meeting)
+        downward = backward.chain(meeting)[::-1]
+        return HierarchySearch(best, self.unpack(upward + downward[1:]), settled)
+
+    def unpack(self, nodes: List[int]) -> List[int]:
+        """Replaces the shortcuts between consecutive node ids of a path with the node ids they were contracted through"""
+        path = [nodes[0]]
+        stack = [(first, second) for first, second in zip(nodes, nodes[1:])][::-1]
+        while stack:
+            first, second = stack.pop()
+            middle = self.middle(first, second)
+            if middle == -1:
+                path.append(second)
+            else:
+                stack.extend(((middle, second), (first, middle)))
+        return path
+
+    def middle(self, first: int, second: int) -> int:
+        """
+        Retrieves the node id the edge between two node ids was contracted through, or -1 for an edge of the compiled
+        graph. The edge is stored with the lower ranked of the two node ids.
+        Raises:
+            KeyError: if the two node ids are not joined by an edge of the hierarchy
+        """
+        if self.ranks[first] > self.ranks[second]:
+            first, second = second, first
+        for edge in range(self.offsets[first], self.offsets[first + 1]):
+            if self.targets[edge] == second:
+                middle: int = self.middles[edge]
+                return middle
+        raise KeyError((first, second))
+
+    def write(self, file: BinaryIO, fingerprint: bytes) -> None:
+        """
+        Writes the hierarchy into a binary file, after the fingerprint of the maze it was built from. The arrays are
+        written in little-endian byte order.
+        """
+        file.write(MAGIC_NUMBER)
+        file.write(struct.pack("<B", FORMAT_VERSION))
+        file.write(struct.pack("<B", len(fingerprint)) + fingerprint)
+        file.write(struct.pack("<2I", len(self), len(self.targets)))
+        for values in self._arrays():
+            if sys.byteorder == "big":
+                values = array.array(values.typecode, values)
+                values.byteswap()
+            file.write(values.tobytes())
+
+    @classmethod
+    def read(cls, file: BinaryIO, fingerprint: bytes) -> "ContractionHierarchy":
+        """
+        Reads a hierarchy from a binary file written by write()
+        Raises:
+            ValueError: if the file is not a hierarchy, was written by another version or for a maze with another
+                fingerprint, or if its arrays are truncated or followed by more data
+        """
+        if file.read(len(MAGIC_NUMBER)) != MAGIC_NUMBER:
+            raise ValueError("Unknown file type")
+        (format_version,) = struct.unpack("<B", file.read(1))
+        if format_version != FORMAT_VERSION:
+            raise ValueError("Unsupported file format version")
+        (length,) = struct.unpack("<B", file.read(1))
+        if file.read(length) != fingerprint:
+            raise ValueError("The hierarchy was built for another maze")
+        nodes, edges = struct.unpack("<2I", file.read(2 * 4))
+        arrays = []
+        for typecode, count in zip(
+            "idiidi", (nodes, nodes, nodes + 1, edges, edges, edges)
+        ):
+            values = array.array(typecode)
+            data = file.read(count * values.itemsize)
+            if len(data) != count * values.itemsize:
+                raise ValueError("The hierarchy file is truncated")
+            values.frombytes(data)
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+        if file.read(1):
+            raise ValueError("Unexpected data after the hierarchy")
+        return cls(*arrays)
+
+    def _arrays(self) -> Tuple[array.array, ...]:
+        """Retrieves the arrays of the hierarchy in the order of the fields and of the file"""
+        return (
+            self.ranks,
+            self.halves,
+            self.offsets,
+            self.targets,
+            self.weights,
+            self.middles,
+        )
+
+
+class Direction:
+    """
+    State of one direction of a bidirectional search
+    Args:
+        seeds (Seeds): node ids the direction starts from, with their starting cost
+    """
+
+    def __init__(self, seeds: Seeds) -> None:
+        self.distances: Dict[int, float] = dict(seeds)
+        self.predecessors: Dict[int, int] = {}
+        self.settled: Set[int] = set()
+        self.queue = [(cost, node) for node, cost in seeds.items()]
+        heapq.heapify(self.queue)
+
+    def chain(self, node: int) -> List[int]:
+        """Follows the predecessors back from a node id to a seed, retrieving the node ids from the seed onwards"""
+        chain = [node]
+        while chain[-1] in self.predecessors:
+            chain.append(self.predecessors[chain[-1]])
+        return chain[::-1]
+
+
+def find_shortcuts(
+    adjacency: List[Dict[int, float]], node: int
+) -> List[Tuple[int, int, float]]:
+    """
+    Finds the shortcuts needed to contract a node id, i.e. the pairs of its neighbors whose cheapest path goes through
+    it, as far as a witness search limited to WITNESS_LIMIT settled node ids can tell
+    Returns:
+        List: both neighbors and the weight of every shortcut
+    """
+    neighbors = list(adjacency[node].items())
+    shortcuts: List[Tuple[int, int, float]] = []
+    for position, (first, first_weight) in enumerate(neighbors[:-1]):
+        costs = {
+            second: first_weight + second_weight
+            for second, second_weight in neighbors[position + 1 :]
+        }
+        witnesses = witness_search(adjacency, first, node, max(costs.values()))
+        shortcuts.extend(
+            (first, second, cost)
+            for second, cost in costs.items()
+            if witnesses.get(second, math.inf) > cost
+        )
+    return shortcuts
+
+
+def witness_search(
+    adjacency: List[Dict[int, float]], source: int, excluded: int, limit: float
+) -> Dict[int, float]:
+    """
+    Runs Dijkstra's algorithm from a node id avoiding the excluded node id, up to the given cost or WITNESS_LIMIT
+    settled node ids
+    Returns:
+        Dict: cheapest cost found to the node ids reached, which may be too high for the ones not settled
+    """
+    distances = {source: 0.0}
+    settled = 0
+    queue = [(0.0, source)]
+    while queue and settled < WITNESS_LIMIT:
+        distance, node = heapq.heappop(queue)
+        if distance > limit:
+            break
+        if distance > distances[node]:
+            continue
+        settled += 1
+        for neighbor, weight in adjacency[node].items():
+            candidate = distance + weight
+            if neighbor != excluded and candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                heapq.heappush(queue, (candidate, neighbor))
+    return distances
+
+
+def hierarchy_path(maze_path: Path) -> Path:
+    """Retrieves the path of the file the hierarchy of a maze file is persisted to, next to the maze file"""
+    return maze_path.with_suffix(HIERARCHY_SUFFIX)
+
+
+def load_hierarchy(maze: AnyMaze, maze_path: Path) -> ContractionHierarchy:
+    """
+    Loads the hierarchy persisted next to a maze file, or builds and persists it when it is missing or was built for
+    a previous version of the maze
+    Args:
+        maze (AnyMaze): maze loaded from the maze file
+        maze_path (Path): path of the maze file
+    Returns:
+        ContractionHierarchy: hierarchy of the compiled graph of the maze
+    """
+    path = hierarchy_path(maze_path)
+    try:
+        with path.open("rb") as file:
+            return ContractionHierarchy.read(file, maze.fingerprint)
+    except (FileNotFoundError, ValueError, struct.error):
+        pass
+    hierarchy = ContractionHierarchy.from_maze(maze)
+    with path.open("wb") as file:
+        hierarchy.write(file, maze.fingerprint)
+    return hierarchy
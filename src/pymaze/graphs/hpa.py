@@ -0,0 +1,458 @@
+"""
+Contains a hierarchical pathfinding (HPA*) solver for very large mazes. The grid is split into square clusters, the
+cheapest costs between the portals of every cluster are computed once, and a query searches the small abstract graph of
+the portals before refining the path within the clusters it goes through.
+
+Building the abstract graph takes 12 to 17 seconds per million squares with clusters of 16 x 16 squares, and the
+compiled and abstract graphs take about 45 bytes per square together, as measured on braided mazes of 1000 x 1000 and
+2000 x 2000 squares. Mazes of a few million squares are hence the practical limit, while a maze of 10000 x 10000 squares
+would take about half an hour and 4.5 GB to prepare.
+"""
+import array
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from ..models.solution import Solution
+from .cache import GRAPH_CACHE
+from .compiled import CompiledGraph, role_weight
+
+# Default number of rows and columns of the squares of a cluster. Building the abstract graph takes time proportional
+# to the number of squares times the cluster size, while smaller clusters make for a larger abstract graph.
+DEFAULT_CLUSTER_SIZE: int = 16
+
+# Node ids mapped to the cost of the edge leading to them
+Adjacency = Dict[int, float]
+
+
+@dataclass(frozen=True)
+class HierarchicalPath:
+    """
+    Outcome of a hierarchical search
+    Args:
+        cost (float): cost of the path, or infinity if the target can not be reached
+        path (List): node ids of the path in the compiled graph, or None if the target can not be reached
+        seconds (dict): time taken by every level of the search, i.e. "insert" connecting the source and the target
+            to the portals of their clusters, "abstract" searching the abstract graph and "refine" searching the
+            clusters along the abstract path
+    """
+
+    cost: float
+    path: List[int] | None
+    seconds: Dict[str, float]
+
+
+class ClusterGraph:
+    """
+    Abstract graph of a compiled graph split into square clusters of squares. By default every edge from one cluster
+    to another is a transition, whose ends are the portals of the clusters. The abstract graph joins the portals of
+    every cluster with the cheapest cost between them within the cluster, and keeps the transitions. As every path
+    leaving a cluster goes through its portals, the cheapest path in the abstract graph is the cheapest one.
+
+    Entrances can be merged as in classic HPA* instead: an entrance gathers the edges from one cluster to a
+    neighboring one whose ends are connected within both clusters, which is what an open segment of the border between
+    two clusters of a grid becomes in a maze, and is crossed by a single transition in its middle. This takes 20 to 30
+    percent fewer portals, but a path going through an entrance away from its transition detours through the
+    transition, and the detour is not bounded. Over 1200 random queries on braided mazes of 60 x 60 squares split into
+    clusters of 8 x 8 squares, the worst path found over merged entrances was 3.8 times as expensive as the cheapest.
+
+    The abstract graph is stored in CSR arrays like the compiled graph, the edges leaving abstract id n from
+    offsets[n] up to offsets[n + 1]. This takes 12 bytes per edge and 8 bytes per portal, plus 16 bytes per node of the
+    compiled graph for its cluster, role weight and abstract id.
+    Args:
+        graph (CompiledGraph): graph to split into clusters
+        cluster_size (int): number of rows and columns of the squares of a cluster
+        merge (bool): whether to merge the edges between clusters into entrances, defaults to False. Merging makes
+            the abstract graph smaller, but the cost of the paths is no longer bounded.
+    """
+
+    def __init__(
+        self,
+        graph: CompiledGraph,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+        merge: bool = False,
+    ) -> None:
+        if cluster_size < 1:
+            raise ValueError("The cluster size must be positive")
+        start = time.perf_counter()
+        self.graph = graph
+        self.cluster_size = cluster_size
+        self.merge = merge
+        columns = -(-graph.width // cluster_size)
+        self.clusters = array.array(
+            "i",
+            (
+                square // graph.width // cluster_size * columns
+                + square % graph.width // cluster_size
+                for square in graph.squares
+            ),
+        )
+        weights_by_role = [role_weight(Role(role)) for role in range(len(Role))]
+        self.role_weights = array.array(
+            "d", (weights_by_role[role] for role in graph.roles)
+        )
+        # the Manhattan distance never overestimates the remaining cost unless rewards make edges cheaper
+        self.admissible = Role.REWARD not in graph.roles
+
+        transitions = self._transitions()
+        self.portals = array.array(
+            "i", sorted({node for edge in transitions for node in edge})
+        )
+        self.abstract_ids = array.array("i", [-1]) * len(graph)
+        for abstract_id, portal in enumerate(self.portals):
+            self.abstract_ids[portal] = abstract_id
+
+        adjacency: List[Adjacency] = [{} for _ in self.portals]
+        for first, second in transitions:
+            for source, target in ((first, second), (second, first)):
+                adjacency[self.abstract_ids[source]][target] = self._edge_weight(
+                    source, target
+                )
+        portals: Dict[int, Set[int]] = {}
+        for portal in self.portals:
+            portals.setdefault(self.clusters[portal], set()).add(portal)
+        for cluster, cluster_portals in portals.items():
+            for portal in cluster_portals:
+                adjacency[self.abstract_ids[portal]].update(
+                    self._portal_edges(portal, cluster, cluster_portals)
+                )
+
+        self.offsets = array.array("i", [0])
+        self.targets = array.array("i")
+        self.weights = array.array("d")
+        for edges in adjacency:
+            self.targets.extend(self.abstract_ids[node] for node in edges)
+            self.weights.extend(edges.values())
+            self.offsets.append(len(self.targets))
+        self.build_seconds = time.perf_counter() - start
+
+    def _transitions(self) -> List[Tuple[int, int]]:
+        """
+        Retrieves the transitions between clusters, as the node ids at both ends of one of the edges of every
+        entrance. The edges of an entrance are sorted by the square of their end in the first cluster and the one in
+        the middle is kept.
+        """
+        graph, clusters = self.graph, self.clusters
+        offsets, targets = graph.offsets, graph.targets
+        components = self._components() if self.merge else None
+        entrances: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for node in range(len(graph)):
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if clusters[node] < clusters[target]:
+                    key = (
+                        (components[node], components[target])
+                        if components is not None
+                        else (node, target)
+                    )
+                    entrances.setdefault(key, []).append((node, target))
+        return [edges[(len(edges) - 1) // 2] for edges in entrances.values()]
+
+    def _components(self) -> array.array:
+        """
+        Labels every node id with the smallest node id it is connected to without leaving its cluster, with a
+        union-find over the edges within clusters
+        """
+        graph, clusters = self.graph, self.clusters
+        offsets, targets = graph.offsets, graph.targets
+        parents = array.array("i", range(len(graph)))
+
+        def find(node: int) -> int:
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        for node in range(len(graph)):
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if target > node and clusters[target] == clusters[node]:
+                    first, second = find(node), find(target)
+                    if first != second:
+                        parents[max(first, second)] = min(first, second)
+        for node in range(len(graph)):
+            parents[node] = find(node)
+        return parents
+
+    def _edge_weight(self, source: int, target: int) -> float:
+        """Retrieves the weight of the edge from a node id to another one of the compiled graph"""
+        graph = self.graph
+        for edge in range(graph.offsets[source], graph.offsets[source + 1]):
+            if graph.targets[edge] == target:
+                weight: float = graph.weights[edge]
+                return weight
+        raise ValueError("The node ids are not joined by an edge")
+
+    def _portal_edges(self, portal: int, cluster: int, portals: Set[int]) -> Adjacency:
+        """
+        Retrieves the cheapest cost from a portal to the other portals of its cluster, leaving out the portals whose
+        cheapest path goes through yet another portal. Such a path is already made of the edges of the portals on it,
+        so the abstract search finds it without the extra edge.
+        """
+        distances, predecessors = self.local_search(portal, cluster)
+        through = {portal: False}
+        edges: Adjacency = {}
+        for other in portals:
+            if other == portal or other not in distances:
+                continue
+            chain = [other]
+            while chain[-1] not in through:
+                chain.append(predecessors[chain[-1]])
+            known = chain.pop()
+            passes = through[known] or known != portal and known in portals
+            for node in reversed(chain):
+                through[node] = passes
+                passes = passes or node in portals
+            if not through[other]:
+                edges[other] = distances[other]
+        return edges
+
+    def __len__(self) -> int:
+        """Retrieves the number of portals, i.e. of nodes of the abstract graph"""
+        return len(self.portals)
+
+    @property
+    def nbytes(self) -> int:
+        """Retrieves the memory footprint of the arrays making up the abstract graph and the clusters in bytes"""
+        return sum(
+            len(values) * values.itemsize
+            for values in (
+                self.clusters,
+                self.role_weights,
+                self.portals,
+                self.abstract_ids,
+                self.offsets,
+                self.targets,
+                self.weights,
+            )
+        )
+
+    @classmethod
+    def from_maze(
+        cls,
+        maze: AnyMaze,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+        merge: bool = False,
+    ) -> "ClusterGraph":
+        """Builds the abstract graph of the compiled graph of a maze, taken from the shared cache"""
+        return cls(GRAPH_CACHE.compiled(maze), cluster_size, merge)
+
+    def local_search(
+        self, source: int, cluster: int, target: int = -1, backward: bool = False
+    ) -> Tuple[Adjacency, Dict[int, int]]:
+        """
+        Runs Dijkstra's algorithm from a node id without leaving its cluster
+        Args:
+            source (int): node id to start from
+            cluster (int): cluster to stay in
+            target (int): optional node id at which to stop the search once settled
+            backward (bool): whether to follow the edges backwards, which finds the cheapest costs to the source
+        Returns:
+            Tuple: cheapest cost of every node id reached and the predecessor of every node id but the source
+        """
+        graph, clusters, role_weights = self.graph, self.clusters, self.role_weights
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        distances = {source: 0.0}
+        predecessors: Dict[int, int] = {}
+        settled = set()
+        queue = [(0.0, source)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == target:
+                break
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                if clusters[neighbor] != cluster:
+                    continue
+                weight = weights[edge]
+                if backward:
+                    # the edge back from the neighbor enters this node id instead of the neighbor
+                    weight += role_weights[node] - role_weights[neighbor]
+                candidate = distance + weight
+                if candidate < distances.get(neighbor, math.inf):
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    heapq.heappush(queue, (candidate, neighbor))
+        return distances, predecessors
+
+    def search(self, source: int, target: int, weight: float = 1.0) -> HierarchicalPath:
+        """
+        Finds a path between two node ids. The source and the target are first connected to the portals of their
+        clusters, then the abstract graph is searched with weighted A*, and the abstract path is refined within the
+        clusters it goes through.
+        Args:
+            source (int): node id to start from
+            target (int): node id to reach
+            weight (float): factor applied to the Manhattan distance heuristic of the abstract search. Unless the
+                entrances are merged, the path is the cheapest one with a weight of 1, and at most weight times as
+                expensive as the cheapest one otherwise. The heuristic is left out when the graph has rewards, as it
+                could overestimate the remaining cost, so that the path is always the cheapest one then.
+        Returns:
+            HierarchicalPath: cost and node ids of the path, and the time taken by every level of the search
+        Raises:
+            ValueError: if the weight is lower than 1
+        """
+        if weight < 1:
+            raise ValueError("The weight must be at least 1")
+        seconds: Dict[str, float] = {}
+        start = time.perf_counter()
+        clusters = self.clusters
+        leaving, _ = self.local_search(source, clusters[source])
+        entering, _ = self.local_search(target, clusters[target], backward=True)
+        seconds["insert"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        abstract_path, cost = self._abstract_search(
+            source, target, leaving, entering, weight
+        )
+        seconds["abstract"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        path = None if abstract_path is None else self._refine(abstract_path)
+        seconds["refine"] = time.perf_counter() - start
+        return HierarchicalPath(cost, path, seconds)
+
+    def _abstract_search(
+        self,
+        source: int,
+        target: int,
+        leaving: Adjacency,
+        entering: Adjacency,
+        weight: float,
+    ) -> Tuple[List[int] | None, float]:
+        """
+        Runs weighted A* over the abstract graph, extended with a source joined to the portals of its cluster and a
+        target joined from the portals of its cluster, given by cluster searches. Both are numbered after the portals.
+        Returns:
+            Tuple: node ids of the abstract path and its cost, or None and infinity if the target can not be reached
+        """
+        graph, portals, abstract_ids = self.graph, self.portals, self.abstract_ids
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        width, squares = graph.width, graph.squares
+        target_row, target_column = graph.position(target)
+        factor = weight if self.admissible else 0.0
+        abstract_source, abstract_target = len(portals), len(portals) + 1
+
+        def estimate(abstract_id: int) -> float:
+            if abstract_id == abstract_target:
+                return 0.0
+            square: int = squares[
+                source if abstract_id == abstract_source else portals[abstract_id]
+            ]
+            row, column = divmod(square, width)
+            return factor * (abs(row - target_row) + abs(column - target_column))
+
+        source_edges = [
+            (abstract_ids[node], cost)
+            for node, cost in leaving.items()
+            if abstract_ids[node] != -1
+        ]
+        if target in leaving:
+            source_edges.append((abstract_target, leaving[target]))
+        target_edges = {
+            abstract_ids[node]: cost
+            for node, cost in entering.items()
+            if abstract_ids[node] != -1
+        }
+        distances = {abstract_source: 0.0}
+        predecessors: Dict[int, int] = {}
+        settled = set()
+        queue = [(estimate(abstract_source), abstract_source)]
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == abstract_target:
+                path = [target]
+                node = predecessors[node]
+                while node != abstract_source:
+                    path.append(portals[node])
+                    node = predecessors[node]
+                path.append(source)
+                return path[::-1], distances[abstract_target]
+            distance = distances[node]
+            if node == abstract_source:
+                neighbors = source_edges
+            else:
+                neighbors = list(
+                    zip(
+                        targets[offsets[node] : offsets[node + 1]],
+                        weights[offsets[node] : offsets[node + 1]],
+                    )
+                )
+                if node in target_edges:
+                    neighbors.append((abstract_target, target_edges[node]))
+            for neighbor, cost in neighbors:
+                # settled node ids are not reopened, which keeps the weighted search within its bound
+                if neighbor in settled:
+                    continue
+                candidate = distance + cost
+                if candidate < distances.get(neighbor, math.inf):
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    heapq.heappush(queue, (candidate + estimate(neighbor), neighbor))
+        return None, math.inf
+
+    def _refine(self, abstract_path: List[int]) -> List[int]:
+        """
+        Turns an abstract path into a path of the compiled graph. Consecutive node ids in different clusters are
+        joined by an edge, while the path between node ids of the same cluster is found by a search of the cluster.
+        """
+        path = [abstract_path[0]]
+        for first, second in zip(abstract_path, abstract_path[1:]):
+            cluster = self.clusters[first]
+            if self.clusters[second] != cluster:
+                path.append(second)
+                continue
+            _, predecessors = self.local_search(first, cluster, target=second)
+            segment = [second]
+            while segment[-1] != first:
+                segment.append(predecessors[segment[-1]])
+            path.extend(reversed(segment[:-1]))
+        return path
+
+
+def cluster_graph(
+    maze: AnyMaze, cluster_size: int = DEFAULT_CLUSTER_SIZE, merge: bool = False
+) -> ClusterGraph:
+    """Retrieves the abstract graph of a maze, building it on a miss of the shared cache"""
+    return GRAPH_CACHE.get(
+        f"clusters-{cluster_size}-{'merged' if merge else 'all'}",
+        maze,
+        lambda maze: ClusterGraph.from_maze(maze, cluster_size, merge),
+        lambda clusters: clusters.nbytes,
+    )
+
+
+def solve(
+    maze: AnyMaze,
+    cluster_size: int = DEFAULT_CLUSTER_SIZE,
+    weight: float = 1.0,
+    merge: bool = False,
+) -> Tuple[Solution | None, HierarchicalPath]:
+    """
+    Solves a maze with hierarchical pathfinding, from its entrance to its exit
+    Args:
+        maze (AnyMaze): maze to solve
+        cluster_size (int): number of rows and columns of the squares of a cluster
+        weight (float): bound of the cost of the solution relative to the cheapest one, which is found with 1
+        merge (bool): whether to merge the edges between clusters into entrances, which gives up the bound of the
+            cost of the solution for a smaller abstract graph, defaults to False
+    Returns:
+        Tuple: the solution, or None if no solution can be found, and the outcome of the search with its timings
+    """
+    clusters = cluster_graph(maze, cluster_size, merge)
+    graph = clusters.graph
+    result = clusters.search(
+        graph.node_id(maze.entrance.index), graph.node_id(maze.exit.index), weight
+    )
+    solution = None if result.path is None else graph.solution(maze, result.path)
+    return solution, result
@@ -0,0 +1,304 @@
+"""
+Contains a native shortest path engine, which searches a maze graph using integer node ids, flat arrays and a binary
+heap instead of the NetworkX graph keyed by squares
+"""
+import array
+import heapq
+import math
+from typing import Callable, Iterator, List, Sequence
+
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from ..models.solution import Solution
+from .cache import GRAPH_CACHE
+from .compiled import CompiledGraph
+
+# Heuristic estimating the remaining cost from a node id to the target of a search
+Heuristic = Callable[[int], float]
+
+
+def manhattan(graph: CompiledGraph, target: int) -> Heuristic:
+    """
+    Retrieves the Manhattan distance heuristic towards the given target node id. This never overestimates the
+    remaining cost as long as no edge is cheaper than its distance, i.e. when the graph has no rewards.
+    """
+    width = graph.width
+    squares = graph.squares
+    row, column = graph.position(target)
+    return lambda node: abs(squares[node] // width - row) + abs(
+        squares[node] % width - column
+    )
+
+
+def shortest_path(
+    graph: CompiledGraph, source: int, target: int, heuristic: Heuristic | None = None
+) -> List[int] | None:
+    """
+    Finds a cheapest path between two node ids using Dijkstra's algorithm, or A* when given a consistent heuristic.
+    Distances and predecessors are kept in flat arrays indexed by node id.
+    Args:
+        graph (CompiledGraph): graph to search
+        source (int): node id to start from
+        target (int): node id to reach
+        heuristic (Heuristic): optional estimate of the remaining cost from a node id to the target
+    Returns:
+        List: node ids of the path from the source to the target, or None if the target can not be reached
+    """
+    distances = array.array("d", [math.inf]) * len(graph)
+    predecessors = array.array("i", [-1]) * len(graph)
+    settled = bytearray(len(graph))
+    distances[source] = 0.0
+    queue = [(heuristic(source) if heuristic else 0.0, source)]
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    while queue:
+        _, node = heapq.heappop(queue)
+        if node == target:
+            return reconstruct(predecessors, target)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        distance = distances[node]
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                priority = candidate + heuristic(neighbor) if heuristic else candidate
+                heapq.heappush(queue, (priority, neighbor))
+    return None
+
+
+def shortest_path_predecessors(
+    graph: CompiledGraph, source: int, target: int
+) -> List[List[int]]:
+    """
+    Runs Dijkstra's algorithm from the source until every node id as close as the target is settled, keeping all the
+    predecessors of a node id through which it can be reached at the same lowest cost.
+    Args:
+        graph (CompiledGraph): graph to search
+        source (int): node id to start from
+        target (int): node id to reach
+    Returns:
+        List: predecessor node ids of every node id, which are empty for the source and for unreachable node ids
+    """
+    distances = array.array("d", [math.inf]) * len(graph)
+    predecessors: List[List[int]] = [[] for _ in range(len(graph))]
+    settled = bytearray(len(graph))
+    distances[source] = 0.0
+    queue = [(0.0, source)]
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[target]:
+            break
+        if settled[node]:
+            continue
+        settled[node] = 1
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                predecessors[neighbor] = [node]
+                heapq.heappush(queue, (candidate, neighbor))
+            elif candidate == distances[neighbor]:
+                predecessors[neighbor].append(node)
+    return predecessors
+
+
+def multi_source_predecessors(
+    graph: CompiledGraph, sources: Sequence[int], targets: Sequence[int]
+) -> List[List[int]]:
+    """
+    Runs the search of shortest_path_predecessors() from a virtual super-source joined to every source at no cost, up
+    to a virtual super-sink joined from every target at no cost. The super-source and the super-sink are appended as
+    the node ids len(graph) and len(graph) + 1, so that the predecessors hold every cheapest path from any source to
+    any target as a path from the super-source to the super-sink.
+    Args:
+        graph (CompiledGraph): graph to search
+        sources (Sequence): node ids to start from, which all start at a cost of zero
+        targets (Sequence): node ids to reach, of which only the cheapest to reach lead to the super-sink
+    Returns:
+        List: predecessor node ids of every node id, followed by those of the super-source and of the super-sink
+    """
+    super_source = len(graph)
+    distances = array.array("d", [math.inf]) * len(graph)
+    predecessors: List[List[int]] = [[] for _ in range(len(graph))]
+    settled = bytearray(len(graph))
+    is_target = bytearray(len(graph))
+    for target in targets:
+        is_target[target] = 1
+    for source in sources:
+        distances[source] = 0.0
+        predecessors[source] = [super_source]
+    queue = [(0.0, source) for source in sources]
+    heapq.heapify(queue)
+    offsets, edge_targets, weights = graph.offsets, graph.targets, graph.weights
+    best = math.inf
+
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > best:
+            break
+        if settled[node]:
+            continue
+        settled[node] = 1
+        if is_target[node]:
+            best = distance
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = edge_targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                predecessors[neighbor] = [node]
+                heapq.heappush(queue, (candidate, neighbor))
+            elif candidate == distances[neighbor]:
+                predecessors[neighbor].append(node)
+    predecessors.append([])
+    predecessors.append(
+        []
+        if best == math.inf
+        else [target for target in targets if distances[target] == best]
+    )
+    return predecessors
+
+
+def multi_source_path(
+    graph: CompiledGraph, sources: Sequence[int], targets: Sequence[int]
+) -> List[int] | None:
+    """
+    Finds the cheapest path from any of the sources to any of the targets with a single run of Dijkstra's algorithm.
+    This is the same search as from a virtual super-source joined to every source at no cost, up to a virtual
+    super-sink joined from every target at no cost, so its cost does not depend on the number of sources and targets.
+    Args:
+        graph (CompiledGraph): graph to search
+        sources (Sequence): node ids to start from, which all start at a cost of zero
+        targets (Sequence): node ids to reach, the first one settled being the cheapest to reach
+    Returns:
+        List: node ids of the path from the best source to the best target, or None if no target can be reached
+    """
+    distances = array.array("d", [math.inf]) * len(graph)
+    predecessors = array.array("i", [-1]) * len(graph)
+    settled = bytearray(len(graph))
+    is_target = bytearray(len(graph))
+    for target in targets:
+        is_target[target] = 1
+    for source in sources:
+        distances[source] = 0.0
+    queue = [(0.0, source) for source in sources]
+    heapq.heapify(queue)
+    offsets, edge_targets, weights = graph.offsets, graph.targets, graph.weights
+
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if is_target[node]:
+            return reconstruct(predecessors, node)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = edge_targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                heapq.heappush(queue, (candidate, neighbor))
+    return None
+
+
+def multi_target_distances(
+    graph: CompiledGraph, source: int, targets: Sequence[int]
+) -> List[float]:
+    """
+    Runs Dijkstra's algorithm from the source until all the targets are settled, which finds the cheapest cost to
+    every target with a single search
+    Args:
+        graph (CompiledGraph): graph to search
+        source (int): node id to start from
+        targets (Sequence): node ids to reach
+    Returns:
+        List: cheapest cost from the source to every target, in the same order, or infinity if it can not be reached
+    """
+    distances = array.array("d", [math.inf]) * len(graph)
+    settled = bytearray(len(graph))
+    remaining = set(targets)
+    distances[source] = 0.0
+    queue = [(0.0, source)]
+    offsets, edge_targets, weights = graph.offsets, graph.targets, graph.weights
+
+    while queue and remaining:
+        distance, node = heapq.heappop(queue)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        remaining.discard(node)
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = edge_targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                heapq.heappush(queue, (candidate, neighbor))
+    return [distances[target] for target in targets]
+
+
+def reconstruct(predecessors: array.array, target: int) -> List[int]:
+    """Follows the predecessors back from the target to build the path of node ids leading to it"""
+    path = [target]
+    while predecessors[path[-1]] != -1:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+def iter_paths(
+    predecessors: List[List[int]], source: int, target: int
+) -> Iterator[List[int]]:
+    """
+    Lazily enumerates every path of node ids from the source to the target by walking the predecessors backwards
+    from the target, one path at a time. Node ids already on the current path are skipped, so that zero cost cycles
+    between neighboring rewards can not lead to endless paths.
+    """
+    if source != target and not predecessors[target]:
+        return
+    path = [target]
+    stack = [iter(predecessors[target])]
+    while stack:
+        if path[-1] == source:
+            yield path[::-1]
+            stack.pop()
+            path.pop()
+            continue
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            path.pop()
+        elif node not in path:
+            path.append(node)
+            stack.append(iter(predecessors[node]))
+
+
+def solve(maze: AnyMaze) -> Solution | None:
+    """
+    Solves a maze with the native engine, using A* with the Manhattan distance heuristic unless the maze has rewards,
+    which make edges cheaper than their distance. A maze with several entrances or exits, which is only accepted in
+    relaxed mode, is solved from the entrance to the exit of the cheapest pair instead. If no solution can be found
+    None is returned.
+    """
+    graph = GRAPH_CACHE.compiled(maze)
+    entrances, exits = maze.roles[Role.ENTRANCE], maze.roles[Role.EXIT]
+    if len(entrances) > 1 or len(exits) > 1:
+        path = multi_source_path(
+            graph,
+            [graph.node_id(index) for index in entrances],
+            [graph.node_id(index) for index in exits],
+        )
+        return None if path is None else graph.solution(maze, path)
+    source, target = graph.node_id(maze.entrance.index), graph.node_id(maze.exit.index)
+    has_rewards = bool(maze.roles[Role.REWARD])
+    path = shortest_path(
+        graph, source, target, None if has_rewards else manhattan(graph, target)
+    )
+    return None if path is None else graph.solution(maze, path)
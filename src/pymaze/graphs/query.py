@@ -0,0 +1,279 @@
+"""
+Contains a query object answering the cheapest distance and path between any two squares of a maze, including the
+squares of corridors which are not nodes of its graph
+"""
+import array
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from .cache import GRAPH_CACHE
+from .compiled import BOTTOM_MASK, NODE_MASK, RIGHT_MASK, role_weight
+from .hierarchy import ContractionHierarchy
+from .native import reconstruct
+
+# Node ids next to a square, mapped to the cost of moving from the square to them or from them to the square
+Attachments = Dict[int, float]
+
+
+class PathQuery:
+    """
+    Answers point to point queries between squares of a maze given by their indices, on top of the compiled graph of
+    the maze. A square that is not a node lies on the corridor of an edge, and is spliced into the search on the fly
+    through the nodes at both ends of the corridor. The search arrays are allocated once and only the entries touched
+    by a search are reset before the next one, so a query costs the part of the graph it explores rather than the
+    size of the graph. Hence a query object must not be shared between threads.
+    Args:
+        maze (AnyMaze): maze to answer queries about, whose compiled graph is taken from the shared cache
+        hierarchy (ContractionHierarchy): optional contraction hierarchy of the maze, which answers the single
+            queries with a bidirectional search up the hierarchy instead of a search of the whole graph
+    """
+
+    def __init__(
+        self, maze: AnyMaze, hierarchy: ContractionHierarchy | None = None
+    ) -> None:
+        self.graph = GRAPH_CACHE.compiled(maze)
+        self.hierarchy = hierarchy
+        self.width = maze.width
+        values = bytes(maze.values)
+        self._size = len(values)
+        self._nodes = values.translate(NODE_MASK)
+        self._right = values.translate(RIGHT_MASK)
+        self._bottom = values.translate(BOTTOM_MASK)
+        self._blocked = bytes(
+            value >> 4 in (Role.WALL, Role.EXTERIOR) for value in range(256)
+        )
+        self._values = values
+        self._role_weights = [role_weight(Role(role)) for role in range(len(Role))]
+        # the Manhattan distance never overestimates the remaining cost unless rewards make edges cheaper
+        self._admissible = not maze.roles[Role.REWARD]
+
+        size = len(self.graph)
+        self._distances = array.array("d", [math.inf]) * size
+        self._predecessors = array.array("i", [-1]) * size
+        self._settled = bytearray(size)
+        self._touched: List[int] = []
+
+    def distance(self, source: int, target: int) -> float:
+        """
+        Retrieves the cheapest cost of moving from one square to another
+        Args:
+            source (int): index of the square to start from
+            target (int): index of the square to reach
+        Returns:
+            float: sum of the weights of the edges taken, or infinity if the target can not be reached
+        """
+        return self._query(source, target)[0]
+
+    def path(self, source: int, target: int) -> List[int] | None:
+        """
+        Retrieves a cheapest path from one square to another. Like a solution, consecutive squares of the path line up
+        horizontally or vertically, and the squares of the corridors in between are skipped.
+        Args:
+            source (int): index of the square to start from
+            target (int): index of the square to reach
+        Returns:
+            List: square indices of the path, or None if the target can not be reached
+        """
+        return self._query(source, target)[1]
+
+    def query_many(self, pairs: Iterable[Tuple[int, int]]) -> List[float]:
+        """
+        Retrieves the cheapest cost of many pairs of squares. The pairs are grouped by source square, and a single
+        search from every source runs until all of its targets are settled.
+        Args:
+            pairs (Iterable): pairs of indices of the squares to start from and to reach
+        Returns:
+            List: cheapest cost of every pair, in the same order, or infinity if the target can not be reached
+        """
+        pairs = list(pairs)
+        results = [math.inf] * len(pairs)
+        by_source: Dict[int, List[int]] = defaultdict(list)
+        for position, (source, _) in enumerate(pairs):
+            by_source[source].append(position)
+
+        for source, positions in by_source.items():
+            starts = self.attachments(source, leaving=True)
+            ends = {
+                position: self.attachments(pairs[position][1]) for position in positions
+            }
+            goals = {node for attachments in ends.values() for node in attachments}
+            self._search(starts, dict.fromkeys(goals, 0.0), every=True)
+            for position in positions:
+                target = pairs[position][1]
+                if target == source:
+                    results[position] = 0.0
+                    continue
+                results[position] = min(
+                    [
+                        self._direct(source, target, starts, ends[position]),
+                        *(
+                            self._distances[node] + cost
+                            for node, cost in ends[position].items()
+                        ),
+                    ]
+                )
+        return results
+
+    def attachments(self, index: int, leaving: bool = False) -> Attachments:
+        """
+        Retrieves the nodes a square is attached to. A node is only attached to itself, while a square in a corridor
+        is attached to the nodes found by walking along the corridor until a border, like the edges of the graph.
+        Args:
+            index (int): index of the square
+            leaving (bool): whether the costs are for leaving the square towards the nodes, which adds the bonus or
+                penalty of their role, rather than for reaching the square from them
+        Returns:
+            Attachments: cost from the square to every attached node id, which is empty for walls and the exterior
+        Raises:
+            IndexError: if there is no square with the given index
+        """
+        if not 0 <= index < self._size:
+            raise IndexError("Square index out of range")
+        if self._blocked[self._values[index]]:
+            return {}
+        if self._nodes[index]:
+            return {self.graph.node_id(index): 0.0}
+
+        result: Attachments = {}
+        column = index % self.width
+        for step, borders, first, last in (
+            (-1, self._right, index - column, index),
+            (1, self._right, index, index - column + self.width - 1),
+            (-self.width, self._bottom, column, index),
+            (self.width, self._bottom, index, self._size - 1),
+        ):
+            square = index
+            while (
+                first <= square + step <= last
+                and not borders[min(square, square + step)]
+            ):
+                square += step
+                if self._nodes[square]:
+                    node = self.graph.node_id(square)
+                    result[node] = float(abs(square - index) // abs(step))
+                    if leaving:
+                        result[node] += self._role_weights[self.graph.roles[node]]
+                    break
+        return result
+
+    def _query(self, source: int, target: int) -> Tuple[float, List[int] | None]:
+        """Runs a single point to point search, retrieving the cost and the square indices of the path"""
+        starts = self.attachments(source, leaving=True)
+        ends = self.attachments(target)
+        if source == target:
+            return 0.0, [source]
+        if self.hierarchy is not None:
+            search = self.hierarchy.search(starts, ends)
+            cost, nodes = search.cost, search.path
+        else:
+            goal = self._search(starts, ends, every=False)
+            cost = math.inf if goal == -1 else self._distances[goal] + ends[goal]
+            nodes = None if goal == -1 else reconstruct(self._predecessors, goal)
+        direct = self._direct(source, target, starts, ends)
+        if nodes is None and direct == math.inf:
+            return math.inf, None
+        if nodes is None or direct <= cost:
+            return direct, [source, target]
+
+        squares = self.graph.squares
+        path = [squares[node] for node in nodes]
+        if path[0] != source:
+            path.insert(0, source)
+        if path[-1] != target:
+            path.append(target)
+        return cost, path
+
+    def _direct(
+        self, source: int, target: int, starts: Attachments, ends: Attachments
+    ) -> float:
+        """
+        Retrieves the cost of moving straight between two squares of the same corridor without going through a node,
+        or infinity if they are not in the same corridor, i.e. if they are not attached to the same nodes
+        """
+        if self._nodes[source] or self._nodes[target]:
+            return math.inf
+        if not ends or starts.keys() != ends.keys():
+            return math.inf
+        row, column = divmod(source, self.width)
+        other_row, other_column = divmod(target, self.width)
+        if row == other_row:
+            return float(abs(column - other_column))
+        if column == other_column:
+            return float(abs(row - other_row))
+        return math.inf
+
+    def _search(self, starts: Attachments, goals: Attachments, every: bool) -> int:
+        """
+        Runs Dijkstra's algorithm from several node ids with a starting cost each, or A* when the Manhattan distance
+        is admissible, until the cheapest goal including its extra cost is known or, if every is set, until all the
+        goals are settled
+        Args:
+            starts (Attachments): starting cost of the node ids to start from
+            goals (Attachments): extra cost of the node ids to reach
+            every (bool): whether to settle all the goals rather than stop at the cheapest one
+        Returns:
+            int: cheapest goal node id found, or -1 if no goal can be reached
+        """
+        distances = self._distances
+        predecessors = self._predecessors
+        settled = self._settled
+        for node in self._touched:
+            distances[node] = math.inf
+            predecessors[node] = -1
+            settled[node] = 0
+        self._touched = touched = list(starts)
+
+        width, squares = self.width, self.graph.squares
+        offsets, targets, weights = (
+            self.graph.offsets,
+            self.graph.targets,
+            self.graph.weights,
+        )
+        goal_positions: List[Tuple[Tuple[int, int], float]] = [
+            (divmod(squares[node], width), extra) for node, extra in goals.items()
+        ]
+
+        def estimate(node: int) -> float:
+            square: int = squares[node]
+            row, column = divmod(square, width)
+            return min(
+                abs(row - goal_row) + abs(column - goal_column) + extra
+                for (goal_row, goal_column), extra in goal_positions
+            )
+
+        heuristic = self._admissible and not every and bool(goals)
+        queue = []
+        for node, cost in starts.items():
+            distances[node] = cost
+            queue.append((cost + estimate(node) if heuristic else cost, node))
+        heapq.heapify(queue)
+        remaining = set(goals)
+        best, best_goal = math.inf, -1
+
+        while queue and (remaining if every else queue[0][0] < best):
+            _, node = heapq.heappop(queue)
+            if settled[node]:
+                continue
+            settled[node] = 1
+            distance = distances[node]
+            if node in goals:
+                remaining.discard(node)
+                if distance + goals[node] < best:
+                    best, best_goal = distance + goals[node], node
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                candidate = distance + weights[edge]
+                if candidate < distances[neighbor]:
+                    if distances[neighbor] == math.inf:
+                        touched.append(neighbor)
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    priority = (
+                        candidate + estimate(neighbor) if heuristic else candidate
+                    )
+                    heapq.heappush(queue, (priority, neighbor))
+        return best_goal
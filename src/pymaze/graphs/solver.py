@@ -1,46 +1,125 @@
 """
-Contains functions to wrap networkX algorithms to solve a maze
+Contains functions to wrap networkX algorithms to solve a maze, as well as the native engine
 """
-from typing import List
-import networkx as nx
+import itertools
+import time
+from typing import Iterator, List
 
-from ..models.maze import Maze
+from ..models.maze import AnyMaze
+from ..models.role import Role
 from ..models.solution import Solution
-from .converter import make_graph
+from ..profiling import stage
+from .cache import GRAPH_CACHE
+from .dag import stream_solutions
+from .edge import Edge
+from . import Backend, native
 
 
-def solve(maze: Maze) -> Solution | None:
+def solve(maze: AnyMaze, backend: Backend = "networkx") -> Solution | None:
     """
-    Solves a maze and produces a solution to the given maze. If no solution can be found None is returned.
+    Solves a maze and produces a solution to the given maze. If no solution can be found None is returned. Mazes with
+    several entrances or exits are always solved with the native engine, which searches from all of them at once.
+    Args:
+        maze (AnyMaze): maze to solve
+        backend (Backend): engine to solve the maze with, either NetworkX or the native integer indexed engine
     """
-    try:
-        return Solution(
-            squares=tuple(
-                nx.shortest_path(
-                    G=make_graph(maze=maze),
-                    source=maze.entrance,
-                    target=maze.exit,
-                    weight="weight",
+    with stage("solve"):
+        if backend == "native" or has_several_doors(maze):
+            return native.solve(maze)
+        import networkx as nx  # pylint: disable=import-outside-toplevel
+
+        try:
+            return Solution(
+                squares=tuple(
+                    nx.shortest_path(
+                        G=GRAPH_CACHE.networkx(maze),
+                        source=maze.entrance,
+                        target=maze.exit,
+                        weight="weight",
+                    )
                 )
             )
-        )
-    except nx.NetworkXException:
-        return None
+        except nx.NetworkXException:
+            return None
 
 
-def solve_all(maze: Maze) -> List[Solution]:
+def solve_all(maze: AnyMaze, backend: Backend = "networkx") -> List[Solution]:
+    """
+    Returns all the possible solutions of the given maze. Like solve(), mazes with several entrances or exits are
+    always solved with the native engine.
+    Args:
+        maze (AnyMaze): maze to solve
+        backend (Backend): engine to solve the maze with, either NetworkX or the native integer indexed engine
     """
-    Returns all the possible solutions of the given maze
+    return list(iter_solutions(maze, backend=backend))
+
+
+def iter_solutions(
+    maze: AnyMaze,
+    limit: int | None = None,
+    timeout: float | None = None,
+    backend: Backend = "networkx",
+) -> Iterator[Solution]:
+    """
+    Lazily yields the possible solutions of the given maze as the underlying search produces them, so that only one
+    solution is kept in memory at a time. Stops early once the limit of solutions is reached or the timeout elapses.
+    Mazes with several entrances or exits are always solved with the native engine, from all of them at once.
+    Args:
+        maze (AnyMaze): maze to solve
+        limit (int): optional maximum number of solutions to yield
+        timeout (float): optional number of seconds after which no more solutions are yielded. The timeout is checked
+            before yielding each solution, so the search for a single solution is never interrupted.
+        backend (Backend): engine to solve the maze with, either NetworkX or the native integer indexed engine
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    if backend == "native" or has_several_doors(maze):
+        solutions = stream_solutions(maze)
+    else:
+        solutions = networkx_solutions(maze)
+    solutions = itertools.islice(solutions, limit)
+    while True:
+        # only the search for the next solution is measured, not what the caller does with it in between
+        with stage("solve"):
+            solution = next(solutions, None)
+        if solution is None or deadline is not None and time.monotonic() >= deadline:
+            return
+        yield solution
+
+
+def networkx_solutions(maze: AnyMaze) -> Iterator[Solution]:
     """
+    Lazily yields the possible solutions of the given maze found by NetworkX
+    Raises:
+        ValueError: if the maze has several entrances or exits, which only the native engine searches at once
+    """
+    if has_several_doors(maze):
+        raise ValueError(
+            "NetworkX can only solve mazes with a single entrance and exit"
+        )
+    import networkx as nx  # pylint: disable=import-outside-toplevel
+
     try:
-        return [
-            Solution(squares=tuple(path))
-            for path in nx.all_shortest_paths(
-                G=make_graph(maze),
-                source=maze.entrance,
-                target=maze.exit,
-                weight="weight",
-            )
-        ]
+        for path in nx.all_shortest_paths(
+            G=GRAPH_CACHE.networkx(maze),
+            source=maze.entrance,
+            target=maze.exit,
+            weight="weight",
+        ):
+            yield Solution(squares=tuple(path))
     except nx.NetworkXException:
-        return []
+        return
+
+
+def has_several_doors(maze: AnyMaze) -> bool:
+    """Tells whether a maze, which must then be relaxed, has several entrances or exits"""
+    return len(maze.roles[Role.ENTRANCE]) > 1 or len(maze.roles[Role.EXIT]) > 1
+
+
+def solution_cost(solution: Solution) -> float:
+    """
+    Retrieves the total cost of a solution, which is the sum of the weights of the edges between its squares
+    """
+    return sum(
+        Edge(current, following).weight()
+        for current, following in itertools.pairwise(solution)
+    )
@@ -0,0 +1,251 @@
+"""
+Contains a solver of reward tours, which go from the entrance to the exit of a maze through every one of its rewards.
+The cheapest cost between the entrance, the rewards and the exit is computed once per maze and cached, then the order
+of the rewards is chosen exactly with Held-Karp dynamic programming when they are few, or with 2-opt otherwise.
+"""
+import array
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Sequence, Tuple, TypeAlias
+
+from ..models.maze import AnyMaze
+from ..models.role import Role
+from ..models.solution import Solution
+from ..models.square import Square
+from .cache import GRAPH_CACHE
+from .compiled import CompiledGraph
+from .native import multi_target_distances, shortest_path
+
+# Ways of ordering the rewards of a tour
+TourMethod: TypeAlias = Literal["held-karp", "2-opt"]
+
+# Largest number of rewards ordered with Held-Karp by default, whose time grows as 2^n * n^2 and memory as 2^n * n
+HELD_KARP_LIMIT: int = 12
+
+# Smallest improvement of the cost of a tour taken by 2-opt, which keeps rounding errors from looping forever
+EPSILON: float = 1e-9
+
+
+@dataclass(frozen=True)
+class TourDistances:
+    """
+    Cheapest costs between the terminals of a maze, which are its entrance, its rewards and its exit in that order
+    Args:
+        terminals (tuple): node id of every terminal in the compiled graph of the maze
+        costs (tuple): row of the cheapest costs from every terminal to all the terminals, infinite if unreachable
+    """
+
+    terminals: Tuple[int, ...]
+    costs: Tuple[array.array, ...]
+
+    def __len__(self) -> int:
+        """Retrieves the number of terminals"""
+        return len(self.terminals)
+
+    @property
+    def nbytes(self) -> int:
+        """Retrieves the memory footprint of the cost matrix in bytes"""
+        return sum(len(row) * row.itemsize for row in self.costs)
+
+    @classmethod
+    def from_maze(cls, maze: AnyMaze) -> "TourDistances":
+        """Runs one multi-target search from every terminal of a maze to fill in the cost matrix"""
+        graph = GRAPH_CACHE.compiled(maze)
+        squares = [maze.entrance.index, *maze.roles[Role.REWARD], maze.exit.index]
+        terminals = tuple(graph.node_id(index) for index in squares)
+        costs = tuple(
+            array.array("d", multi_target_distances(graph, terminal, terminals))
+            for terminal in terminals
+        )
+        return cls(terminals, costs)
+
+    def cost(self, order: Sequence[int]) -> float:
+        """Retrieves the cost of visiting the terminals in the given order"""
+        return float(
+            sum(self.costs[first][second] for first, second in zip(order, order[1:]))
+        )
+
+
+@dataclass(frozen=True)
+class Tour:
+    """
+    Solution of a maze going through all of its rewards
+    Args:
+        solution (Solution): squares from the entrance to the exit
+        rewards (tuple): reward squares in the order they are collected
+        cost (float): sum of the weights of the edges taken
+        method (TourMethod): way the rewards were ordered
+        seconds (dict): time taken computing the "distances", the "ordering" and the "paths"
+    """
+
+    solution: Solution
+    rewards: Tuple[Square, ...]
+    cost: float
+    method: TourMethod
+    seconds: Dict[str, float]
+
+
+def tour_distances(maze: AnyMaze) -> TourDistances:
+    """Retrieves the cost matrix of the terminals of a maze, computing it on a miss of the shared cache"""
+    return GRAPH_CACHE.get(
+        "tour", maze, TourDistances.from_maze, lambda distances: distances.nbytes
+    )
+
+
+def held_karp(costs: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Finds the cheapest order of the terminals from the first one to the last one going through all the others, by
+    computing the cheapest way of visiting every subset of the rewards and ending at every one of them
+    Args:
+        costs (Sequence): cost matrix of the terminals, with the entrance first and the exit last
+    Returns:
+        List: order of the terminals, starting with 0 and ending with the last one
+    """
+    count = len(costs) - 2
+    exit_id = count + 1
+    if count == 0:
+        return [0, exit_id]
+
+    full = (1 << count) - 1
+    best = [[math.inf] * count for _ in range(full + 1)]
+    parent = [[-1] * count for _ in range(full + 1)]
+    for last in range(count):
+        best[1 << last][last] = costs[0][last + 1]
+    for subset in range(1, full + 1):
+        row = best[subset]
+        for last in range(count):
+            cost = row[last]
+            if cost == math.inf or not subset >> last & 1:
+                continue
+            leaving = costs[last + 1]
+            for following in range(count):
+                if subset >> following & 1:
+                    continue
+                extended = subset | 1 << following
+                candidate = cost + leaving[following + 1]
+                if candidate < best[extended][following]:
+                    best[extended][following] = candidate
+                    parent[extended][following] = last
+
+    last = min(range(count), key=lambda end: best[full][end] + costs[end + 1][exit_id])
+    order = [exit_id]
+    subset = full
+    while last != -1:
+        order.append(last + 1)
+        subset, last = subset & ~(1 << last), parent[subset][last]
+    order.append(0)
+    order.reverse()
+    return order
+
+
+def nearest_neighbor(costs: Sequence[Sequence[float]]) -> List[int]:
+    """Orders the terminals by always moving on to the cheapest reward left, from the entrance to the exit"""
+    exit_id = len(costs) - 1
+    left = set(range(1, exit_id))
+    order = [0]
+    while left:
+        leaving = costs[order[-1]]
+        following = min(left, key=leaving.__getitem__)
+        left.remove(following)
+        order.append(following)
+    order.append(exit_id)
+    return order
+
+
+def two_opt(costs: Sequence[Sequence[float]], order: List[int]) -> List[int]:
+    """
+    Improves an order of the terminals by reversing the stretches of rewards that make it cheaper, until none does.
+    Moving between two terminals costs their distance plus the bonus of the reward entered, so the costs differ by
+    direction. Only stretches made purely of rewards are reversed, between an entrance and an exit that stay in place,
+    so every reward of a stretch is still entered once and their bonuses add up to the same amount in both directions.
+    For such reversals alone, comparing the symmetric average of the costs is exact; it is not for arbitrary
+    asymmetric costs.
+    Args:
+        costs (Sequence): cost matrix of the terminals, with the entrance first and the exit last
+        order (List): starting order, from the entrance to the exit
+    Returns:
+        List: improved order, where no reversal of a stretch of rewards lowers the cost
+    """
+    symmetric = [
+        [
+            (costs[first][second] + costs[second][first]) / 2
+            for second in range(len(costs))
+        ]
+        for first in range(len(costs))
+    ]
+    order = list(order)
+    improved = True
+    while improved:
+        improved = False
+        for start in range(1, len(order) - 2):
+            before, first = order[start - 1], order[start]
+            for end in range(start + 1, len(order) - 1):
+                last, after = order[end], order[end + 1]
+                delta = (
+                    symmetric[before][last]
+                    + symmetric[first][after]
+                    - symmetric[before][first]
+                    - symmetric[last][after]
+                )
+                if delta < -EPSILON:
+                    order[start : end + 1] = order[start : end + 1][::-1]
+                    first = order[start]
+                    improved = True
+    return order
+
+
+def join_legs(graph: CompiledGraph, terminals: Sequence[int]) -> List[int] | None:
+    """Joins the cheapest paths between consecutive terminals, keeping a single copy of the terminals they share"""
+    path = [terminals[0]]
+    for source, target in zip(terminals, terminals[1:]):
+        leg = shortest_path(graph, source, target)
+        if leg is None:
+            return None
+        path.extend(leg[1:])
+    return path
+
+
+def solve_tour(maze: AnyMaze, method: TourMethod | None = None) -> Tour | None:
+    """
+    Finds a tour of a maze from its entrance to its exit collecting all of its rewards. The order of the rewards is
+    optimal with Held-Karp, and a local optimum with 2-opt.
+    Args:
+        maze (AnyMaze): maze to solve
+        method (TourMethod): way of ordering the rewards, by default Held-Karp up to HELD_KARP_LIMIT rewards
+    Returns:
+        Tour: the tour and the time it took, or None if a reward or the exit can not be reached from the entrance
+    """
+    seconds: Dict[str, float] = {}
+    start = time.perf_counter()
+    distances = tour_distances(maze)
+    seconds["distances"] = time.perf_counter() - start
+    if any(math.isinf(cost) for cost in distances.costs[0]):
+        return None
+
+    start = time.perf_counter()
+    if method is None:
+        method = "held-karp" if len(distances) - 2 <= HELD_KARP_LIMIT else "2-opt"
+    if method == "held-karp":
+        order = held_karp(distances.costs)
+    else:
+        order = two_opt(distances.costs, nearest_neighbor(distances.costs))
+    seconds["ordering"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph = GRAPH_CACHE.compiled(maze)
+    path = join_legs(graph, [distances.terminals[terminal] for terminal in order])
+    seconds["paths"] = time.perf_counter() - start
+    if path is None:
+        return None
+
+    return Tour(
+        solution=graph.solution(maze, path),
+        rewards=tuple(
+            maze[graph.squares[distances.terminals[terminal]]]
+            for terminal in order[1:-1]
+        ),
+        cost=distances.cost(order),
+        method=method,
+        seconds=seconds,
+    )
@@ -1,7 +1,8 @@
 from .border import Border
+from .compact import CompactMaze
 from .maze import Maze
 from .role import Role
 from .solution import Solution
 from .square import Square
 
-__all__ = ["Border", "Maze", "Role", "Solution", "Square"]
+__all__ = ["Border", "CompactMaze", "Maze", "Role", "Solution", "Square"]
@@ -0,0 +1,253 @@
+"""
+Contains a compact maze model backed by a flat grid of packed square values
+"""
+import array
+from dataclasses import dataclass, InitVar
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, TypeAlias
+
+from .square import Square
+from .role import Role
+from ..profiling import stage
+from ..persistence.serializer import (
+    compress,
+    decompress,
+    dump_values,
+    fingerprint,
+    map_file,
+    read_file,
+)
+
+# Maps every possible packed square value onto the value of its role, allowing the roles of a whole grid to be extracted
+# with a single call to bytes.translate()
+ROLES: bytes = bytes(value >> 4 for value in range(256))
+
+# Square indices of every role other than Role.NONE, in increasing order
+RoleIndex: TypeAlias = Dict[Role, array.array]
+
+
+class RoleLookup:
+    """
+    Mixin retrieving the squares of a given role of a maze, e.g. its entrance, from the index of the squares of every
+    role instead of scanning the maze. It is shared by both maze models, which provide the index and the squares.
+    """
+
+    @property
+    def roles(self) -> RoleIndex:
+        """Index of the squares of every role, provided by the maze model"""
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> Square:
+        """Square with the given index, provided by the maze model"""
+        raise NotImplementedError
+
+    @cached_property
+    def entrance(self) -> Square:
+        """
+        Cached property that returns the entrance of the maze
+        Raises:
+            ValueError: if the maze has no entrance, which only happens when it was not validated
+        """
+        squares = self.roles[Role.ENTRANCE]
+        if not squares:
+            raise ValueError("Maze has no entrance")
+        return self[squares[0]]
+
+    @cached_property
+    def exit(self) -> Square:
+        """
+        Cached property that returns the exit of the maze
+        Raises:
+            ValueError: if the maze has no exit, which only happens when it was not validated
+        """
+        squares = self.roles[Role.EXIT]
+        if not squares:
+            raise ValueError("Maze has no exit")
+        return self[squares[0]]
+
+    def squares_with_role(self, role: Role) -> List[Square]:
+        """Retrieves the squares of the given role, e.g. all the rewards, without scanning the maze"""
+        return [self[index] for index in self.roles[role]]
+
+
+@dataclass(frozen=True, eq=False)
+class CompactMaze(RoleLookup):
+    """
+    Represents a maze as a single flat grid of packed square values, using the same bit field layout as the file body.
+    This keeps one byte per square in memory instead of one Square object per square. Square objects are only built
+    when they are requested through iteration or subscription. Compact mazes are compared and hashed by the fingerprint
+    of their content, which is only computed once.
+    Args:
+        width (int): number of columns in the maze
+        height (int): number of rows in the maze
+        values (Sequence): row-major packed border and role values, one byte per square
+        validate (bool): whether to validate the roles of all squares on initialization, defaults to True
+        relaxed (bool): whether to accept several entrances and exits instead of exactly one of each, defaults to
+            False. The entrance and exit properties then retrieve the first ones.
+    """
+
+    width: int
+    height: int
+    values: Sequence[int]
+    validate: InitVar[bool] = True
+    relaxed: InitVar[bool] = False
+
+    def __post_init__(self, validate: bool, relaxed: bool) -> None:
+        """Validates the maze on initialization"""
+        with stage("validate"):
+            validate_size(self)
+            if validate:
+                validate_roles(self, relaxed)
+
+    def __len__(self) -> int:
+        """Retrieves the number of squares in the maze"""
+        return self.width * self.height
+
+    def __iter__(self) -> Iterator[Square]:
+        """
+        Makes the class iterable and returns an iterator of squares, which are created on the fly
+        Return:
+            Iterator: iterator of squares
+        """
+        return map(self.__getitem__, range(len(self)))
+
+    def __getitem__(self, index: int) -> Square:
+        """
+        Makes the maze subscriptable, building the square with the given index from its packed value
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("Square index out of range")
+        row, column = divmod(index, self.width)
+        border, role = decompress(self.values[index])
+        return Square(index, row, column, border, role)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the fingerprints of two compact mazes"""
+        if not isinstance(other, CompactMaze):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        """Hashes the fingerprint of the maze instead of all of its values"""
+        return hash(self.fingerprint)
+
+    @cached_property
+    def fingerprint(self) -> bytes:
+        """
+        Cached property with a digest of the dimensions and the packed square values of the maze, i.e. of the same
+        bytes that get written to a file
+        """
+        return fingerprint(self.width, self.height, self.values)
+
+    @cached_property
+    def role_values(self) -> bytes:
+        """
+        Cached property with the role value of every square in the maze, one byte per square
+        """
+        return bytes(self.values).translate(ROLES)
+
+    @cached_property
+    def roles(self) -> RoleIndex:
+        """
+        Cached property with the index of the squares of every role, built with one fast scan of the role values per
+        role
+        """
+        return role_index(self.role_values)
+
+    @classmethod
+    def from_squares(cls, squares: Iterable[Square]) -> "CompactMaze":
+        """Factory function to create a compact maze from a row-major sequence of squares"""
+        values = array.array("B")
+        width = height = 0
+        for square in squares:
+            values.append(compress(square))
+            width = max(width, square.column + 1)
+            height = max(height, square.row + 1)
+        return cls(width=width, height=height, values=values)
+
+    @classmethod
+    def load(cls, path: Path, relaxed: bool = False) -> "CompactMaze":
+        """
+        Factory function to create a compact maze from a path to a file without decompressing its squares, accepting
+        several entrances and exits in relaxed mode
+        """
+        with stage("load"):
+            header, body = read_file(path)
+            return cls(header.width, header.height, body.square_values, relaxed=relaxed)
+
+    @classmethod
+    def open_mmap(cls, path: Path) -> "CompactMaze":
+        """
+        Factory function to create a compact maze backed by a read only memory map of a file on the given path.
+        Only the file header is validated up front, so opening even a very large maze takes constant time and only
+        touches the pages of the file that are accessed afterwards. Looking up the entrance or the exit scans the body.
+        """
+        header, body = map_file(path)
+        return cls(header.width, header.height, body, validate=False)
+
+    def dump(self, path: Path) -> None:
+        """Dumps the maze onto the provided path"""
+        dump_values(self.width, self.height, array.array("B", bytes(self.values)), path)
+
+
+def role_index(role_values: bytes) -> RoleIndex:
+    """
+    Indexes the squares of every role other than Role.NONE, which would take most of the maze. Squares are found with
+    bytes.find(), which only takes one step of the loop per square having the role.
+    Args:
+        role_values (bytes): role value of every square in the maze
+    Returns:
+        RoleIndex: square indices of every role, which are empty for roles without squares
+    """
+    index: RoleIndex = {}
+    for role in Role:
+        if role is Role.NONE:
+            continue
+        squares = index[role] = array.array("i")
+        position = role_values.find(role)
+        while position != -1:
+            squares.append(position)
+            position = role_values.find(role, position + 1)
+    return index
+
+
+def validate_size(maze: CompactMaze) -> None:
+    """
+    Validates that the maze has exactly one packed value for every square in the grid
+    Args:
+        maze (CompactMaze): Maze to validate
+    """
+    assert len(maze.values) == maze.width * maze.height, "Wrong number of squares"
+
+
+def validate_roles(maze: CompactMaze, relaxed: bool = False) -> None:
+    """
+    Validates the roles of the squares in the maze, which must be known and include the entrances and the exits
+    Args:
+        maze (CompactMaze): Maze to validate
+        relaxed (bool): whether to accept several entrances and exits instead of exactly one of each
+    """
+    assert max(maze.role_values, default=0) <= max(Role), "Unknown square role"
+    validate_doors(
+        maze.role_values.count(Role.ENTRANCE),
+        maze.role_values.count(Role.EXIT),
+        relaxed,
+    )
+
+
+def validate_doors(entrances: int, exits: int, relaxed: bool = False) -> None:
+    """
+    Validates the number of entrances and exits of a maze, which must be exactly one of each, or at least one of each
+    in relaxed mode
+    Args:
+        entrances (int): number of entrances in the maze
+        exits (int): number of exits in the maze
+        relaxed (bool): whether to accept several entrances and exits
+    """
+    if relaxed:
+        assert entrances >= 1, "Must have at least 1 entrance"
+        assert exits >= 1, "Must have at least 1 exit"
+    else:
+        assert 1 == entrances, "Must have exactly 1 entrance"
+        assert 1 == exits, "Must have exactly 1 exit"
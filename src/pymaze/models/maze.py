@@ -1,30 +1,52 @@
 """
 Contains the maze model
 """
-from typing import Tuple, Iterator
-from dataclasses import dataclass
+import array
+from typing import List, Sequence, Tuple, Iterator, TypeAlias
+from dataclasses import dataclass, InitVar
 from functools import cached_property
 from pathlib import Path
 
 from .square import Square
 from .role import Role
-from ..persistence.serializer import dump_squares, load_squares
-
-
-@dataclass(frozen=True)
-class Maze:
+from .compact import (
+    ROLES,
+    CompactMaze,
+    RoleIndex,
+    RoleLookup,
+    role_index,
+    validate_doors,
+)
+from ..profiling import stage
+from ..persistence.serializer import (
+    compress,
+    decode_rows,
+    dump_squares,
+    fingerprint,
+    read_file,
+)
+
+
+@dataclass(frozen=True, eq=False)
+class Maze(RoleLookup):
     """
-    Represents the maze
+    Represents the maze. Mazes are compared and hashed by the fingerprint of their content, which is only computed once.
+    Args:
+        squares (Tuple): row-major squares of the maze
+        validate (bool): whether to validate all squares on initialization, defaults to True
+        relaxed (bool): whether to accept several entrances and exits instead of exactly one of each, defaults to
+            False. The entrance and exit properties then retrieve the first ones.
     """
 
     squares: Tuple[Square, ...]
+    validate: InitVar[bool] = True
+    relaxed: InitVar[bool] = False
 
-    def __post_init__(self) -> None:
+    def __post_init__(self, validate: bool, relaxed: bool) -> None:
         """Validates the maze on initialization"""
-        validate_indices(self)
-        validate_rows_columns(self)
-        validate_entrance(self)
-        validate_exit(self)
+        if validate:
+            with stage("validate"):
+                validate_squares(self, relaxed)
 
     def __iter__(self) -> Iterator[Square]:
         """
@@ -40,6 +62,16 @@ class Maze:
         """
         return self.squares[index]
 
+    def __eq__(self, other: object) -> bool:
+        """Compares the fingerprints of two mazes"""
+        if not isinstance(other, Maze):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        """Hashes the fingerprint of the maze instead of all of its squares"""
+        return hash(self.fingerprint)
+
     @cached_property
     def width(self) -> int:
         """
@@ -59,62 +91,129 @@ class Maze:
         return max(square.row for square in self) + 1
 
     @cached_property
-    def entrance(self) -> Square:
+    def values(self) -> array.array:
         """
-        Cached property that returns the entrance of the maze
+        Cached property with the packed border and role value of every square, one byte per square in the same layout
+        as the file body
         """
-        return next(square for square in self if square.role is Role.ENTRANCE)
+        return array.array("B", map(compress, self.squares))
 
     @cached_property
-    def exit(self) -> Square:
+    def fingerprint(self) -> bytes:
+        """
+        Cached property with a digest of the dimensions and the packed square values of the maze, i.e. of the same
+        bytes that get written to a file
+        """
+        return fingerprint(self.width, self.height, self.values)
+
+    @cached_property
+    def roles(self) -> RoleIndex:
+        """
+        Cached property with the index of the squares of every role, which is built while validating the maze or
+        from its packed square values
+        """
+        return role_index(self.values.tobytes().translate(ROLES))
+
+    @classmethod
+    def from_buffer(
+        cls,
+        width: int,
+        height: int,
+        data: Sequence[int],
+        trusted: bool = True,
+        relaxed: bool = False,
+    ) -> "Maze":
+        """
+        Factory function to create a maze from row-major packed square values, such as the body of a file. The index,
+        row and column of every square are derived from its position while decoding, so the squares are never checked
+        one by one. Only the number of values is checked for trusted data, and the roles are checked with a few bulk
+        operations on the values otherwise.
+        Args:
+            width (int): number of columns in the maze
+            height (int): number of rows in the maze
+            data (Sequence): packed border and role values, one byte per square
+            trusted (bool): whether the data comes from a source already validated, such as a file written by this
+                library, defaults to True
+            relaxed (bool): whether to accept several entrances and exits, defaults to False
+        """
+        values = array.array("B", data)
+        CompactMaze(width, height, values, validate=not trusted, relaxed=relaxed)
+        maze = cls(
+            squares=tuple(decode_rows(values, width, height)),
+            validate=False,
+        )
+        # object.__setattr__() gets past the frozen dataclass like its own __init__() does, caching the properties
+        for name, value in (("width", width), ("height", height), ("values", values)):
+            object.__setattr__(maze, name, value)
+        return maze
+
+    @classmethod
+    def load(cls, path: Path, relaxed: bool = False) -> "Maze":
         """
-        Cached property that returns the exit of the maze
+        Factory function to create a maze from a path to a file. The header is validated while reading the file, while
+        the body gets the bulk validation of untrusted data of from_buffer(), which accepts several entrances and exits
+        in relaxed mode.
         """
-        return next(square for square in self if square.role is Role.EXIT)
+        with stage("load"):
+            header, body = read_file(path)
+            return cls.from_buffer(
+                header.width,
+                header.height,
+                body.square_values,
+                trusted=False,
+                relaxed=relaxed,
+            )
 
     @classmethod
-    def load(cls, path: Path) -> "Maze":
-        """Factory function to create a maze from a path to a file"""
-        return cls(squares=tuple(load_squares(path)))
+    def open_mmap(cls, path: Path) -> CompactMaze:
+        """
+        Factory function to open a maze file on the given path as a memory mapped compact maze, which shares the
+        operating system page cache across processes and only reads the pages of the file that are accessed
+        """
+        return CompactMaze.open_mmap(path)
 
     def dump(self, path: Path) -> None:
         """Dumps the maze onto the provided path"""
         dump_squares(self.width, self.height, self.squares, path)
 
+    def compact(self) -> CompactMaze:
+        """
+        Packs the squares of the maze into a compact maze with one byte per square. The roles were validated along
+        with the squares, in strict or relaxed mode, so they are not checked again.
+        """
+        return CompactMaze(self.width, self.height, self.values, validate=False)
 
-def validate_indices(maze: Maze) -> None:
-    """
-    Validates the indices of the squares in the maze
-    Args:
-        maze (Maze): Maze to validate
-    """
-    assert [square.index for square in maze] == list(
-        range(len(maze.squares))
-    ), "Wrong square.index"
 
+AnyMaze: TypeAlias = Maze | CompactMaze
 
-def validate_rows_columns(maze: Maze) -> None:
+
+def validate_squares(maze: Maze, relaxed: bool = False) -> None:
     """
-    Validates the rows and columns of the squares in the maze
+    Validates the indices, rows, columns and roles of all squares in the maze in a single pass. The width of the maze
+    is the length of the first row. The dimensions and the role index built on the way are cached on the maze, as
+    they would take a pass each.
     Args:
         maze (Maze): Maze to validate
+        relaxed (bool): whether to accept several entrances and exits instead of exactly one of each
     """
-    for h in range(maze.height):
-        for w in range(maze.width):
-            square = maze[h * maze.width + w]
-            assert square.row == h, "Wrong square.row"
-            assert square.column == w, "Wrong square.column"
-
-
-def validate_entrance(maze: Maze) -> None:
-    """Validates that a maze has an entrance"""
-    assert 1 == sum(
-        1 for square in maze if square.role is Role.ENTRANCE
-    ), "Must have exactly 1 entrance"
-
-
-def validate_exit(maze: Maze) -> None:
-    """Validates that a maze has exactly one exit"""
-    assert 1 == sum(
-        1 for square in maze if square.role is Role.EXIT
-    ), "Must have exactly 1 exit"
+    squares = maze.squares
+    width = next(
+        (index for index, square in enumerate(squares) if square.row), len(squares)
+    )
+    roles: RoleIndex = {
+        role: array.array("i") for role in Role if role is not Role.NONE
+    }
+    row = column = 0
+    for index, square in enumerate(squares):
+        assert square.index == index, "Wrong square.index"
+        assert square.row == row, "Wrong square.row"
+        assert square.column == column, "Wrong square.column"
+        if square.role is not Role.NONE:
+            roles[square.role].append(index)
+        column += 1
+        if column == width:
+            row, column = row + 1, 0
+    assert column == 0, "Wrong number of squares"
+    validate_doors(len(roles[Role.ENTRANCE]), len(roles[Role.EXIT]), relaxed)
+    for name, value in (("width", width), ("height", row), ("roles", roles)):
+        object.__setattr__(maze, name, value)
@@ -7,7 +7,7 @@ from .border import Border
 from .role import Role
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Square:
     """
     Represents a square in the maze
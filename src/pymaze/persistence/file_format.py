@@ -7,6 +7,8 @@ import struct
 import array
 
 MAGIC_NUMBER: bytes = b"MAZE"
+# Number of bytes taken by the magic number, the format version and the width and height of the maze
+HEADER_SIZE: int = len(MAGIC_NUMBER) + struct.calcsize("<B2I")
 
 
 @dataclass(frozen=True)
@@ -42,6 +44,17 @@ class FileHeader:
         width, height = struct.unpack("<2I", file.read(2 * 4))
         return cls(format_version=format_version, width=width, height=height)
 
+    @classmethod
+    def unpack(cls, buffer: memoryview) -> "FileHeader":
+        """
+        Unpacks a file header from the start of a buffer, such as a memory mapped file, without copying the buffer
+        """
+        assert buffer[: len(MAGIC_NUMBER)] == MAGIC_NUMBER, "Unknown file type"
+        format_version, width, height = struct.unpack_from(
+            "<B2I", buffer, len(MAGIC_NUMBER)
+        )
+        return cls(format_version=format_version, width=width, height=height)
+
 
 @dataclass(frozen=True)
 class FileBody:
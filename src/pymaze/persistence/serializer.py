@@ -2,16 +2,25 @@
 Contains loading and saving routines
 """
 import array
-from typing import Tuple, List, Iterator
+import hashlib
+import mmap
+import struct
+from typing import Tuple, List, Iterator, Sequence
 import pathlib
 
 from ..models.square import Square
 from ..models.border import Border
 from ..models.role import Role
-from ..persistence.file_format import FileBody, FileHeader
+from ..persistence.file_format import FileBody, FileHeader, HEADER_SIZE
 
 FORMAT_VERSION: int = 1
 
+# Border and Role pairs for every square value with a known role, indexed by the compressed square value. Any value
+# from the end of the table up to 255 has an unknown role.
+DECODING_TABLE: Tuple[Tuple[Border, Role], ...] = tuple(
+    (Border(value & 0xF), Role(value >> 4)) for value in range((max(Role) + 1) << 4)
+)
+
 
 def dump_squares(
     width: int, height: int, squares: Tuple[Square, ...], path: pathlib.Path
@@ -20,6 +29,20 @@ def dump_squares(
     Serializes and dumps the maze into a given file on the path specified
     """
     header, body = serializer(width, height, squares)
+    write_file(header, body, path)
+
+
+def dump_values(
+    width: int, height: int, square_values: array.array, path: pathlib.Path
+) -> None:
+    """
+    Dumps already compressed square values into a given file on the path specified, skipping the compression step
+    """
+    write_file(FileHeader(FORMAT_VERSION, width, height), FileBody(square_values), path)
+
+
+def write_file(header: FileHeader, body: FileBody, path: pathlib.Path) -> None:
+    """Writes a file header and body into a given file on the path specified"""
     # writes the file in binary mode ensuring that Python writes the file as is without implicit conversions
     with path.open(mode="wb") as file:
         header.write(file)
@@ -40,31 +63,110 @@ def serializer(
 def load_squares(path: pathlib.Path) -> Iterator[Square]:
     """Loads a file on the provided path with the mode set to read in binary mode & creates the header and body of the
     file before deserializes it with the deserializer utility function"""
+    return deserialize(*read_file(path))
+
+
+def read_file(path: pathlib.Path) -> Tuple[FileHeader, FileBody]:
+    """Reads the header and the still compressed body of a file on the provided path"""
     with path.open("rb") as file:
         header = FileHeader.read(file)
         if header.format_version != FORMAT_VERSION:
             raise ValueError("Unsupported file format version")
         body = FileBody.read(header, file)
-    return deserialize(header, body)
+    return header, body
+
+
+def map_file(path: pathlib.Path) -> Tuple[FileHeader, memoryview]:
+    """
+    Memory maps a file on the provided path in read only mode, validates its header and returns the still compressed
+    body as a memoryview over the mapping. Nothing is copied, the operating system only reads the pages of the body
+    that are accessed and shares them in its page cache between all processes mapping the same file.
+    The mapping stays open for as long as the returned memoryview, or any slice of it, is referenced.
+    """
+    with path.open("rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapping)
+    header = FileHeader.unpack(buffer)
+    if header.format_version != FORMAT_VERSION:
+        raise ValueError("Unsupported file format version")
+    body = buffer[HEADER_SIZE : HEADER_SIZE + header.width * header.height]
+    if len(body) != header.width * header.height:
+        raise ValueError("Truncated file body")
+    return header, body
 
 
 def deserialize(header: FileHeader, body: FileBody) -> Iterator[Square]:
     """Deserializes a header and body into a Maze
-    Loops over the square values in the file body. To keep track of the current square index, it enumerates the values
-    and calculates their row and column based on metadata in the header. Each bit field gets decompressed into the
-    relevant Border and Role, which the square’s class constructor requires.
+    Decodes the square values in the file body one row at a time, calculating the index, row and column of each square
+    from metadata in the header. Each bit field gets looked up in a precomputed table of the relevant Border and Role,
+    which the square’s class constructor requires.
+    """
+    return decode_rows(body.square_values, header.width, header.height)
+
+
+def decode_rows(
+    square_values: Sequence[int], width: int, height: int
+) -> Iterator[Square]:
+    """
+    Decodes all the rows of square values one after the other. The column numbers are created once and shared by the
+    squares of all rows, like the row number is shared by the squares of a row, which saves an integer object per
+    square in mazes wider than the range of integers cached by Python.
+    """
+    columns = range(width) if width <= 256 else list(range(width))
+    for row in range(height):
+        yield from decode_row(square_values, row, width, columns)
+
+
+def decode_row(
+    square_values: Sequence[int],
+    row: int,
+    width: int,
+    columns: Sequence[int] | None = None,
+) -> List[Square]:
     """
-    squares: List[Square] = []
-    for index, square_value in enumerate(body.square_values):
-        row, column = divmod(index, header.width)
-        border, role = decompress(square_value)
-        squares.append(Square(index, row, column, border, role))
-        yield Square(index, row, column, border, role)
+    Decodes a whole row of square values in bulk, reusing the Border and Role members of the decoding table instead
+    of creating new enumeration members for every square
+    Args:
+        square_values (Sequence): row-major square values of the whole maze
+        row (int): index of the row to decode
+        width (int): number of squares in a row
+        columns (Sequence): optional column numbers to share between rows, defaults to a new range
+    Returns:
+        List: squares of the row
+    """
+    start = row * width
+    values = square_values[start : start + width]
+    if max(values, default=0) >= len(DECODING_TABLE):
+        raise ValueError("Unknown square role")
+    table = DECODING_TABLE
+    return [
+        Square(start + column, row, column, *table[value])
+        for column, value in zip(columns or range(width), values)
+    ]
 
 
 def decompress(square_value: int) -> Tuple[Border, Role]:
     """Decompresses a square value into a tuple of a border and its Role"""
-    return Border(square_value & 0xF), Role(square_value >> 4)
+    try:
+        return DECODING_TABLE[square_value]
+    except IndexError:
+        raise ValueError("Unknown square role") from None
+
+
+def fingerprint(width: int, height: int, square_values: Sequence[int]) -> bytes:
+    """
+    Retrieves a digest of the dimensions and the compressed square values of a maze, which are the same bytes that
+    get written to a file. Mazes with the same digest have the same squares.
+    Args:
+        width (int): number of columns in the maze
+        height (int): number of rows in the maze
+        square_values (Sequence): compressed square values supporting the buffer protocol, e.g. array, bytes or memoryview
+    Returns:
+        bytes: 16 byte BLAKE2b digest
+    """
+    digest = hashlib.blake2b(struct.pack("<2I", width, height), digest_size=16)
+    digest.update(square_values)  # type: ignore[arg-type]
+    return digest.digest()
 
 
 def compress(square: Square) -> int:
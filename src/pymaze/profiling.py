@@ -0,0 +1,235 @@
+"""
+Contains the instrumentation of the stages of solving a maze, which records the wall time, the CPU time and the peak
+memory allocated by every stage while a profiler is active
+"""
+import contextlib
+import json
+import time
+import tracemalloc
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    TextIO,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Profiler the stages of the current thread or task are recorded into, if any
+ACTIVE_PROFILER: ContextVar["Profiler | None"] = ContextVar(
+    "ACTIVE_PROFILER", default=None
+)
+
+# Context manager returned by stage() when no profiler is active, so that instrumented code pays next to nothing
+NO_STAGE: ContextManager[None] = contextlib.nullcontext()
+
+
+@dataclass
+class StageStats:
+    """
+    Accumulated measurements of a stage, which may run any number of times. The measurements of a stage include the
+    ones of the stages nested in it, e.g. loading a maze includes validating it.
+    Args:
+        calls (int): number of times the stage ran
+        wall_seconds (float): total elapsed time
+        cpu_seconds (float): total processor time of the process
+        peak_bytes (int): largest amount of memory allocated by a single run of the stage on top of what was already
+            allocated when it started
+    """
+
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class Frame:
+    """
+    Stage running on a profiler
+    Args:
+        start_bytes (int): memory traced when the stage started
+        outer_peak (int): peak of traced memory reached by the enclosing stage before this one started
+        inner_peak (int): highest peak of traced memory reached by the stages nested in this one
+    """
+
+    start_bytes: int
+    outer_peak: int
+    inner_peak: int = 0
+
+
+class Profiler:
+    """
+    Records the stages run while it is active, as a context manager or between start() and stop(). Memory allocations
+    are traced with tracemalloc, which slows Python down noticeably, so timings are only comparable between profiled
+    runs. Optionally runs cProfile at the same time to find out which functions a slow stage spends its time in.
+    Args:
+        cprofile (bool): whether to also collect function level statistics with cProfile, defaults to False
+    """
+
+    def __init__(self, cprofile: bool = False) -> None:
+        self.cprofile = cprofile
+        self.stages: Dict[str, StageStats] = {}
+        self._frames: List[Frame] = []
+        self._profile: "cProfile.Profile | None" = None
+        self._started_tracing = False
+        self._token: "Token[Profiler | None] | None" = None
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Activates the profiler in the current context, tracing memory allocations and running cProfile if asked"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.cprofile:
+            import cProfile  # pylint: disable=import-outside-toplevel
+
+            self._profile = self._profile or cProfile.Profile()
+            self._profile.enable()
+        self._token = ACTIVE_PROFILER.set(self)
+
+    def stop(self) -> None:
+        """Deactivates the profiler, restoring the one active before it, and stops the memory tracing it started"""
+        if self._token is not None:
+            ACTIVE_PROFILER.reset(self._token)
+            self._token = None
+        if self._profile is not None:
+            self._profile.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Measures a run of the stage with the given name. Stages can be nested, the peak of the traced memory is
+        reset when a stage starts and the peak of the enclosing stage is restored from the saved values afterwards.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        frame = Frame(start_bytes=current, outer_peak=peak)
+        self._frames.append(frame)
+        tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            peak = max(tracemalloc.get_traced_memory()[1], frame.inner_peak)
+            self._frames.pop()
+            if self._frames:
+                outer = self._frames[-1]
+                outer.inner_peak = max(outer.inner_peak, frame.outer_peak, peak)
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.wall_seconds += wall
+            stats.cpu_seconds += cpu
+            stats.peak_bytes = max(stats.peak_bytes, peak - frame.start_bytes)
+
+    def report(self) -> Dict[str, Any]:
+        """Retrieves the measurements of every stage in the order the stages first ran, ready to be dumped as JSON"""
+        return {"stages": {name: asdict(stats) for name, stats in self.stages.items()}}
+
+    def write_report(self, stream: TextIO) -> None:
+        """Writes the report as indented JSON onto the given text stream"""
+        json.dump(self.report(), stream, indent=2)
+        stream.write("\n")
+
+    def dump_stats(self, path: Path) -> None:
+        """
+        Dumps the cProfile statistics into a file on the given path, which can be read with the pstats module
+        Raises:
+            ValueError: if the profiler did not run cProfile
+        """
+        self._require_profile().dump_stats(path)
+
+    def dump_collapsed(self, path: Path) -> None:
+        """
+        Dumps the cProfile statistics as collapsed stacks into a file on the given path, which can be turned into a
+        flame graph by flamegraph.pl, speedscope or inferno. cProfile only records callers one level deep, so the
+        time of a function called from several places is split among its callers in proportion to the time spent in
+        each of these calls.
+        Raises:
+            ValueError: if the profiler did not run cProfile
+        """
+        with path.open("w", encoding="utf-8") as file:
+            for stack, microseconds in collapsed_stacks(self._require_profile()):
+                file.write(f"{';'.join(stack)} {microseconds}\n")
+
+    def _require_profile(self) -> "cProfile.Profile":
+        """Retrieves the cProfile profiler or raises ValueError if it was not enabled"""
+        if self._profile is None:
+            raise ValueError("The profiler did not run cProfile")
+        return self._profile
+
+
+def stage(name: str) -> ContextManager[None]:
+    """
+    Measures a run of the stage with the given name on the active profiler, or does nothing if none is active.
+    This is the hook instrumented code calls, e.g. with stage("solve"): ...
+    """
+    profiler = ACTIVE_PROFILER.get()
+    return NO_STAGE if profiler is None else profiler.stage(name)
+
+
+def collapsed_stacks(
+    profile: "cProfile.Profile", threshold: float = 0.001
+) -> Iterator[Tuple[List[str], int]]:
+    """
+    Rebuilds approximate call stacks from the statistics of cProfile, starting from the functions without callers.
+    The number of stacks grows exponentially with the depth of the call graph, so the calls taking less than the
+    given fraction of the total time are left out along with everything they call.
+    Args:
+        profile (Profile): cProfile profiler to read the statistics from
+        threshold (float): smallest fraction of the total time of a call to be kept, defaults to 0.1%
+    Returns:
+        Iterator: stacks of function labels, outermost first, with the time spent in the innermost one in microseconds
+    """
+    import pstats  # pylint: disable=import-outside-toplevel
+
+    stats: Dict[Any, Any] = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    callees: Dict[Any, Dict[Any, float]] = {function: {} for function in stats}
+    for function, (*_, callers) in stats.items():
+        for caller, (*_, cumulative_time) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative_time
+    roots = {
+        function: cumulative_time
+        for function, (_, _, _, cumulative_time, callers) in stats.items()
+        if not callers
+    }
+    minimum = threshold * sum(roots.values())
+
+    def walk(stack: List[Any], share: float) -> Iterator[Tuple[List[str], int]]:
+        function = stack[-1]
+        _, _, total_time, cumulative_time, _ = stats[function]
+        scale = share / cumulative_time if cumulative_time else 0.0
+        if microseconds := round(total_time * scale * 1e6):
+            yield [label(frame) for frame in stack], microseconds
+        for callee, callee_time in callees[function].items():
+            if callee not in stack and callee_time * scale >= minimum:
+                yield from walk(stack + [callee], callee_time * scale)
+
+    for function, cumulative_time in roots.items():
+        if cumulative_time >= minimum:
+            yield from walk([function], cumulative_time)
+
+
+def label(function: Tuple[str, int, str]) -> str:
+    """Retrieves the label of a function in a collapsed stack from its cProfile key"""
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
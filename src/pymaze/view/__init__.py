@@ -0,0 +1,8 @@
+"""
+Renders mazes and their solutions. The package itself is kept light, so that the CLI can refer to the export formats
+without importing the renderer.
+"""
+from typing import Literal, TypeAlias
+
+# Formats an SVG image can be exported in, either as is or wrapped in an HTML page
+Format: TypeAlias = Literal["svg", "html"]
@@ -0,0 +1,44 @@
+"""
+Exports rendered SVG images to files or a text stream instead of previewing them in the web browser
+"""
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from . import Format
+from .renderer import SVG
+
+# Output that sends the exported images to the text stream, e.g. the standard output
+STREAM_OUTPUT: str = "-"
+
+
+def export(
+    svgs: Iterable[SVG],
+    output: str,
+    name: str,
+    export_format: Format = "svg",
+    stream: TextIO | None = None,
+) -> int:
+    """
+    Exports SVG images without involving the web browser.
+    Args:
+        svgs (Iterable): images to export, which are rendered lazily one at a time
+        output (str): "-" to write all images to the stream one per line, an existing directory to write one file per
+            image named after the maze and the number of the image, or any other path to write the first image to
+        name (str): name of the maze the images were rendered from, used to name the files in a directory
+        export_format (Format): whether to export the plain SVG or an HTML page wrapping it
+        stream (TextIO): text stream receiving the images when the output is "-"
+    Returns:
+        int: number of images exported
+    """
+    count = 0
+    html = export_format == "html"
+    for count, svg in enumerate(svgs, start=1):
+        if output == STREAM_OUTPUT:
+            assert stream is not None, "A stream is required to export to"
+            stream.write((svg.html_content if html else svg.xml_content) + "\n")
+        elif Path(output).is_dir():
+            svg.write(Path(output) / f"{name}-{count}.{export_format}", html)
+        else:
+            svg.write(Path(output), html)
+            break
+    return count
@@ -3,12 +3,12 @@ Handles SVG rendering
 """
 import textwrap
 from dataclasses import dataclass
-import webbrowser
-import tempfile
-from ..models.maze import Maze
+from pathlib import Path
+from ..models.maze import AnyMaze
 from ..models.role import Role
 from ..models.solution import Solution
 from ..models.square import Square
+from ..profiling import stage
 from ..view.primitives import tag, Rect, Point, Text, Polyline
 from ..view.decomposer import decompose
 
@@ -72,7 +72,18 @@ class SVG:
         </html>"""
         ).format(self.xml_content)
 
+    def write(self, path: Path, html: bool = False) -> None:
+        """Writes the SVG content, or the HTML content wrapping it, into a file on the given path"""
+        path.write_text(
+            self.html_content if html else self.xml_content, encoding="utf-8"
+        )
+
     def preview(self) -> None:
+        """Previews the SVG in the web browser through a temporary HTML file"""
+        # pylint: disable=import-outside-toplevel
+        import tempfile
+        import webbrowser
+
         with tempfile.NamedTemporaryFile(
             mode="w", encoding="utf-8", suffix=".html", delete=False
         ) as file:
@@ -99,7 +110,7 @@ class SVGRenderer:
         """
         return self.line_width // 2
 
-    def render(self, maze: Maze, solution: Solution | None = None) -> SVG:
+    def render(self, maze: AnyMaze, solution: Solution | None = None) -> SVG:
         """
         Renders a lightweight SVG object which wraps the textual XML content
         """
@@ -107,19 +118,20 @@ class SVGRenderer:
         width = margins + maze.width * self.square_size
         height = margins + maze.height * self.square_size
 
-        return SVG(
-            tag(
-                "svg",
-                self._get_body(maze, solution),
-                xmlns="http://www.w3.org/2000/svg",
-                stroke_linejoin="round",
-                width=width,
-                height=height,
-                viewBox=f"0 0 {width} {height}",
+        with stage("render"):
+            return SVG(
+                tag(
+                    "svg",
+                    self._get_body(maze, solution),
+                    xmlns="http://www.w3.org/2000/svg",
+                    stroke_linejoin="round",
+                    width=width,
+                    height=height,
+                    viewBox=f"0 0 {width} {height}",
+                )
             )
-        )
 
-    def _get_body(self, maze: Maze, solution: Solution | None) -> str:
+    def _get_body(self, maze: AnyMaze, solution: Solution | None) -> str:
         """Retrieves the body from the maze and solution"""
         return "".join(
             [
@@ -0,0 +1,34 @@
+"""
+Contains helpers shared by the test cases of the graph searches
+"""
+from src.pymaze.generate import braid, generate
+from src.pymaze.graphs.compiled import role_weight
+
+
+def braided(width, height, seed, fraction=0.25, **roles):
+    """Generates a maze and removes a fraction of its inner right borders, so that it has loops"""
+    return braid(generate(width, height, seed=seed, **roles), fraction, seed)
+
+
+def path_cost(graph, path):
+    """Sums the weights of the cheapest edges between consecutive node ids of a path of a compiled graph"""
+    return sum(
+        min(
+            graph.weights[edge]
+            for edge in range(graph.offsets[first], graph.offsets[first + 1])
+            if graph.targets[edge] == second
+        )
+        for first, second in zip(path, path[1:])
+    )
+
+
+def square_path_cost(maze, path):
+    """Sums the distances between the squares of a path and the weights of the roles of the squares it enters"""
+    total = 0.0
+    for first, second in zip(path, path[1:]):
+        first_row, first_column = divmod(first, maze.width)
+        second_row, second_column = divmod(second, maze.width)
+        assert first_row == second_row or first_column == second_column
+        total += abs(first_row - second_row) + abs(first_column - second_column)
+        total += role_weight(maze[second].role)
+    return total
@@ -0,0 +1,97 @@
+import array
+import io
+import json
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from src.pymaze.batch import find_maze_files, run_batch, solve_file
+from src.pymaze.cli import get_command_line_args
+from src.pymaze.generate import generate
+from src.pymaze.models.role import Role
+from src.pymaze.persistence.serializer import dump_values
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class BatchTestCases(unittest.TestCase):
+    def test_find_maze_files(self):
+        """should find maze files in directories, by path and by glob pattern"""
+        self.assertEqual(
+            sorted(MAZES_DIR.glob("*.maze")), list(find_maze_files([str(MAZES_DIR)]))
+        )
+        self.assertEqual(
+            [
+                MAZES_DIR / "miniature.maze",
+                MAZES_DIR / "pacman.maze",
+                MAZES_DIR / "pacman_empty.maze",
+            ],
+            list(
+                find_maze_files(
+                    [str(MAZES_DIR / "miniature.maze"), str(MAZES_DIR / "pac*.maze")]
+                )
+            ),
+        )
+
+    def test_solve_file(self):
+        """should report the length and cost of the solution of a maze"""
+        result = solve_file(MAZES_DIR / "miniature.maze")
+        self.assertEqual(
+            (True, 6, 6.0), (result["solved"], result["length"], result["cost"])
+        )
+        self.assertIsNone(solve_file(MAZES_DIR / "impossible.maze")["cost"])
+
+    def test_solve_file_error(self):
+        """should report broken files instead of raising"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "broken.maze"
+            path.write_bytes(b"NOPE")
+            self.assertIn("error", solve_file(path))
+
+    def test_solve_file_without_doors(self):
+        """should report files without an entrance or an exit instead of raising"""
+        with tempfile.TemporaryDirectory() as directory:
+            for role, message in ((Role.ENTRANCE, "entrance"), (Role.EXIT, "exit")):
+                maze = generate(10, 10, seed=1)
+                values = array.array("B", bytes(maze.values))
+                index = maze.roles[role][0]
+                values[index] &= 0x0F
+                path = Path(directory) / f"no_{message}.maze"
+                dump_values(maze.width, maze.height, values, path)
+                with self.subTest(role=role):
+                    self.assertEqual(
+                        f"Maze has no {message}", solve_file(path).get("error")
+                    )
+
+    def test_run_batch(self):
+        """should write one JSON line per maze in the order they were found, whatever the number of workers"""
+        outputs = []
+        for workers in (1, 2):
+            output = io.StringIO()
+            count = run_batch([str(MAZES_DIR)], output, workers=workers, chunk_size=2)
+            lines = [json.loads(line) for line in output.getvalue().splitlines()]
+            self.assertEqual(5, count)
+            outputs.append([(line["path"], line["cost"]) for line in lines])
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_command_line_args(self):
+        """should require a single path unless in batch mode"""
+        args = get_command_line_args(["--batch", "--workers", "3", "a", "b"])
+        self.assertEqual((["a", "b"], 3), (args.paths, args.workers))
+        with self.assertRaises(SystemExit), unittest.mock.patch("sys.stderr"):
+            get_command_line_args(["a", "b"])
+
+    def test_positive_numbers(self):
+        """should reject numeric options below 1 as usage errors"""
+        for option in ("--limit", "--workers", "--chunk-size"):
+            for value in ("0", "-2", "many"):
+                with self.subTest(option=option, value=value):
+                    with unittest.mock.patch("sys.stderr", io.StringIO()):
+                        with self.assertRaises(SystemExit):
+                            get_command_line_args([option, value, "a"])
+        self.assertEqual(2, get_command_line_args(["--limit", "2", "a"]).limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
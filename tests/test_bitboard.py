@@ -0,0 +1,98 @@
+import unittest
+from collections import deque
+from pathlib import Path
+
+from src.pymaze.generate import generate
+from src.pymaze.graphs.bitboard import (
+    Bitboard,
+    distance_field,
+    distance_layers,
+    indices,
+    is_reachable,
+)
+from src.pymaze.models.border import Border
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+def breadth_first_search(maze):
+    """Reference search stepping between neighboring squares one at a time, following the converter's rules"""
+
+    def passable(square):
+        return square.role not in (Role.WALL, Role.EXTERIOR)
+
+    neighbors = {square.index: [] for square in maze}
+    for square in maze:
+        if not passable(square):
+            continue
+        if square.column < maze.width - 1 and not square.border & Border.RIGHT:
+            right = maze[square.index + 1]
+            if passable(right):
+                neighbors[square.index].append(right.index)
+                neighbors[right.index].append(square.index)
+        if square.row < maze.height - 1 and not square.border & Border.BOTTOM:
+            bottom = maze[square.index + maze.width]
+            if passable(bottom):
+                neighbors[square.index].append(bottom.index)
+                neighbors[bottom.index].append(square.index)
+
+    distances = [-1] * (maze.width * maze.height)
+    distances[maze.entrance.index] = 0
+    queue = deque([maze.entrance.index])
+    while queue:
+        index = queue.popleft()
+        for neighbor in neighbors[index]:
+            if distances[neighbor] == -1:
+                distances[neighbor] = distances[index] + 1
+                queue.append(neighbor)
+    return distances
+
+
+class BitboardTestCases(unittest.TestCase):
+    def test_distance_field(self):
+        """should count the steps to every square like a plain breadth first search"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                self.assertEqual(breadth_first_search(maze), list(distance_field(maze)))
+
+    def test_is_reachable(self):
+        """should tell whether the exit can be reached"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                self.assertEqual(name != "impossible", is_reachable(maze))
+
+    def test_distance_layers(self):
+        """should list the squares first reached after every number of steps"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        layers = distance_layers(maze)
+        self.assertEqual([maze.entrance.index], layers[0])
+        distances = distance_field(maze)
+        for distance, layer in enumerate(layers):
+            self.assertTrue(layer)
+            self.assertTrue(all(distances[index] == distance for index in layer))
+        self.assertEqual(
+            sum(1 for distance in distances if distance >= 0), sum(map(len, layers))
+        )
+
+    def test_perfect_maze(self):
+        """should reach every square of a perfect maze"""
+        maze = generate(40, 30, seed=5)
+        bitboard = Bitboard.from_maze(maze)
+        self.assertEqual(len(maze), bitboard.reachable(0).bit_count())
+        self.assertEqual(
+            breadth_first_search(maze), list(bitboard.distances(maze.entrance.index))
+        )
+
+    def test_indices(self):
+        """should list the indices of the set bits"""
+        self.assertEqual([], indices(0))
+        self.assertEqual([0, 3, 1000], indices(1 | 1 << 3 | 1 << 1000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.cache import GraphCache
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class GraphCacheTestCases(unittest.TestCase):
+    def test_hit_on_same_content(self):
+        """should reuse the graph of a maze with the same content"""
+        cache = GraphCache()
+        path = MAZES_DIR / "pacman.maze"
+        graph = cache.compiled(Maze.load(path))
+        self.assertIs(graph, cache.compiled(CompactMaze.load(path)))
+        self.assertEqual((1, 1, 0), stats(cache))
+
+    def test_separate_graph_kinds(self):
+        """should cache the networkx and compiled graphs of a maze separately"""
+        cache = GraphCache()
+        maze = Maze.load(MAZES_DIR / "miniature.maze")
+        cache.networkx(maze)
+        cache.compiled(maze)
+        cache.networkx(maze)
+        self.assertEqual(2, len(cache))
+        self.assertEqual((1, 2, 0), stats(cache))
+
+    def test_evicts_least_recently_used(self):
+        """should evict the least recently used graph once over budget"""
+        mazes = [
+            Maze.load(MAZES_DIR / f"{name}.maze")
+            for name in ("miniature", "pacman", "labyrinth")
+        ]
+        cache = GraphCache()
+        sizes = [cache.compiled(maze).nbytes for maze in mazes]
+        cache = GraphCache(max_bytes=sizes[0] + sizes[2])
+        cache.compiled(mazes[0])
+        cache.compiled(mazes[1])
+        cache.compiled(mazes[0])
+        cache.compiled(mazes[2])
+        self.assertEqual(2, len(cache))
+        self.assertEqual(sizes[0] + sizes[2], cache.nbytes)
+        self.assertEqual((1, 3, 1), stats(cache))
+
+    def test_skips_graphs_over_budget(self):
+        """should not cache a graph larger than the whole budget"""
+        cache = GraphCache(max_bytes=1)
+        maze = Maze.load(MAZES_DIR / "miniature.maze")
+        cache.compiled(maze)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.nbytes)
+
+    def test_clear(self):
+        """should drop all graphs and reset the counters"""
+        cache = GraphCache()
+        cache.compiled(Maze.load(MAZES_DIR / "miniature.maze"))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual((0, 0, 0), stats(cache))
+
+
+def stats(cache):
+    return cache.stats.hits, cache.stats.misses, cache.stats.evictions
+
+
+if __name__ == "__main__":
+    unittest.main()
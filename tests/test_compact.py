@@ -0,0 +1,117 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.solver import solve
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+class CompactMazeTestCases(unittest.TestCase):
+    def test_same_squares_as_maze(self):
+        """should materialize the same squares as the tuple backed maze"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                path = MAZES_DIR / f"{name}.maze"
+                maze, compact = Maze.load(path), CompactMaze.load(path)
+                self.assertEqual(
+                    (maze.width, maze.height), (compact.width, compact.height)
+                )
+                self.assertEqual(list(maze), list(compact))
+                self.assertEqual(maze.entrance, compact.entrance)
+                self.assertEqual(maze.exit, compact.exit)
+                self.assertEqual(maze[len(compact) - 1], compact[len(compact) - 1])
+
+    def test_role_index(self):
+        """should index the squares of every role like a scan of the whole maze"""
+        for name in MAZE_NAMES:
+            path = MAZES_DIR / f"{name}.maze"
+            for maze in (
+                Maze.load(path),
+                Maze(tuple(Maze.load(path))),
+                CompactMaze.load(path),
+            ):
+                for role in Role:
+                    if role is Role.NONE:
+                        continue
+                    with self.subTest(name=name, model=type(maze), role=role):
+                        expected = [square for square in maze if square.role is role]
+                        self.assertEqual(
+                            [square.index for square in expected],
+                            list(maze.roles[role]),
+                        )
+                        self.assertEqual(expected, maze.squares_with_role(role))
+        self.assertNotIn(Role.NONE, CompactMaze.load(MAZES_DIR / "pacman.maze").roles)
+
+    def test_from_maze(self):
+        """should pack a maze into the same values as the file body"""
+        path = MAZES_DIR / "pacman.maze"
+        self.assertEqual(CompactMaze.load(path), Maze.load(path).compact())
+        self.assertEqual(
+            CompactMaze.load(path), CompactMaze.from_squares(Maze.load(path))
+        )
+
+    def test_dump_round_trip(self):
+        """should dump a file that can be loaded back into the same maze"""
+        compact = CompactMaze.load(MAZES_DIR / "labyrinth.maze")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "labyrinth.maze"
+            compact.dump(path)
+            self.assertEqual(
+                (MAZES_DIR / "labyrinth.maze").read_bytes(), path.read_bytes()
+            )
+
+    def test_open_mmap(self):
+        """should map a file into the same maze as the one loaded into memory"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                path = MAZES_DIR / f"{name}.maze"
+                mapped = Maze.open_mmap(path)
+                self.assertIsInstance(mapped.values, memoryview)
+                self.assertEqual(CompactMaze.load(path), mapped)
+                self.assertEqual(Maze.load(path).entrance, mapped.entrance)
+
+    def test_open_mmap_truncated(self):
+        """should reject a mapped file whose body is shorter than its header claims"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "truncated.maze"
+            path.write_bytes((MAZES_DIR / "pacman.maze").read_bytes()[:-1])
+            with self.assertRaises(ValueError):
+                Maze.open_mmap(path)
+
+    def test_index_out_of_range(self):
+        """should raise an index error for squares outside of the grid"""
+        compact = CompactMaze.load(MAZES_DIR / "miniature.maze")
+        with self.assertRaises(IndexError):
+            compact[len(compact)]
+
+    def test_validates_roles(self):
+        """should reject mazes without exactly one entrance and one exit"""
+        with self.assertRaises(AssertionError):
+            CompactMaze(2, 1, bytes([0x20, 0x20]))
+        with self.assertRaises(AssertionError):
+            CompactMaze(2, 1, bytes([0x20]))
+
+    def test_validates_roles_relaxed(self):
+        """should accept several entrances and exits in relaxed mode"""
+        values = bytes([0x20, 0x20, 0x30])
+        self.assertEqual(
+            [0, 1], list(CompactMaze(3, 1, values, relaxed=True).roles[Role.ENTRANCE])
+        )
+        with self.assertRaises(AssertionError):
+            CompactMaze(2, 1, bytes([0x20, 0x20]), relaxed=True)
+
+    def test_solves_like_maze(self):
+        """should produce the same solution as the tuple backed maze"""
+        for name in ("miniature", "pacman"):
+            with self.subTest(name=name):
+                path = MAZES_DIR / f"{name}.maze"
+                self.assertEqual(solve(Maze.load(path)), solve(CompactMaze.load(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
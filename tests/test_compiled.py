@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.compiled import CompiledGraph
+from src.pymaze.graphs.converter import get_directed_edges, get_nodes
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+class CompiledGraphTestCases(unittest.TestCase):
+    def test_same_graph_as_converter(self):
+        """should compile the same nodes and weighted directed edges as the converter"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                graph = CompiledGraph.from_maze(maze)
+                nodes = get_nodes(maze)
+                self.assertEqual(
+                    sorted(node.index for node in nodes), list(graph.squares)
+                )
+                self.assertEqual(
+                    {
+                        (edge.node1.index, edge.node2.index, edge.weight())
+                        for edge in get_directed_edges(maze, nodes)
+                    },
+                    set(edges(graph)),
+                )
+
+    def test_compiles_compact_maze(self):
+        """should compile the same graph from a compact maze"""
+        path = MAZES_DIR / "pacman.maze"
+        self.assertEqual(
+            CompiledGraph.from_maze(Maze.load(path)),
+            CompiledGraph.from_maze(CompactMaze.open_mmap(path)),
+        )
+
+    def test_node_id(self):
+        """should look up the node id of a square and reject squares that are not nodes"""
+        maze = Maze.load(MAZES_DIR / "miniature.maze")
+        graph = CompiledGraph.from_maze(maze)
+        node_id = graph.node_id(maze.entrance.index)
+        self.assertEqual(maze.entrance.index, graph.squares[node_id])
+        self.assertEqual(
+            (maze.entrance.row, maze.entrance.column), graph.position(node_id)
+        )
+        with self.assertRaises(KeyError):
+            graph.node_id(10)
+
+    def test_nbytes(self):
+        """should report the size of its arrays"""
+        graph = CompiledGraph.from_maze(Maze.load(MAZES_DIR / "miniature.maze"))
+        self.assertEqual(
+            len(graph) * (1 + 4) + (len(graph) + 1) * 4 + len(graph.targets) * (4 + 8),
+            graph.nbytes,
+        )
+
+
+def edges(graph):
+    for node_id in range(len(graph)):
+        for edge in range(graph.offsets[node_id], graph.offsets[node_id + 1]):
+            yield (
+                graph.squares[node_id],
+                graph.squares[graph.targets[edge]],
+                graph.weights[edge],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.converter import get_edges, get_nodes
+from src.pymaze.graphs.edge import Edge
+from src.pymaze.models.border import Border
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+class ConverterTestCases(unittest.TestCase):
+    def test_get_edges(self):
+        """should find the same edges as walking east and south from every node"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                nodes = get_nodes(maze)
+                self.assertEqual(walk_edges(maze, nodes), get_edges(maze, nodes))
+
+    def test_get_edges_subset_of_nodes(self):
+        """should only connect the given nodes"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        nodes = set(list(get_nodes(maze))[::2])
+        self.assertEqual(walk_edges(maze, nodes), get_edges(maze, nodes))
+
+    def test_get_edges_compact_maze(self):
+        """should find the same edges in a compact maze"""
+        maze = CompactMaze.load(MAZES_DIR / "pacman.maze")
+        nodes = get_nodes(maze)
+        self.assertEqual(walk_edges(maze, nodes), get_edges(maze, nodes))
+
+
+def walk_edges(maze, nodes):
+    edges = set()
+    for source_node in nodes:
+        node = source_node
+        for x in range(node.column + 1, maze.width):
+            if node.border & Border.RIGHT:
+                break
+            node = maze[node.row * maze.width + x]
+            if node in nodes:
+                edges.add(Edge(source_node, node))
+                break
+        node = source_node
+        for y in range(node.row + 1, maze.height):
+            if node.border & Border.BOTTOM:
+                break
+            node = maze[y * maze.width + node.column]
+            if node in nodes:
+                edges.add(Edge(source_node, node))
+                break
+    return edges
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import collections
+import math
+import random
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.dag import (
+    ShortestPathDAG,
+    count_solutions,
+    sample_solutions,
+    stream_solutions,
+)
+from src.pymaze.graphs.solver import solution_cost, solve_all
+from src.pymaze.models.border import Border
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+def open_field(size: int) -> CompactMaze:
+    """Square maze without inner borders, entered in the top left corner and exited in the bottom right one"""
+    values = bytearray(size * size)
+    values[0] = Role.ENTRANCE << 4
+    values[-1] = Role.EXIT << 4
+    return CompactMaze(size, size, values)
+
+
+class ShortestPathDAGTestCases(unittest.TestCase):
+    def test_count_bundled_mazes(self):
+        """should count as many solutions as solve_all finds"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                self.assertEqual(len(solve_all(maze)), count_solutions(maze))
+
+    def test_count_open_field(self):
+        """should count the lattice paths of an open field without enumerating them"""
+        self.assertEqual(math.comb(8, 4), count_solutions(open_field(5)))
+        self.assertEqual(math.comb(98, 49), count_solutions(open_field(50)))
+
+    def test_stream_bundled_mazes(self):
+        """should stream the same solutions as solve_all"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        self.assertEqual(set(solve_all(maze)), set(stream_solutions(maze)))
+
+    def test_sample_cheapest_solutions(self):
+        """should only draw cheapest solutions"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        expected_cost = solution_cost(solve_all(maze)[0])
+        solutions = sample_solutions(maze, 20, seed=1)
+        self.assertEqual(20, len(solutions))
+        for solution in solutions:
+            self.assertEqual(expected_cost, solution_cost(solution))
+
+    def test_sample_uniformly(self):
+        """should draw every solution about as often"""
+        dag = ShortestPathDAG.from_maze(open_field(3))
+        draws = collections.Counter(
+            tuple(path) for path in dag.sample(6000, random.Random(7))
+        )
+        self.assertEqual(6, len(draws))
+        for frequency in draws.values():
+            self.assertAlmostEqual(1000, frequency, delta=150)
+
+    def test_several_doors(self):
+        """should count and stream the cheapest paths from any entrance to any exit"""
+        values = bytearray(open_field(3).values)
+        values[2] = Role.ENTRANCE << 4
+        values[6] = Role.EXIT << 4
+        maze = CompactMaze(3, 3, values, relaxed=True)
+        self.assertEqual(2, count_solutions(maze))
+        self.assertEqual(
+            {(0, 3, 6), (2, 5, 8)},
+            {
+                tuple(square.index for square in solution)
+                for solution in stream_solutions(maze)
+            },
+        )
+        for solution in sample_solutions(maze, 10, seed=1):
+            self.assertEqual(2, solution_cost(solution))
+
+    def test_several_doors_without_solution(self):
+        """should find no path when every exit is walled off from every entrance"""
+        values = bytes(
+            [
+                Role.ENTRANCE << 4,
+                Role.ENTRANCE << 4 | Border.RIGHT,
+                Role.WALL << 4 | Border.LEFT | Border.RIGHT,
+                Role.EXIT << 4 | Border.LEFT,
+                Role.EXIT << 4,
+            ]
+        )
+        maze = CompactMaze(5, 1, values, relaxed=True)
+        self.assertEqual(0, count_solutions(maze))
+        self.assertEqual([], sample_solutions(maze, 2))
+        self.assertEqual([], list(stream_solutions(maze)))
+
+    def test_no_solution(self):
+        """should neither count nor draw solutions of an impossible maze"""
+        maze = Maze.load(MAZES_DIR / "impossible.maze")
+        self.assertEqual(0, count_solutions(maze))
+        self.assertEqual([], sample_solutions(maze, 3))
+        self.assertEqual([], list(stream_solutions(maze)))
+
+
+if __name__ == "__main__":
+    unittest.main()
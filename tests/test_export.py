@@ -0,0 +1,53 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.solver import iter_solutions
+from src.pymaze.models.maze import Maze
+from src.pymaze.view.export import export
+from src.pymaze.view.renderer import SVGRenderer
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+def render_all(name):
+    maze = Maze.load(MAZES_DIR / f"{name}.maze")
+    renderer = SVGRenderer()
+    return (renderer.render(maze, solution) for solution in iter_solutions(maze))
+
+
+class ExportTestCases(unittest.TestCase):
+    def test_export_to_stream(self):
+        """should write every image to the stream, one per line"""
+        stream = io.StringIO()
+        self.assertEqual(
+            10, export(render_all("labyrinth"), "-", "labyrinth", stream=stream)
+        )
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(10, len(lines))
+        self.assertTrue(all(line.startswith("<svg") for line in lines))
+
+    def test_export_to_directory(self):
+        """should write one file per image into a directory"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(
+                10, export(render_all("labyrinth"), directory, "labyrinth", "html")
+            )
+            paths = sorted(Path(directory).iterdir())
+            self.assertEqual(10, len(paths))
+            self.assertIn(Path(directory) / "labyrinth-10.html", paths)
+            self.assertTrue(
+                paths[0].read_text(encoding="utf-8").startswith("<!DOCTYPE html>")
+            )
+
+    def test_export_to_file(self):
+        """should write the first image to a file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "solution.svg"
+            self.assertEqual(1, export(render_all("labyrinth"), str(path), "labyrinth"))
+            self.assertTrue(path.read_text(encoding="utf-8").startswith("<svg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
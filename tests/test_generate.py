@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.pymaze.generate import braid, generate, main
+from src.pymaze.graphs.dag import count_solutions
+from src.pymaze.models.border import Border
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.role import Role
+
+ALGORITHMS = ("backtracker", "kruskal", "wilson")
+
+
+def passages(maze):
+    """Returns the pairs of neighboring square indices that are not separated by a border, checking both sides"""
+    pairs = set()
+    for square in maze:
+        if square.column < maze.width - 1 and not square.border & Border.RIGHT:
+            assert not maze[square.index + 1].border & Border.LEFT
+            pairs.add((square.index, square.index + 1))
+        if square.row < maze.height - 1 and not square.border & Border.BOTTOM:
+            assert not maze[square.index + maze.width].border & Border.TOP
+            pairs.add((square.index, square.index + maze.width))
+    return pairs
+
+
+def reachable(maze, pairs):
+    """Returns the number of squares reachable from the first one"""
+    neighbors = {index: [] for index in range(len(maze))}
+    for first, second in pairs:
+        neighbors[first].append(second)
+        neighbors[second].append(first)
+    seen = {0}
+    stack = [0]
+    while stack:
+        for neighbor in neighbors[stack.pop()]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                stack.append(neighbor)
+    return len(seen)
+
+
+class GenerateTestCases(unittest.TestCase):
+    def test_perfect_mazes(self):
+        """should carve a spanning tree of the grid, i.e. one path between any two squares"""
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                maze = generate(23, 17, algorithm, seed=1)
+                pairs = passages(maze)
+                self.assertEqual(len(maze) - 1, len(pairs))
+                self.assertEqual(len(maze), reachable(maze, pairs))
+                self.assertEqual(1, count_solutions(maze))
+
+    def test_seed(self):
+        """should generate the same maze for the same seed"""
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(
+                    generate(20, 20, algorithm, seed=7),
+                    generate(20, 20, algorithm, seed=7),
+                )
+                self.assertNotEqual(
+                    generate(20, 20, algorithm, seed=7),
+                    generate(20, 20, algorithm, seed=8),
+                )
+
+    def test_roles(self):
+        """should place the entrance, the exit, the rewards and the enemies"""
+        maze = generate(10, 8, seed=3, entrance=5, exit=79, rewards=4, enemies=3)
+        self.assertEqual(5, maze.entrance.index)
+        self.assertEqual(79, maze.exit.index)
+        self.assertEqual(4, maze.role_values.count(Role.REWARD))
+        self.assertEqual(3, maze.role_values.count(Role.ENEMY))
+        self.assertFalse(maze.entrance.border & Border.TOP)
+        self.assertFalse(maze.exit.border & Border.BOTTOM)
+
+    def test_default_roles(self):
+        """should place the entrance and the exit in opposite corners"""
+        maze = generate(6, 4, seed=3)
+        self.assertEqual(0, maze.entrance.index)
+        self.assertEqual(23, maze.exit.index)
+
+    def test_invalid_roles(self):
+        """should refuse roles that do not fit in the maze"""
+        with self.assertRaises(ValueError):
+            generate(3, 3, entrance=4, exit=4)
+        with self.assertRaises(ValueError):
+            generate(3, 3, exit=9)
+        with self.assertRaises(ValueError):
+            generate(3, 3, rewards=5, enemies=3)
+
+    def test_braid(self):
+        """should open a fraction of the inner right borders and keep the roles of the squares"""
+        maze = generate(20, 20, seed=4, rewards=10, enemies=10)
+        braided = braid(maze, 0.5, seed=4)
+        added = passages(braided) - passages(maze)
+        self.assertEqual(0, len(passages(maze) - passages(braided)))
+        self.assertTrue(added)
+        self.assertTrue(all(second == first + 1 for first, second in added))
+        self.assertEqual(maze.role_values, braided.role_values)
+        self.assertEqual(braided, braid(maze, 0.5, seed=4))
+
+    def test_main(self):
+        """should write a maze file that can be loaded back"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "generated.maze"
+            main([str(path), "--width", "30", "--height", "20", "--seed", "2"])
+            maze = CompactMaze.load(path)
+        self.assertEqual(generate(30, 20, seed=2), maze)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import math
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.pymaze.generate import generate
+from src.pymaze.graphs.compiled import CompiledGraph
+from src.pymaze.graphs.hierarchy import (
+    ContractionHierarchy,
+    hierarchy_path,
+    load_hierarchy,
+)
+from src.pymaze.graphs.native import shortest_path
+from src.pymaze.graphs.query import PathQuery
+from src.pymaze.models.maze import Maze
+from tests.helpers import path_cost
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+class ContractionHierarchyTestCases(unittest.TestCase):
+    def test_same_cost_as_dijkstra(self):
+        """should find paths as cheap as a plain search of the compiled graph"""
+        mazes = [Maze.load(MAZES_DIR / f"{name}.maze") for name in MAZE_NAMES]
+        mazes.append(generate(30, 30, "kruskal", seed=2, rewards=15, enemies=15))
+        for maze in mazes:
+            graph = CompiledGraph.from_maze(maze)
+            hierarchy = ContractionHierarchy.from_graph(graph)
+            rng = random.Random(0)
+            for _ in range(100):
+                source, target = rng.randrange(len(graph)), rng.randrange(len(graph))
+                with self.subTest(source=source, target=target):
+                    expected = shortest_path(graph, source, target)
+                    path = hierarchy.path(source, target)
+                    if expected is None:
+                        self.assertIsNone(path)
+                        self.assertEqual(math.inf, hierarchy.distance(source, target))
+                        continue
+                    self.assertEqual((source, target), (path[0], path[-1]))
+                    self.assertEqual(path_cost(graph, expected), path_cost(graph, path))
+                    self.assertEqual(
+                        path_cost(graph, expected), hierarchy.distance(source, target)
+                    )
+
+    def test_settles_fewer_nodes(self):
+        """should settle a fraction of the nodes of the graph"""
+        maze = generate(60, 60, seed=1)
+        hierarchy = ContractionHierarchy.from_maze(maze)
+        search = hierarchy.search({0: 0.0}, {len(hierarchy) - 1: 0.0})
+        self.assertLess(search.settled, len(hierarchy) / 4)
+
+    def test_path_query(self):
+        """should answer point to point queries like the plain query object"""
+        maze = generate(20, 20, "wilson", seed=3, rewards=6, enemies=6)
+        plain = PathQuery(maze)
+        contracted = PathQuery(maze, ContractionHierarchy.from_maze(maze))
+        rng = random.Random(4)
+        for _ in range(100):
+            source, target = rng.randrange(len(maze)), rng.randrange(len(maze))
+            with self.subTest(source=source, target=target):
+                self.assertEqual(
+                    plain.distance(source, target), contracted.distance(source, target)
+                )
+                path = contracted.path(source, target)
+                self.assertEqual((source, target), (path[0], path[-1]))
+
+    def test_persistence(self):
+        """should persist the hierarchy next to the maze file and rebuild it when the maze changes"""
+        with tempfile.TemporaryDirectory() as directory:
+            maze_path = Path(directory) / "level.maze"
+            maze = generate(15, 15, seed=5)
+            maze.dump(maze_path)
+            built = load_hierarchy(maze, maze_path)
+            self.assertTrue(hierarchy_path(maze_path).exists())
+            self.assertEqual(Path(directory) / "level.ch", hierarchy_path(maze_path))
+            self.assertEqual(built, load_hierarchy(maze, maze_path))
+
+            changed = generate(15, 15, seed=6)
+            with hierarchy_path(maze_path).open("rb") as file:
+                with self.assertRaises(ValueError):
+                    ContractionHierarchy.read(file, changed.fingerprint)
+            self.assertEqual(
+                ContractionHierarchy.from_maze(changed),
+                load_hierarchy(changed, maze_path),
+            )
+
+    def test_corrupted_file(self):
+        """should refuse truncated or padded files and unknown file types, and rebuild the hierarchy instead"""
+        with tempfile.TemporaryDirectory() as directory:
+            maze_path = Path(directory) / "level.maze"
+            maze = generate(15, 15, seed=5)
+            maze.dump(maze_path)
+            built = load_hierarchy(maze, maze_path)
+            path = hierarchy_path(maze_path)
+            content = path.read_bytes()
+            for corrupted in (content[:-320], content + b"\x00", b"NOPE" + content[4:]):
+                path.write_bytes(corrupted)
+                with self.subTest(size=len(corrupted)):
+                    with path.open("rb") as file:
+                        with self.assertRaises(ValueError):
+                            ContractionHierarchy.read(file, maze.fingerprint)
+                    self.assertEqual(built, load_hierarchy(maze, maze_path))
+                    self.assertEqual(content, path.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
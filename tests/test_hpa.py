@@ -0,0 +1,131 @@
+import math
+import random
+import unittest
+from pathlib import Path
+
+from src.pymaze.generate import generate
+from src.pymaze.graphs.compiled import CompiledGraph
+from src.pymaze.graphs.hpa import ClusterGraph, solve
+from src.pymaze.graphs.native import shortest_path
+from src.pymaze.graphs.solver import solution_cost
+from src.pymaze.graphs.solver import solve as solve_native
+from src.pymaze.models.maze import Maze
+from tests.helpers import braided, path_cost
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class HierarchicalPathfindingTestCases(unittest.TestCase):
+    def test_exact(self):
+        """should find paths as cheap as a search of the whole compiled graph"""
+        for maze in (
+            braided(40, 40, seed=1),
+            braided(40, 40, seed=2, rewards=20, enemies=20),
+            Maze.load(MAZES_DIR / "labyrinth.maze"),
+        ):
+            graph = CompiledGraph.from_maze(maze)
+            for cluster_size in (4, 8):
+                clusters = ClusterGraph(graph, cluster_size)
+                rng = random.Random(cluster_size)
+                for _ in range(50):
+                    source = rng.randrange(len(graph))
+                    target = rng.randrange(len(graph))
+                    with self.subTest(cluster_size=cluster_size, source=source):
+                        expected = shortest_path(graph, source, target)
+                        result = clusters.search(source, target)
+                        self.assertEqual(
+                            (source, target), (result.path[0], result.path[-1])
+                        )
+                        self.assertEqual(path_cost(graph, expected), result.cost)
+                        self.assertEqual(result.cost, path_cost(graph, result.path))
+
+    def test_merged_entrances(self):
+        """should find paths through fewer portals, not always the cheapest but between the same node ids"""
+        for maze in (
+            braided(40, 40, seed=1),
+            braided(40, 40, seed=2, rewards=20, enemies=20),
+            Maze.load(MAZES_DIR / "labyrinth.maze"),
+            Maze.load(MAZES_DIR / "impossible.maze"),
+        ):
+            graph = CompiledGraph.from_maze(maze)
+            for cluster_size in (4, 8):
+                clusters = ClusterGraph(graph, cluster_size, merge=True)
+                self.assertLessEqual(
+                    len(clusters), len(ClusterGraph(graph, cluster_size))
+                )
+                rng = random.Random(cluster_size)
+                for _ in range(50):
+                    source = rng.randrange(len(graph))
+                    target = rng.randrange(len(graph))
+                    with self.subTest(cluster_size=cluster_size, source=source):
+                        expected = shortest_path(graph, source, target)
+                        result = clusters.search(source, target)
+                        if expected is None:
+                            self.assertIsNone(result.path)
+                            continue
+                        self.assertEqual(
+                            (source, target), (result.path[0], result.path[-1])
+                        )
+                        self.assertLessEqual(path_cost(graph, expected), result.cost)
+                        self.assertEqual(result.cost, path_cost(graph, result.path))
+
+    def test_merged_abstract_graph(self):
+        """should merge the edges between clusters whose ends are connected within both clusters"""
+        graph = CompiledGraph.from_maze(braided(60, 60, seed=4))
+        merged = ClusterGraph(graph, 8, merge=True)
+        every = ClusterGraph(graph, 8)
+        self.assertLess(len(merged), len(every))
+        self.assertLess(merged.nbytes, every.nbytes)
+        self.assertEqual(len(merged) + 1, len(merged.offsets))
+        self.assertEqual(len(merged.targets), merged.offsets[-1])
+
+    def test_bounded_suboptimal(self):
+        """should find paths at most weight times as expensive as the cheapest ones by default"""
+        for maze in (
+            braided(50, 50, seed=3),
+            braided(60, 60, seed=5, rewards=30, enemies=30),
+        ):
+            graph = CompiledGraph.from_maze(maze)
+            clusters = ClusterGraph(graph, 8)
+            rng = random.Random(0)
+            for _ in range(50):
+                source, target = rng.randrange(len(graph)), rng.randrange(len(graph))
+                cheapest = path_cost(graph, shortest_path(graph, source, target))
+                for weight in (1.0, 1.5, 2.0, 3.0):
+                    with self.subTest(source=source, target=target, weight=weight):
+                        result = clusters.search(source, target, weight)
+                        self.assertLessEqual(result.cost, weight * cheapest)
+                        self.assertEqual(result.cost, path_cost(graph, result.path))
+                        self.assertEqual(
+                            {"insert", "abstract", "refine"}, set(result.seconds)
+                        )
+
+    def test_solve(self):
+        """should solve a maze as cheaply as the native solver"""
+        maze = Maze.load(MAZES_DIR / "pacman.maze")
+        solution, result = solve(maze, cluster_size=4)
+        self.assertEqual(
+            solution_cost(solve_native(maze, "native")), solution_cost(solution)
+        )
+        self.assertEqual(result.cost, solution_cost(solution))
+
+    def test_unreachable(self):
+        """should tell when the exit can not be reached"""
+        solution, result = solve(
+            Maze.load(MAZES_DIR / "impossible.maze"), cluster_size=2
+        )
+        self.assertIsNone(solution)
+        self.assertIsNone(result.path)
+        self.assertEqual(math.inf, result.cost)
+
+    def test_invalid_parameters(self):
+        """should refuse clusters without squares and weights below 1"""
+        graph = CompiledGraph.from_maze(generate(5, 5, seed=1))
+        with self.assertRaises(ValueError):
+            ClusterGraph(graph, 0)
+        with self.assertRaises(ValueError):
+            ClusterGraph(graph, 2).search(0, 1, weight=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
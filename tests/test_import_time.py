@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+# Modules that take a while to import and that commands which never solve nor preview a maze must not import
+HEAVY_MODULES = ("networkx", "multiprocessing", "concurrent.futures", "webbrowser")
+
+# Generous budget of the time spent importing the modules of the package itself, in microseconds
+PACKAGE_IMPORT_BUDGET = 100_000
+
+
+def import_times(*args):
+    """Runs the CLI with -X importtime, returning the self import time in microseconds of every imported module"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pymaze", *args],
+        env=os.environ | {"PYTHONPATH": str(SRC_DIR)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "self [us]" not in line:
+            self_time, _, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(self_time)
+    return times
+
+
+class ImportTimeTestCases(unittest.TestCase):
+    def assert_light(self, times):
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+        package_time = sum(
+            time for name, time in times.items() if name.split(".")[0] == "pymaze"
+        )
+        self.assertLess(package_time, PACKAGE_IMPORT_BUDGET)
+
+    def test_version(self):
+        """should print the version without importing heavy modules"""
+        self.assert_light(import_times("--version"))
+
+    def test_inspect(self):
+        """should inspect a header without importing heavy modules nor the solver and renderer"""
+        times = import_times("--inspect", str(MAZES_DIR / "pacman.maze"))
+        self.assert_light(times)
+        self.assertNotIn("pymaze.graphs.solver", times)
+        self.assertNotIn("pymaze.view.renderer", times)
+
+
+if __name__ == "__main__":
+    unittest.main()
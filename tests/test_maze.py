@@ -0,0 +1,111 @@
+import unittest
+from pathlib import Path
+
+from src.pymaze.models.border import Border
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+from src.pymaze.models.square import Square
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class MazeFingerprintTestCases(unittest.TestCase):
+    def test_fingerprint_is_cached(self):
+        """should compute the fingerprint only once"""
+        maze = Maze.load(MAZES_DIR / "pacman.maze")
+        self.assertIs(maze.fingerprint, maze.fingerprint)
+        self.assertEqual(16, len(maze.fingerprint))
+
+    def test_fingerprint_matches_compact_maze(self):
+        """should fingerprint the same bytes as the compact maze"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        self.assertEqual(maze.fingerprint, maze.compact().fingerprint)
+        self.assertEqual(
+            maze.fingerprint, Maze.open_mmap(MAZES_DIR / "labyrinth.maze").fingerprint
+        )
+
+    def test_equality_and_hash(self):
+        """should compare and hash mazes by their content"""
+        first = Maze.load(MAZES_DIR / "pacman.maze")
+        second = Maze(squares=tuple(first))
+        other = Maze.load(MAZES_DIR / "pacman_empty.maze")
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual({first: "pacman"}[second], "pacman")
+        self.assertEqual(2, len({first, second, other}))
+
+
+class MazeValidationTestCases(unittest.TestCase):
+    def setUp(self):
+        self.squares = tuple(Maze.load(MAZES_DIR / "miniature.maze"))
+
+    def replace(self, position, **changes):
+        square = self.squares[position]
+        fields = {
+            "index": square.index,
+            "row": square.row,
+            "column": square.column,
+            "border": square.border,
+            "role": square.role,
+        } | changes
+        return (
+            self.squares[:position] + (Square(**fields),) + self.squares[position + 1 :]
+        )
+
+    def test_caches_what_validation_found(self):
+        """should cache the dimensions, the entrance and the exit found while validating"""
+        maze = Maze(self.squares)
+        self.assertEqual((4, 3), (maze.width, maze.height))
+        self.assertIs(Role.ENTRANCE, maze.entrance.role)
+        self.assertIs(Role.EXIT, maze.exit.role)
+
+    def test_rejects_invalid_squares(self):
+        """should report the first invalid field of the squares"""
+        for squares, message in (
+            (self.replace(5, index=6), "Wrong square.index"),
+            (self.replace(5, row=0), "Wrong square.row"),
+            (self.replace(5, column=2), "Wrong square.column"),
+            (self.squares[:-1], "Wrong number of squares"),
+            (self.replace(1, role=Role.ENTRANCE), "Must have exactly 1 entrance"),
+            (self.replace(1, role=Role.EXIT), "Must have exactly 1 exit"),
+        ):
+            with self.subTest(message=message):
+                with self.assertRaisesRegex(AssertionError, message):
+                    Maze(squares)
+
+    def test_relaxed(self):
+        """should accept several entrances and exits, but still require one of each, in relaxed mode"""
+        squares = self.replace(1, role=Role.ENTRANCE)
+        maze = Maze(squares, relaxed=True)
+        self.assertEqual(2, len(maze.squares_with_role(Role.ENTRANCE)))
+        self.assertEqual(maze.roles[Role.ENTRANCE][0], maze.entrance.index)
+        no_exit = self.replace(maze.exit.index, role=Role.NONE)
+        with self.assertRaisesRegex(AssertionError, "Must have at least 1 exit"):
+            Maze(no_exit, relaxed=True)
+
+    def test_skips_validation(self):
+        """should not validate the squares when asked not to"""
+        squares = self.replace(1, role=Role.EXIT)
+        self.assertEqual(squares, Maze(squares, validate=False).squares)
+
+    def test_from_buffer(self):
+        """should decode the squares of packed values"""
+        maze = Maze.load(MAZES_DIR / "pacman.maze")
+        for trusted in (True, False):
+            with self.subTest(trusted=trusted):
+                copy = Maze.from_buffer(maze.width, maze.height, maze.values, trusted)
+                self.assertEqual(maze.squares, copy.squares)
+                self.assertEqual(maze, copy)
+
+    def test_from_untrusted_buffer(self):
+        """should validate the roles of untrusted values"""
+        values = bytes([Border.TOP, Role.ENTRANCE << 4, Role.ENTRANCE << 4, 0])
+        self.assertEqual(4, len(Maze.from_buffer(2, 2, values).squares))
+        with self.assertRaises(AssertionError):
+            Maze.from_buffer(2, 2, values, trusted=False)
+        with self.assertRaises(AssertionError):
+            Maze.from_buffer(2, 2, values[:3])
+
+
+if __name__ == "__main__":
+    unittest.main()
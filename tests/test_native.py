@@ -0,0 +1,103 @@
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.compiled import CompiledGraph
+from src.pymaze.generate import generate
+from src.pymaze.graphs.native import (
+    iter_paths,
+    manhattan,
+    multi_source_path,
+    shortest_path,
+)
+from src.pymaze.graphs.solver import solution_cost, solve, solve_all
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+MAZE_NAMES = ("miniature", "pacman", "pacman_empty", "labyrinth", "impossible")
+
+
+class NativeSolverTestCases(unittest.TestCase):
+    def test_solve_same_cost_as_networkx(self):
+        """should find a solution as cheap as the one found by networkx"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                expected, actual = solve(maze), solve(maze, backend="native")
+                if expected is None:
+                    self.assertIsNone(actual)
+                else:
+                    self.assertEqual(solution_cost(expected), solution_cost(actual))
+                    self.assertIn(actual, solve_all(maze))
+
+    def test_solve_all_same_solutions_as_networkx(self):
+        """should find the same set of cheapest solutions as networkx"""
+        for name in MAZE_NAMES:
+            with self.subTest(name=name):
+                maze = Maze.load(MAZES_DIR / f"{name}.maze")
+                self.assertEqual(
+                    set(solve_all(maze)), set(solve_all(maze, backend="native"))
+                )
+
+    def test_solve_compact_maze(self):
+        """should solve a compact maze like the tuple backed maze"""
+        path = MAZES_DIR / "miniature.maze"
+        self.assertEqual(
+            solve(Maze.load(path), backend="native"),
+            solve(CompactMaze.load(path), backend="native"),
+        )
+
+    def test_astar_same_cost_as_dijkstra(self):
+        """should find a path as cheap with the manhattan heuristic as without it"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        graph = CompiledGraph.from_maze(maze)
+        source, target = graph.node_id(maze.entrance.index), graph.node_id(
+            maze.exit.index
+        )
+        dijkstra = shortest_path(graph, source, target)
+        astar = shortest_path(graph, source, target, manhattan(graph, target))
+        self.assertEqual(cost(graph, dijkstra), cost(graph, astar))
+
+    def test_several_doors(self):
+        """should find the cheapest path over every pair of entrance and exit with a single search"""
+        generated = generate(15, 15, seed=6, rewards=5, enemies=5)
+        values = bytearray(generated.values)
+        for index, role in ((37, Role.ENTRANCE), (120, Role.ENTRANCE), (90, Role.EXIT)):
+            values[index] = values[index] & 0x0F | role << 4
+        maze = CompactMaze(15, 15, values, relaxed=True)
+        graph = CompiledGraph.from_maze(maze)
+        entrances = [graph.node_id(index) for index in maze.roles[Role.ENTRANCE]]
+        exits = [graph.node_id(index) for index in maze.roles[Role.EXIT]]
+        expected = min(
+            solution_cost(graph.solution(maze, shortest_path(graph, source, target)))
+            for source in entrances
+            for target in exits
+        )
+        path = multi_source_path(graph, entrances, exits)
+        self.assertIn(path[0], entrances)
+        self.assertIn(path[-1], exits)
+        for backend in ("networkx", "native"):
+            with self.subTest(backend=backend):
+                self.assertEqual(expected, solution_cost(solve(maze, backend=backend)))
+        self.assertIsNone(multi_source_path(graph, entrances, []))
+
+    def test_iter_paths_skips_cycles(self):
+        """should not follow predecessors that loop back onto the current path"""
+        predecessors = [[], [0, 2], [1], [1, 2]]
+        self.assertEqual(
+            [[0, 1, 3], [0, 1, 2, 3]], list(iter_paths(predecessors, 0, 3))
+        )
+
+
+def cost(graph, path):
+    return sum(
+        graph.weights[edge]
+        for source, target in zip(path, path[1:])
+        for edge in range(graph.offsets[source], graph.offsets[source + 1])
+        if graph.targets[edge] == target
+    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import pstats
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.pymaze.graphs.cache import GRAPH_CACHE
+from src.pymaze.graphs.solver import solve
+from src.pymaze.models.maze import Maze
+from src.pymaze.profiling import NO_STAGE, Profiler, stage
+from src.pymaze.view.renderer import SVGRenderer
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class ProfilingTestCases(unittest.TestCase):
+    def setUp(self):
+        GRAPH_CACHE.clear()
+
+    def test_stage_without_profiler(self):
+        """should do nothing when no profiler is active"""
+        self.assertIs(NO_STAGE, stage("load"))
+
+    def test_stages(self):
+        """should record every stage of solving and rendering a maze"""
+        with Profiler() as profiler:
+            maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+            SVGRenderer().render(maze, solve(maze))
+        self.assertEqual(
+            ["validate", "load", "graph", "solve", "render"], list(profiler.stages)
+        )
+        for stats in profiler.stages.values():
+            self.assertEqual(1, stats.calls)
+            self.assertGreater(stats.wall_seconds, 0)
+            self.assertGreater(stats.peak_bytes, 0)
+        self.assertIs(NO_STAGE, stage("load"))
+
+    def test_nested_peaks(self):
+        """should keep the peak allocation of nested stages in the enclosing one"""
+        with Profiler() as profiler:
+            with stage("outer"):
+                with stage("inner"):
+                    buffer = bytearray(1_000_000)
+                del buffer
+        self.assertGreaterEqual(profiler.stages["inner"].peak_bytes, 1_000_000)
+        self.assertGreaterEqual(profiler.stages["outer"].peak_bytes, 1_000_000)
+
+    def test_nested_profilers(self):
+        """should give the stages back to the enclosing profiler once a nested one stops"""
+        with Profiler() as outer:
+            with Profiler() as inner:
+                with stage("inner"):
+                    pass
+            with stage("outer"):
+                pass
+        self.assertEqual(["inner"], list(inner.stages))
+        self.assertEqual(["outer"], list(outer.stages))
+        self.assertIs(NO_STAGE, stage("after"))
+
+    def test_report(self):
+        """should report the measurements of every stage"""
+        with Profiler() as profiler:
+            with stage("solve"):
+                pass
+            with stage("solve"):
+                pass
+        self.assertEqual(["stages"], list(profiler.report()))
+        self.assertEqual(2, profiler.report()["stages"]["solve"]["calls"])
+
+    def test_cprofile(self):
+        """should dump the cProfile statistics and their collapsed stacks"""
+        with Profiler(cprofile=True) as profiler:
+            solve(Maze.load(MAZES_DIR / "pacman.maze"))
+        with tempfile.TemporaryDirectory() as directory:
+            profiler.dump_stats(Path(directory) / "solve.pstats")
+            self.assertTrue(pstats.Stats(str(Path(directory) / "solve.pstats")))
+            profiler.dump_collapsed(Path(directory) / "solve.folded")
+            lines = (Path(directory) / "solve.folded").read_text().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(any("shortest_path" in line for line in lines))
+        for line in lines:
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertTrue(stack)
+            self.assertGreater(int(microseconds), 0)
+
+    def test_without_cprofile(self):
+        """should refuse to dump statistics that were not collected"""
+        with Profiler() as profiler:
+            pass
+        with self.assertRaises(ValueError):
+            profiler.dump_stats(Path("unused.pstats"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import heapq
+import math
+import random
+import unittest
+from pathlib import Path
+
+from src.pymaze.generate import generate
+from src.pymaze.graphs.compiled import role_weight
+from src.pymaze.graphs.query import PathQuery
+from src.pymaze.graphs.solver import solution_cost, solve
+from src.pymaze.models.border import Border
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+from tests.helpers import square_path_cost
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+def square_distances(maze, source):
+    """Reference search stepping between neighboring squares one at a time, following the converter's rules"""
+
+    def passable(square):
+        return square.role not in (Role.WALL, Role.EXTERIOR)
+
+    neighbors = {square.index: [] for square in maze}
+    for square in maze:
+        if square.column < maze.width - 1 and not square.border & Border.RIGHT:
+            neighbors[square.index].append(maze[square.index + 1])
+            neighbors[square.index + 1].append(square)
+        if square.row < maze.height - 1 and not square.border & Border.BOTTOM:
+            neighbors[square.index].append(maze[square.index + maze.width])
+            neighbors[square.index + maze.width].append(square)
+
+    distances = {source: 0.0}
+    queue = [(0.0, source)]
+    while queue:
+        distance, index = heapq.heappop(queue)
+        if distance > distances[index]:
+            continue
+        for neighbor in neighbors[index]:
+            if not passable(neighbor):
+                continue
+            candidate = distance + 1 + role_weight(neighbor.role)
+            if candidate < distances.get(neighbor.index, math.inf):
+                distances[neighbor.index] = candidate
+                heapq.heappush(queue, (candidate, neighbor.index))
+    return distances
+
+
+class PathQueryTestCases(unittest.TestCase):
+    def test_same_distances_as_square_search(self):
+        """should find the same cheapest costs as a search stepping over every square"""
+        for maze in (
+            generate(12, 9, "kruskal", seed=3, rewards=4, enemies=4),
+            Maze.load(MAZES_DIR / "labyrinth.maze"),
+            Maze.load(MAZES_DIR / "pacman_empty.maze"),
+        ):
+            query = PathQuery(maze)
+            rng = random.Random(1)
+            for source in rng.sample(range(maze.width * maze.height), 6):
+                expected = square_distances(maze, source)
+                for target in range(maze.width * maze.height):
+                    with self.subTest(source=source, target=target):
+                        distance = query.distance(source, target)
+                        self.assertEqual(expected.get(target, math.inf), distance)
+
+    def test_path(self):
+        """should retrieve a path whose cost is the distance, starting and ending on the given squares"""
+        maze = generate(15, 15, "wilson", seed=8, rewards=3, enemies=3)
+        query = PathQuery(maze)
+        rng = random.Random(2)
+        for _ in range(30):
+            source, target = rng.randrange(len(maze)), rng.randrange(len(maze))
+            with self.subTest(source=source, target=target):
+                path = query.path(source, target)
+                self.assertEqual((source, target), (path[0], path[-1]))
+                self.assertEqual(
+                    query.distance(source, target), square_path_cost(maze, path)
+                )
+
+    def test_same_corridor(self):
+        """should move straight between two squares of the same corridor"""
+        maze = generate(30, 1, seed=1)
+        query = PathQuery(maze)
+        self.assertEqual([3, 20], query.path(3, 20))
+        self.assertEqual(17, query.distance(20, 3))
+        self.assertEqual([5], query.path(5, 5))
+
+    def test_entrance_to_exit(self):
+        """should agree with the solver between the entrance and the exit"""
+        maze = Maze.load(MAZES_DIR / "pacman.maze")
+        query = PathQuery(maze)
+        self.assertEqual(
+            solution_cost(solve(maze)),
+            query.distance(maze.entrance.index, maze.exit.index),
+        )
+
+    def test_unreachable(self):
+        """should tell when a square can not be reached"""
+        maze = Maze.load(MAZES_DIR / "impossible.maze")
+        query = PathQuery(maze)
+        self.assertEqual(math.inf, query.distance(maze.entrance.index, maze.exit.index))
+        self.assertIsNone(query.path(maze.entrance.index, maze.exit.index))
+        with self.assertRaises(IndexError):
+            query.distance(0, maze.width * maze.height)
+
+    def test_query_many(self):
+        """should answer many pairs like single queries"""
+        maze = generate(20, 20, "kruskal", seed=4, rewards=5, enemies=5)
+        query = PathQuery(maze)
+        rng = random.Random(3)
+        sources = rng.sample(range(len(maze)), 4)
+        pairs = [(rng.choice(sources), rng.randrange(len(maze))) for _ in range(50)]
+        pairs.append((sources[0], sources[0]))
+        self.assertEqual(
+            [query.distance(source, target) for source, target in pairs],
+            query.query_many(pairs),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from pathlib import Path
+
+from src.pymaze.models.border import Border
+from src.pymaze.models.role import Role
+from src.pymaze.models.square import Square
+from src.pymaze.persistence.serializer import (
+    compress,
+    decode_row,
+    decompress,
+    load_squares,
+)
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class SerializerTestCases(unittest.TestCase):
+    def test_decompress_round_trip(self):
+        """should decompress every value with a known role back into its border and role"""
+        for role in Role:
+            for value in range(16):
+                border = Border(value)
+                square = Square(0, 0, 0, border, role)
+                self.assertEqual((border, role), decompress(compress(square)))
+
+    def test_decompress_unknown_role(self):
+        """should reject values with an unknown role"""
+        with self.assertRaises(ValueError):
+            decompress((max(Role) + 1) << 4)
+
+    def test_decode_row(self):
+        """should decode a row of values into squares with their positions"""
+        values = bytes([0x00, 0x2F, 0x35, 0x11])
+        self.assertEqual(
+            [
+                Square(2, 1, 0, Border.TOP | Border.LEFT, Role.EXIT),
+                Square(3, 1, 1, Border.TOP, Role.ENEMY),
+            ],
+            decode_row(values, 1, 2),
+        )
+
+    def test_decode_row_unknown_role(self):
+        """should reject rows containing values with an unknown role"""
+        with self.assertRaises(ValueError):
+            decode_row(bytes([0x00, 0xF0]), 0, 2)
+
+    def test_load_squares(self):
+        """should load one square per value in row-major order"""
+        squares = list(load_squares(MAZES_DIR / "miniature.maze"))
+        self.assertEqual(list(range(12)), [square.index for square in squares])
+        self.assertEqual((2, 0), (squares[8].row, squares[8].column))
+        self.assertIs(Role.ENTRANCE, squares[8].role)
+
+
+if __name__ == "__main__":
+    unittest.main()
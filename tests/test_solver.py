@@ -0,0 +1,79 @@
+import types
+import unittest
+from pathlib import Path
+
+from src.pymaze.generate import generate
+from src.pymaze.graphs.solver import (
+    iter_solutions,
+    networkx_solutions,
+    solution_cost,
+    solve,
+    solve_all,
+)
+from src.pymaze.models.compact import CompactMaze
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class IterSolutionsTestCases(unittest.TestCase):
+    def test_is_lazy(self):
+        """should return a generator instead of a list"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        self.assertIsInstance(iter_solutions(maze), types.GeneratorType)
+
+    def test_same_solutions_as_solve_all(self):
+        """should yield every solution found by solve_all"""
+        for backend in ("networkx", "native"):
+            with self.subTest(backend=backend):
+                maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+                self.assertEqual(
+                    set(solve_all(maze)), set(iter_solutions(maze, backend=backend))
+                )
+
+    def test_limit(self):
+        """should stop after the limit of solutions"""
+        for backend in ("networkx", "native"):
+            with self.subTest(backend=backend):
+                maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+                self.assertEqual(
+                    3, len(list(iter_solutions(maze, limit=3, backend=backend)))
+                )
+
+    def test_timeout(self):
+        """should stop yielding solutions once the timeout elapsed"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        self.assertEqual([], list(iter_solutions(maze, timeout=0)))
+
+    def test_no_solution(self):
+        """should not yield anything for an impossible maze"""
+        for backend in ("networkx", "native"):
+            with self.subTest(backend=backend):
+                maze = Maze.load(MAZES_DIR / "impossible.maze")
+                self.assertEqual([], list(iter_solutions(maze, backend=backend)))
+
+    def test_several_doors(self):
+        """should find the solutions from any entrance to any exit as cheap as the one of solve()"""
+        generated = generate(15, 15, seed=6, rewards=5, enemies=5)
+        values = bytearray(generated.values)
+        for index, role in ((37, Role.ENTRANCE), (120, Role.ENTRANCE), (90, Role.EXIT)):
+            values[index] = values[index] & 0x0F | role << 4
+        maze = CompactMaze(15, 15, values, relaxed=True)
+        entrances = set(maze.squares_with_role(Role.ENTRANCE))
+        exits = set(maze.squares_with_role(Role.EXIT))
+        for backend in ("networkx", "native"):
+            with self.subTest(backend=backend):
+                solution = solve(maze, backend=backend)
+                solutions = solve_all(maze, backend=backend)
+                self.assertIn(solution, solutions)
+                for other in solutions:
+                    self.assertIn(other[0], entrances)
+                    self.assertIn(other[-1], exits)
+                    self.assertEqual(solution_cost(solution), solution_cost(other))
+        with self.assertRaises(ValueError):
+            next(networkx_solutions(maze))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import copy
+import dataclasses
+import pickle
+import unittest
+from pathlib import Path
+
+from src.pymaze.models.border import Border
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+from src.pymaze.models.square import Square
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+class SquareTestCases(unittest.TestCase):
+    def test_slots(self):
+        """should not have a per instance dictionary"""
+        square = Square(0, 0, 0, Border.TOP | Border.LEFT)
+        self.assertFalse(hasattr(square, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            square.row = 1  # type: ignore[misc]
+
+    def test_equality(self):
+        """should compare and hash squares by their fields"""
+        square = Square(5, 1, 1, Border.LEFT | Border.RIGHT, Role.REWARD)
+        same = Square(5, 1, 1, Border.RIGHT | Border.LEFT, Role.REWARD)
+        self.assertEqual(square, same)
+        self.assertEqual(hash(square), hash(same))
+        self.assertNotEqual(square, dataclasses.replace(same, role=Role.ENEMY))
+
+    def test_pickle(self):
+        """should pickle and copy squares, keeping the shared border and role members"""
+        square = Square(5, 1, 1, Border.LEFT | Border.RIGHT, Role.REWARD)
+        for clone in (pickle.loads(pickle.dumps(square)), copy.deepcopy(square)):
+            self.assertEqual(square, clone)
+            self.assertIs(square.border, clone.border)
+            self.assertIs(square.role, clone.role)
+
+    def test_shared_members(self):
+        """should decode the squares of a maze with shared border and role members"""
+        maze = Maze.load(MAZES_DIR / "labyrinth.maze")
+        borders = {square.border: square.border for square in maze}
+        self.assertTrue(all(square.border is borders[square.border] for square in maze))
+        self.assertEqual(maze, pickle.loads(pickle.dumps(maze)))
+
+
+if __name__ == "__main__":
+    unittest.main()
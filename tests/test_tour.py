@@ -0,0 +1,101 @@
+import itertools
+import unittest
+from pathlib import Path
+
+from src.pymaze.generate import generate
+from src.pymaze.graphs.cache import GRAPH_CACHE
+from src.pymaze.graphs.tour import (
+    held_karp,
+    nearest_neighbor,
+    solve_tour,
+    tour_distances,
+    two_opt,
+)
+from src.pymaze.models.maze import Maze
+from src.pymaze.models.role import Role
+
+MAZES_DIR = Path(__file__).parent.parent / "mazes"
+
+
+def brute_force(distances):
+    """Reference search trying every order of the rewards"""
+    exit_id = len(distances) - 1
+    return min(
+        distances.cost([0, *order, exit_id])
+        for order in itertools.permutations(range(1, exit_id))
+    )
+
+
+class TourTestCases(unittest.TestCase):
+    def setUp(self):
+        GRAPH_CACHE.clear()
+
+    def assertVisitsRewards(self, maze, tour):
+        """Checks that the solution steps on every reward, in the reported order"""
+        rewards = set(maze.roles[Role.REWARD])
+        self.assertEqual(rewards, {square.index for square in tour.rewards})
+        self.assertTrue(rewards <= {square.index for square in tour.solution})
+
+    def test_held_karp(self):
+        """should find the cheapest order of the rewards"""
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                maze = generate(15, 15, seed=seed, rewards=6)
+                tour = solve_tour(maze)
+                self.assertEqual("held-karp", tour.method)
+                self.assertEqual(brute_force(tour_distances(maze)), tour.cost)
+                self.assertVisitsRewards(maze, tour)
+
+    def test_two_opt(self):
+        """should visit every reward without beating the optimal order"""
+        maze = generate(20, 20, seed=4, rewards=8)
+        optimal = solve_tour(maze, "held-karp")
+        heuristic = solve_tour(maze, "2-opt")
+        self.assertEqual("2-opt", heuristic.method)
+        self.assertGreaterEqual(heuristic.cost, optimal.cost)
+        self.assertVisitsRewards(maze, heuristic)
+
+    def test_cost(self):
+        """should report the sum of the weights of the edges of the solution"""
+        maze = Maze.load(MAZES_DIR / "pacman.maze")
+        tour = solve_tour(maze)
+        squares = tour.solution.squares
+        cost = sum(
+            abs(first.row - second.row)
+            + abs(first.column - second.column)
+            + {Role.REWARD: -1, Role.ENEMY: 2}.get(second.role, 0)
+            for first, second in zip(squares, squares[1:])
+        )
+        self.assertEqual(cost, tour.cost)
+        self.assertEqual({"distances", "ordering", "paths"}, set(tour.seconds))
+
+    def test_no_rewards(self):
+        """should go straight to the exit when there are no rewards"""
+        maze = generate(10, 10, seed=1)
+        self.assertEqual([0, 1], held_karp(tour_distances(maze).costs))
+        self.assertEqual((), solve_tour(maze).rewards)
+
+    def test_unreachable(self):
+        """should give up when the exit can not be reached"""
+        maze = Maze.load(MAZES_DIR / "impossible.maze")
+        self.assertIsNone(solve_tour(maze))
+
+    def test_cached_distances(self):
+        """should compute the distances once per maze"""
+        maze = generate(10, 10, seed=2, rewards=3)
+        self.assertIs(tour_distances(maze), tour_distances(maze))
+
+    def test_two_opt_reversal(self):
+        """should undo a crossing of the tour"""
+        costs = [
+            [0, 1, 2, 3],
+            [1, 0, 1, 2],
+            [2, 1, 0, 1],
+            [3, 2, 1, 0],
+        ]
+        self.assertEqual([0, 1, 2, 3], two_opt(costs, [0, 2, 1, 3]))
+        self.assertEqual([0, 1, 2, 3], nearest_neighbor(costs))
+
+
+if __name__ == "__main__":
+    unittest.main()